@@ -0,0 +1,227 @@
+#coding:utf-8
+"""
+Benchmark the client against a local stub of the FantasyData API.
+
+    python -m benchmarks.bench_client [--calls 50] [--latency 0.02] [--rate-limit 0]
+                                      [--gzip] [--output results.json] [--baseline old.json]
+
+The stub serves the recorded payloads from benchmarks.fixtures with the given added
+latency, optionally gzipped and throttled with 429s above a rate limit.
+Each scenario (sync, batch, async, cache, stream) reports calls per second,
+p50/p99 latency and the peak memory allocated during one call. Results are
+written as JSON; --baseline prints the change against an earlier run.
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import platform
+import threading
+import time
+import tracemalloc
+
+from benchmarks.fixtures import PAYLOADS, payload_bytes
+from fantasy_data.AsyncFantasyData import AsyncFantasyData
+from fantasy_data.FantasyData import FantasyData
+from fantasy_data.testing import StubServer, point_at
+
+PAYLOAD = "nfl_player_game_stats_by_week"
+WEEKS = range(1, 18)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def serve(server, latency, rate_limit, compress):
+    """
+    Route the fixture payload for every week, with latency, throttling and compression
+    """
+    body = payload_bytes(PAYLOAD)
+    headers = {}
+    if compress:
+        body = gzip.compress(body)
+        headers["Content-Encoding"] = "gzip"
+    lock = threading.Lock()
+    sent = []
+
+    def handler(request):
+        if rate_limit:
+            with lock:
+                now = time.time()
+                sent[:] = [at for at in sent if at > now - 1]
+                if len(sent) >= rate_limit:
+                    return 429, {"Retry-After": "1"}, b'{"statusCode": 429}'
+                sent.append(now)
+        if latency:
+            time.sleep(latency)
+        return 200, headers, body
+
+    game_type, category, _, _ = PAYLOADS[PAYLOAD]
+    for week in WEEKS:
+        server.route(game_type, category, "PlayerGameStatsByWeek/2016REG/{0}".format(week), handler)
+
+
+def _timed(func):
+    latencies = []
+
+    def call(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+    return call, latencies
+
+
+def scenario_sync(client, calls):
+    call, latencies = _timed(client.get_players_game_stats_for_season_for_week)
+    for n in range(calls):
+        call(2016, WEEKS[n % len(WEEKS)])
+    return latencies
+
+
+def scenario_batch(client, calls):
+    call, latencies = _timed(client.get_players_game_stats_for_season_for_week)
+    client.batch(call, [(2016, WEEKS[n % len(WEEKS)]) for n in range(calls)], max_workers=8)
+    return latencies
+
+
+_async_clients = {}  # sync client -> AsyncFantasyData wrapping it, closed with the sync client
+
+
+def scenario_async(client, calls):
+    latencies = []
+    async_client = _async_clients.get(client)
+    if async_client is None:
+        async_client = _async_clients[client] = AsyncFantasyData(client=client, max_concurrency=8)
+
+    async def one(week):
+        started = time.perf_counter()
+        await async_client.get_players_game_stats_for_season_for_week(2016, week)
+        latencies.append(time.perf_counter() - started)
+
+    async def run():
+        await asyncio.gather(*[one(WEEKS[n % len(WEEKS)]) for n in range(calls)])
+
+    asyncio.run(run())
+    return latencies
+
+
+def scenario_cache(client, calls):
+    # a handful of distinct weeks, so most calls are hits
+    call, latencies = _timed(client.get_players_game_stats_for_season_for_week)
+    for n in range(calls):
+        call(2016, WEEKS[n % 4])
+    return latencies
+
+
+def scenario_stream(client, calls):
+    latencies = []
+    for n in range(calls):
+        started = time.perf_counter()
+        for _ in client.iter_players_game_stats_for_season_for_week(2016, WEEKS[n % len(WEEKS)]):
+            pass
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+# name -> (scenario, client keyword arguments)
+SCENARIOS = {
+    "sync": (scenario_sync, {}),
+    "batch": (scenario_batch, {}),
+    "async": (scenario_async, {}),
+    "cache": (scenario_cache, {"cache": True}),
+    "stream": (scenario_stream, {}),
+}
+
+
+def run(calls=50, latency=0.02, rate_limit=0, compress=False, scenarios=None):
+    server = StubServer().start()
+    try:
+        serve(server, latency, rate_limit, compress)
+        results = []
+        for name in scenarios or sorted(SCENARIOS):
+            scenario, kwargs = SCENARIOS[name]
+            if rate_limit:
+                kwargs = dict(kwargs, rate_limit=rate_limit)
+            with point_at(FantasyData("bench-{0}".format(name), single_flight=False, **kwargs), server) as client:
+                # warm up connections, then measure speed and memory separately
+                scenario(client, 1)
+                started = time.perf_counter()
+                latencies = scenario(client, calls)
+                seconds = time.perf_counter() - started
+                tracemalloc.start()
+                scenario(client, 1)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                async_client = _async_clients.pop(client, None)
+                if async_client is not None:
+                    asyncio.run(async_client.close())
+            results.append({
+                "scenario": name,
+                "calls": len(latencies),
+                "seconds": seconds,
+                "calls_per_second": len(latencies) / seconds,
+                "p50_ms": percentile(latencies, 0.5) * 1e3,
+                "p99_ms": percentile(latencies, 0.99) * 1e3,
+                "peak_bytes": peak,
+            })
+        return results
+    finally:
+        server.stop()
+
+
+def compare(results, baseline):
+    """
+    Lines with the change of every metric against `baseline` results
+    """
+    previous = dict((row["scenario"], row) for row in baseline["results"])
+    lines = []
+    for row in results:
+        old = previous.get(row["scenario"])
+        if old is None:
+            continue
+        changes = ["{0} {1:+.1%}".format(key, row[key] / old[key] - 1)
+                   for key in ("calls_per_second", "p50_ms", "p99_ms", "peak_bytes") if old[key]]
+        lines.append("{0:8} {1}".format(row["scenario"], "  ".join(changes)))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every response")
+    parser.add_argument("--rate-limit", type=int, default=0, help="calls per second before the stub answers 429")
+    parser.add_argument("--gzip", action="store_true", help="serve gzipped bodies")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    results = run(args.calls, args.latency, args.rate_limit, args.gzip, args.scenario)
+    print("{0:8} {1:>8} {2:>10} {3:>10} {4:>10} {5:>10}".format(
+        "scenario", "calls", "calls/s", "p50 ms", "p99 ms", "peak MB"))
+    for row in results:
+        print("{scenario:8} {calls:8} {calls_per_second:10.1f} {p50_ms:10.2f} {p99_ms:10.2f} {0:10.1f}".format(
+            row["peak_bytes"] / 1e6, **row))
+
+    report = {
+        "python": platform.python_version(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {"calls": args.calls, "latency": args.latency, "rate_limit": args.rate_limit,
+                   "gzip": args.gzip, "payload": PAYLOAD},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            for line in compare(results, json.load(f)):
+                print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#coding:utf-8
+"""
+Compare JSON decoding backends on FantasyData-sized payloads.
+
+    python -m benchmarks.bench_decode [--repeat 5]
+
+Reports the best decode time and the peak memory allocated while decoding.
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.fixtures import PAYLOADS, payload_bytes
+from fantasy_data.decoders import DECODERS, get_decoder
+
+
+def measure(loads, body, repeat):
+    """
+    (best seconds, peak bytes) of decoding `body` with `loads`
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        loads(body)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    loads(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def run(repeat=5):
+    results = []
+    for payload in sorted(PAYLOADS):
+        body = payload_bytes(payload)
+        for name, _ in DECODERS:
+            try:
+                loads = get_decoder(name)
+            except ImportError:
+                continue
+            seconds, peak = measure(loads, body, repeat)
+            results.append({
+                "payload": payload,
+                "decoder": name,
+                "bytes": len(body),
+                "seconds": seconds,
+                "mb_per_second": len(body) / seconds / 1e6,
+                "peak_bytes": peak,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print("{0:32} {1:8} {2:>10} {3:>10} {4:>10} {5:>12}".format(
+        "payload", "decoder", "size MB", "ms", "MB/s", "peak MB"))
+    for row in run(args.repeat):
+        print("{payload:32} {decoder:8} {0:10.2f} {1:10.2f} {mb_per_second:10.1f} {2:12.1f}".format(
+            row["bytes"] / 1e6, row["seconds"] * 1e3, row["peak_bytes"] / 1e6, **row))
+
+
+if __name__ == "__main__":
+    main()
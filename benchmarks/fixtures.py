@@ -0,0 +1,232 @@
+#coding:utf-8
+"""
+Payloads of real FantasyData responses.
+
+Bodies come from the recorded cassette benchmarks/cassettes/payloads, see
+fantasy_data.transport. Record it once with an API key:
+
+    FANTASYDATA_API_KEY=... FANTASYDATA_NBA_API_KEY=... python -m benchmarks.fixtures
+
+Without the cassette, deterministic rows stand in for the responses: same
+field names, value types and null density as the NFL PlayerGameStatsByWeek /
+PlayerSeasonProjectionStats and NBA PlayerGameStatsByDate responses, at
+realistic row counts.
+"""
+import json
+import os
+import random
+
+from fantasy_data.FantasyData import FantasyData, FantasyDataNBA
+from fantasy_data.transport import CassetteMiss, RecordingAdapter, ReplayAdapter
+
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "payloads")
+
+NFL_TEAMS = ["ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE", "DAL", "DEN", "DET", "GB", "HOU", "IND",
+             "JAX", "KC", "LAC", "LAR", "MIA", "MIN", "NE", "NO", "NYG", "NYJ", "OAK", "PHI", "PIT", "SEA", "SF",
+             "TB", "TEN", "WAS"]
+NBA_TEAMS = ["ATL", "BOS", "BKN", "CHA", "CHI", "CLE", "DAL", "DEN", "DET", "GS", "HOU", "IND", "LAC", "LAL",
+             "MEM", "MIA", "MIL", "MIN", "NO", "NY", "OKC", "ORL", "PHI", "PHO", "POR", "SAC", "SA", "TOR", "UTA",
+             "WAS"]
+NFL_POSITIONS = ["QB", "RB", "WR", "TE", "K", "DL", "LB", "DB", "OL"]
+NBA_POSITIONS = ["PG", "SG", "SF", "PF", "C"]
+
+NFL_STATS = [
+    "PassingAttempts", "PassingCompletions", "PassingYards", "PassingCompletionPercentage",
+    "PassingYardsPerAttempt", "PassingYardsPerCompletion", "PassingTouchdowns", "PassingInterceptions",
+    "PassingRating", "PassingLong", "PassingSacks", "PassingSackYards", "RushingAttempts", "RushingYards",
+    "RushingYardsPerAttempt", "RushingTouchdowns", "RushingLong", "ReceivingTargets", "Receptions",
+    "ReceivingYards", "ReceivingYardsPerReception", "ReceivingTouchdowns", "ReceivingLong", "Fumbles",
+    "FumblesLost", "PuntReturns", "PuntReturnYards", "PuntReturnTouchdowns", "KickReturns", "KickReturnYards",
+    "KickReturnTouchdowns", "SoloTackles", "AssistedTackles", "TacklesForLoss", "Sacks", "SackYards",
+    "QuarterbackHits", "PassesDefended", "FumblesForced", "FumblesRecovered", "FumbleReturnYards",
+    "FumbleReturnTouchdowns", "Interceptions", "InterceptionReturnYards", "InterceptionReturnTouchdowns",
+    "BlockedKicks", "SpecialTeamsSoloTackles", "SpecialTeamsAssistedTackles", "MiscSoloTackles",
+    "MiscAssistedTackles", "Punts", "PuntYards", "PuntAverage", "FieldGoalsAttempted", "FieldGoalsMade",
+    "FieldGoalsLongestMade", "ExtraPointsMade", "TwoPointConversionPasses", "TwoPointConversionRuns",
+    "TwoPointConversionReceptions", "FantasyPoints", "FantasyPointsPPR", "ReceptionPercentage",
+    "ReceivingYardsPerTarget", "Tackles", "OffensiveTouchdowns", "DefensiveTouchdowns",
+    "SpecialTeamsTouchdowns", "Touchdowns", "FantasyPosition", "FieldGoalPercentage", "FumblesOwnRecoveries",
+    "FumblesOutOfBounds", "KickReturnFairCatches", "PuntReturnFairCatches", "PuntTouchbacks", "PuntInside20",
+    "PuntNetAverage", "ExtraPointsAttempted", "BlockedKickReturnTouchdowns", "FieldGoalReturnTouchdowns",
+    "Safeties", "FieldGoalsHadBlocked", "PuntsHadBlocked", "ExtraPointsHadBlocked", "PuntLong",
+    "BlockedKickReturnYards", "FieldGoalReturnYards", "PuntNetYards", "SpecialTeamsFumblesForced",
+    "SpecialTeamsFumblesRecovered", "MiscFumblesForced", "MiscFumblesRecovered", "SafetiesAllowed",
+    "FantasyPointsFanDuel", "FieldGoalsMade0to19", "FieldGoalsMade20to29", "FieldGoalsMade30to39",
+    "FieldGoalsMade40to49", "FieldGoalsMade50Plus", "FantasyPointsDraftKings", "FantasyPointsYahoo",
+    "OffensiveSnapsPlayed", "DefensiveSnapsPlayed", "SpecialTeamsSnapsPlayed", "OffensiveTeamSnaps",
+    "DefensiveTeamSnaps", "SpecialTeamsTeamSnaps", "FanDuelSalary", "DraftKingsSalary", "YahooSalary",
+]
+NBA_STATS = [
+    "Minutes", "Seconds", "FieldGoalsMade", "FieldGoalsAttempted", "FieldGoalsPercentage",
+    "EffectiveFieldGoalsPercentage", "TwoPointersMade", "TwoPointersAttempted", "TwoPointersPercentage",
+    "ThreePointersMade", "ThreePointersAttempted", "ThreePointersPercentage", "FreeThrowsMade",
+    "FreeThrowsAttempted", "FreeThrowsPercentage", "OffensiveRebounds", "DefensiveRebounds", "Rebounds",
+    "OffensiveReboundsPercentage", "DefensiveReboundsPercentage", "TotalReboundsPercentage", "Assists",
+    "Steals", "BlockedShots", "Turnovers", "PersonalFouls", "Points", "TrueShootingAttempts",
+    "TrueShootingPercentage", "PlayerEfficiencyRating", "AssistsPercentage", "StealsPercentage",
+    "BlocksPercentage", "TurnOversPercentage", "UsageRatePercentage", "FantasyPointsFanDuel",
+    "FantasyPointsDraftKings", "FantasyPointsYahoo", "PlusMinus", "DoubleDoubles", "TripleDoubles",
+    "FantasyPoints", "FanDuelSalary", "DraftKingsSalary", "YahooSalary",
+]
+
+
+def _value(rng, name):
+    if rng.random() < 0.05:
+        return None
+    if name.endswith(("Percentage", "Average", "Rating", "Points", "PerAttempt", "PerCompletion",
+                      "PerReception", "PerTarget")) or name.startswith("FantasyPoints"):
+        return round(rng.uniform(0, 40), 2)
+    if name.endswith("Salary"):
+        return rng.randrange(3000, 12000, 100)
+    return rng.randint(0, 20)
+
+
+def nfl_player_game_stats(rows=2000, season=2016, week=5, seed=1):
+    """
+    PlayerGameStatsByWeek/{season}/{week}
+    """
+    rng = random.Random(seed)
+    result = []
+    for n in range(rows):
+        team = NFL_TEAMS[n % len(NFL_TEAMS)]
+        opponent = NFL_TEAMS[(n + 7) % len(NFL_TEAMS)]
+        row = {
+            "GameKey": "{0}1{1:02d}{2:02d}".format(season, week, n % 16),
+            "PlayerID": 10000 + n,
+            "SeasonType": 1,
+            "Season": season,
+            "GameDate": "{0}-10-{1:02d}T13:00:00".format(season, 1 + week),
+            "Week": week,
+            "Team": team,
+            "Opponent": opponent,
+            "HomeOrAway": "HOME" if n % 2 else "AWAY",
+            "Number": rng.randint(1, 99),
+            "Name": "Player {0}".format(n),
+            "ShortName": "P. {0}".format(n),
+            "Position": rng.choice(NFL_POSITIONS),
+            "PositionCategory": rng.choice(["OFF", "DEF", "ST"]),
+            "Activated": 1,
+            "Played": 1,
+            "Started": rng.randint(0, 1),
+            "Stadium": "Stadium {0}".format(team),
+            "IsGameOver": True,
+            "PlayerGameID": 500000 + n,
+            "InjuryStatus": rng.choice([None, None, None, "Questionable", "Out"]),
+            "ScoringDetails": [],
+        }
+        for name in NFL_STATS:
+            row[name] = _value(rng, name)
+        row["FantasyPosition"] = row["Position"]
+        result.append(row)
+    return result
+
+
+def nfl_player_season_projections(rows=1500, season=2016, seed=2):
+    """
+    PlayerSeasonProjectionStats/{season}
+    """
+    rows = nfl_player_game_stats(rows, season, 1, seed)
+    for row in rows:
+        for name in ("GameKey", "Week", "GameDate", "Opponent", "HomeOrAway", "IsGameOver", "PlayerGameID",
+                     "Stadium", "ScoringDetails"):
+            del row[name]
+    return rows
+
+
+def nba_player_game_stats(rows=300, game_date="2015-12-05", seed=3):
+    """
+    PlayerGameStatsByDate/{game_date}
+    """
+    rng = random.Random(seed)
+    result = []
+    for n in range(rows):
+        team = NBA_TEAMS[n % len(NBA_TEAMS)]
+        row = {
+            "StatID": 1000000 + n,
+            "TeamID": n % len(NBA_TEAMS) + 1,
+            "PlayerID": 20000000 + n,
+            "SeasonType": 1,
+            "Season": 2016,
+            "Name": "Player {0}".format(n),
+            "Team": team,
+            "Position": rng.choice(NBA_POSITIONS),
+            "Started": rng.randint(0, 1),
+            "InjuryStatus": rng.choice([None, None, "Probable"]),
+            "GameID": 5000 + n // 26,
+            "OpponentID": (n + 3) % len(NBA_TEAMS) + 1,
+            "Opponent": NBA_TEAMS[(n + 3) % len(NBA_TEAMS)],
+            "Day": "{0}T00:00:00".format(game_date),
+            "DateTime": "{0}T19:30:00".format(game_date),
+            "HomeOrAway": "HOME" if n % 2 else "AWAY",
+            "Games": 1,
+            "Updated": "{0}T23:59:12".format(game_date),
+        }
+        for name in NBA_STATS:
+            row[name] = _value(rng, name)
+        result.append(row)
+    return result
+
+
+# name -> (game_type, category, method url, payload factory)
+PAYLOADS = {
+    "nfl_player_game_stats_by_week": ("nfl", "stats", "PlayerGameStatsByWeek/2016REG/5", nfl_player_game_stats),
+    "nfl_player_season_projections": ("nfl", "projections", "PlayerSeasonProjectionStats/2016",
+                                      nfl_player_season_projections),
+    "nba_player_game_stats_by_date": ("nba", "stats", "PlayerGameStatsByDate/2015-12-05", nba_player_game_stats),
+}
+
+
+# name -> (client class, API method, arguments) recording the payload
+CALLS = {
+    "nfl_player_game_stats_by_week": (FantasyData, "get_players_game_stats_for_season_for_week", (2016, 5)),
+    "nfl_player_season_projections": (FantasyData, "get_player_season_projected_stats", (2016,)),
+    "nba_player_game_stats_by_date": (FantasyDataNBA, "get_players_game_stats_by_date", ("2015-12-05",)),
+}
+
+_API_KEYS = {FantasyData: "FANTASYDATA_API_KEY", FantasyDataNBA: "FANTASYDATA_NBA_API_KEY"}
+
+
+def recorded(name, path=CASSETTE):
+    """
+    Result of fixture `name` replayed from cassette `path`, None if it wasn't recorded
+    """
+    if not os.path.exists(path + ".json"):
+        return None
+    client_class, method, args = CALLS[name]
+    with client_class("replay", transport=ReplayAdapter(path)) as client:
+        try:
+            return getattr(client, method)(*args)
+        except CassetteMiss:
+            return None
+
+
+def payload_bytes(name):
+    """
+    JSON body of fixture `name` as served by the API: the recorded response,
+    or the generated stand-in when there's no recording
+    """
+    rows = recorded(name)
+    if rows is None:
+        rows = PAYLOADS[name][3]()
+    return json.dumps(rows).encode("utf-8")
+
+
+def record(path=CASSETTE):
+    """
+    Record every fixture from the API to cassette `path`, with the keys in FANTASYDATA_API_KEY
+    and FANTASYDATA_NBA_API_KEY
+    """
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    for suffix in (".json", ".bin"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    for name in sorted(CALLS):
+        client_class, method, args = CALLS[name]
+        with client_class(os.environ[_API_KEYS[client_class]], transport=RecordingAdapter(path)) as client:
+            print("{0}: {1} rows".format(name, len(getattr(client, method)(*args))))
+
+
+if __name__ == "__main__":
+    record()
@@ -0,0 +1,179 @@
+#coding:utf-8
+"""
+asyncio counterparts of the FantasyData API classes.
+
+Calls run on the pooled session of a regular client, on a thread pool
+sized to the concurrency limit, so every method keeps the same name,
+arguments, results and FantasyDataError semantics as the sync class.
+get_* methods and batch() are coroutines, iter_* methods async generators.
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from fantasy_data.FantasyData import FantasyData, FantasyDataNBA
+
+_END = object()  # marks the end of an iteration run on a worker thread
+
+
+class AsyncFantasyDataBase(object):
+    """
+    Base class for asyncio Fantasy Data APIs
+    """
+    _client_class = None  # sync class whose methods are exposed as coroutines
+
+    def __init__(self, api_key=None, max_concurrency=10, client=None, **client_kwargs):
+        """
+        Object contructor. Set key for API requests
+        `max_concurrency` int max number of API calls in flight at once
+        `client` existing sync client to wrap instead of creating one from `api_key`
+        `client_kwargs` passed to the sync client constructor
+        """
+        if client is None:
+            client_kwargs.setdefault('pool_maxsize', max_concurrency)
+            client = self._client_class(api_key, **client_kwargs)
+        self._client = client
+        self._max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        # event loop -> asyncio.Semaphore, dropped with the loop
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    @property
+    def client(self):
+        """
+        Wrapped sync client
+        """
+        return self._client
+
+    def _semaphore(self):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self._max_concurrency)
+        return semaphore
+
+    async def _call(self, name, *args, **kwargs):
+        """
+        Run sync client method `name` without blocking the event loop
+        """
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            call = functools.partial(getattr(self._client, name), *args, **kwargs)
+            # run in a copy of the task's context, so deadlines and timeouts carry over
+            return await loop.run_in_executor(self._executor, contextvars.copy_context().run, call)
+
+    async def _iter(self, name, *args, **kwargs):
+        """
+        Iterate sync client generator method `name` on a worker thread, yielding its items
+        as they are downloaded. The call holds a concurrency slot until the iteration ends
+        """
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            queue = asyncio.Queue()
+            stopped = threading.Event()
+
+            def put(item, error=None):
+                try:
+                    loop.call_soon_threadsafe(queue.put_nowait, (item, error))
+                except RuntimeError:
+                    # the event loop is closed: nobody is iterating any more
+                    stopped.set()
+
+            def produce():
+                items = iter(getattr(self._client, name)(*args, **kwargs))
+                try:
+                    for item in items:
+                        put(item)
+                        if stopped.is_set():
+                            break
+                except Exception as e:
+                    put(_END, e)
+                else:
+                    put(_END)
+                finally:
+                    close = getattr(items, 'close', None)
+                    if close is not None:
+                        close()
+
+            producer = loop.run_in_executor(self._executor, contextvars.copy_context().run, produce)
+            try:
+                while True:
+                    item, error = await queue.get()
+                    if error is not None:
+                        raise error
+                    if item is _END:
+                        break
+                    yield item
+            finally:
+                stopped.set()
+                await producer
+
+    async def batch(self, func, keys, **kwargs):
+        """
+        Same as the sync client's batch(). `func` is an API method of this object or of the sync client,
+        e.g. client.get_player. The batch runs on the sync client's thread pool
+        """
+        if getattr(func, '__self__', None) is self:
+            func = getattr(self._client, func.__name__)
+        return await self._call('batch', func, keys, **kwargs)
+
+    async def close(self):
+        """
+        Close pooled connections and worker threads
+        """
+        self._executor.shutdown(wait=False)
+        self._client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+def _async_method(name, method):
+    @functools.wraps(method)
+    async def call(self, *args, **kwargs):
+        return await self._call(name, *args, **kwargs)
+    return call
+
+
+def _async_iter_method(name, method):
+    @functools.wraps(method)
+    def call(self, *args, **kwargs):
+        return self._iter(name, *args, **kwargs)
+    return call
+
+
+def _async_api(cls):
+    """
+    Expose every public get_* method of `cls._client_class` as a coroutine
+    and every iter_* method as an async generator
+    """
+    for name in dir(cls._client_class):
+        if hasattr(cls, name):
+            continue
+        if name.startswith('get_'):
+            setattr(cls, name, _async_method(name, getattr(cls._client_class, name)))
+        elif name.startswith('iter_'):
+            setattr(cls, name, _async_iter_method(name, getattr(cls._client_class, name)))
+    return cls
+
+
+@_async_api
+class AsyncFantasyData(AsyncFantasyDataBase):
+    """
+    Class provide asyncio Fantasy Data API calls (NFL)
+    """
+    _client_class = FantasyData
+
+
+@_async_api
+class AsyncFantasyDataNBA(AsyncFantasyDataBase):
+    """
+    Class provide asyncio Fantasy Data API calls (NBA)
+    """
+    _client_class = FantasyDataNBA
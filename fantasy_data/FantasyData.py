@@ -1,6 +1,27 @@
 #coding:utf-8
+import contextvars
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 import requests
+from requests.adapters import HTTPAdapter
 from six.moves import urllib
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.request import ACCEPT_ENCODING
+
+from fantasy_data import deadline as deadlines
+from fantasy_data import metrics as metrics_module
+from fantasy_data import planner
+from fantasy_data.cache import CacheEntry, CachePolicy, MemoryCache, copy_value
+from fantasy_data.decoders import get_decoder
+from fantasy_data.models import (Game, Injury, NBAGame, NBAPlayerGame, Player, PlayerGame, Projection, Standing,
+                                 Team, returns)
+from fantasy_data.ratelimit import THROTTLE_STATUS_CODES, RateLimiter, retry_after
+from fantasy_data.retry import HedgePolicy, RetryPolicy
+from fantasy_data.singleflight import SingleFlight
+from fantasy_data.stream import JSONArrayParser
 
 
 class FantasyDataError(Exception):
@@ -11,6 +32,102 @@ class FantasyDataError(Exception):
         return repr(self.errorstr)
 
 
+class FantasyDataTimeout(FantasyDataError):
+    """
+    The API didn't answer within the connect or read timeout
+    """
+
+
+class DeadlineExceeded(FantasyDataTimeout):
+    """
+    The deadline of the call ran out
+    """
+
+
+class InvalidKeyError(FantasyDataError):
+    """
+    The API rejected the API key
+    """
+
+
+class RateLimitError(FantasyDataError):
+    """
+    The API kept throttling a call. `retry_after` seconds to wait, if the API said
+    """
+    def __init__(self, errorstr, retry_after=None):
+        FantasyDataError.__init__(self, errorstr)
+        self.retry_after = retry_after
+
+
+# Size of the last response body as transferred and after content decoding
+TransferStats = namedtuple('TransferStats', ['wire_bytes', 'decoded_bytes'])
+
+
+class BatchResult(list):
+    """
+    Results of FantasyDataBase.batch in input order.
+    Items whose call failed are None, their exceptions are in `errors` by index
+    """
+    def __init__(self, results, errors):
+        list.__init__(self, results)
+        self.errors = errors
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+class _Attempts(object):
+    """
+    Requests sent for one call. Resends of every kind count towards the same retry policy limits.
+    Hedged copies of a request count on the same record from two threads
+    """
+    __slots__ = ('count', 'started', '_lock')
+
+    def __init__(self):
+        self.count = 0
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def add(self):
+        """
+        Count a request sent
+        """
+        with self._lock:
+            self.count += 1
+
+    @property
+    def elapsed(self):
+        return time.time() - self.started
+
+
+# Errors while reading a response body: resets, truncated or corrupt bodies, read timeouts
+_BODY_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.ContentDecodingError, requests.exceptions.Timeout)
+
+
+def _body_error(error):
+    """
+    FantasyDataError for one of _BODY_ERRORS
+    """
+    left = deadlines.remaining()
+    if left is not None and left <= 0:
+        return DeadlineExceeded('Error: Deadline exceeded')
+    # requests reports a read timeout in iter_content as a ConnectionError
+    if isinstance(error, requests.exceptions.Timeout) or (error.args and isinstance(error.args[0], ReadTimeoutError)):
+        return FantasyDataTimeout('Error: FantasyData API timed out')
+    return FantasyDataError('Error: Cannot connect to the FantasyData API')
+
+
+def _run(call):
+    return call()
+
+
+def _close_response(future):
+    if future.exception() is None:
+        future.result().close()
+
+
 class FantasyDataBase(object):
     """
     Base class for all Fantasy Data APIs
@@ -21,10 +138,54 @@ class FantasyDataBase(object):
     _get_params = None  # request GET params with API key
     _headers = None  # request additional headers
     _response_format = "json"  # default response format
-
-    def __init__(self, api_key):
+    _chunk_size = 64 * 1024  # bytes read from the socket at a time
+    _session = None  # pooled HTTP session, lives as long as the object
+    _healthy_until = 0  # time until which the last successful health check is trusted
+    _executor = None  # thread pool shared by batch calls
+    _cache = None  # response cache backend
+    _rate_limiter = None  # RateLimiter shared with other clients of the same key
+    _retry = None  # RetryPolicy for connection errors and 5xx responses
+    _hedge = None  # HedgePolicy for latency-critical endpoints
+    _hedge_executor = None  # thread pool sending hedged requests
+    _timeout = (10, 60)  # default (connect, read) socket timeouts in seconds
+    _single_flight = None  # SingleFlight sharing identical concurrent calls
+    _metrics = None  # function taking a metrics.RequestEvent for every call
+
+    def __init__(self, api_key, pool_connections=10, pool_maxsize=10, pool_block=False, keep_alive=True,
+                 health_check=False, health_check_ttl=60, cache=None, cache_policy=None, json_decoder='auto',
+                 rate_limit=None, throttle_retries=3, max_throttle_wait=300, retry=None, hedge=None,
+                 timeout=(10, 60), single_flight=False, coalesce_window=0, metrics=None, transport=None):
         """
         Object contructor. Set key for API requests
+        `pool_connections` int number of per-host connection pools to cache
+        `pool_maxsize` int max connections kept open per host
+        `pool_block` bool wait for a free connection instead of opening an extra one when the pool is full
+        `keep_alive` bool reuse connections between calls
+        `health_check` bool probe the API host before calls. Off by default: connection
+        errors are detected from the API call itself
+        `health_check_ttl` int seconds a successful probe is trusted for
+        `cache` CacheBackend for responses, True for an in-memory LRU cache. Off by default
+        `cache_policy` CachePolicy with per-endpoint freshness, defaults to CachePolicy()
+        `json_decoder` str "auto", "orjson", "ujson", "json" or a function decoding bytes.
+        "auto" uses orjson or ujson when installed
+        `rate_limit` float max calls per second for this API key, shared by all clients of the key,
+        or a RateLimiter. Off by default
+        `throttle_retries` int times a call throttled with 429/503 is resent after waiting
+        `max_throttle_wait` float longest Retry-After waited for. RateLimitError is raised right away
+        when the API asks for longer
+        `retry` RetryPolicy for connection errors and 5xx responses, True for RetryPolicy(). Off by default
+        `hedge` HedgePolicy sending a backup request when a latency-critical call is slow,
+        True for HedgePolicy(). Off by default
+        `timeout` float seconds or (connect, read) tuple for every request, None to wait forever.
+        Override it per call with fantasy_data.deadline.timeout()
+        `single_flight` bool concurrent identical calls share one request, each caller gets its own
+        copy of the result. Off by default
+        `coalesce_window` float seconds a finished call's result is also shared with later callers.
+        Turns on single_flight
+        `metrics` metrics.Histograms, any object with a record(event) method, a function taking
+        a metrics.RequestEvent, or a list of them. Off by default
+        `transport` requests transport adapter sending the requests instead of the pooled HTTPAdapter,
+        e.g. transport.RecordingAdapter or transport.ReplayAdapter
         """
         self._api_key = api_key
         # uses six
@@ -33,7 +194,179 @@ class FantasyDataBase(object):
         self._headers = {
             # Basic Authorization Sample
             # 'Authorization': 'Basic %s' % base64.encodestring('{username}:{password}'),
+            # every content coding urllib3 can decode here: gzip, deflate, br and zstd when installed
+            'Accept-Encoding': ACCEPT_ENCODING,
         }
+        if not keep_alive:
+            self._headers['Connection'] = 'close'
+
+        self._pool_maxsize = pool_maxsize
+        self._session = requests.Session()
+        # timed connections report connect and TLS handshake times
+        adapter_class = HTTPAdapter if metrics is None else metrics_module.TimedHTTPAdapter
+        adapter = transport
+        if adapter is None:
+            adapter = adapter_class(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                    pool_block=pool_block)
+        elif hasattr(adapter, 'use_adapter'):
+            # transports sending over the network, e.g. transport.RecordingAdapter, use the same pool
+            adapter.use_adapter(adapter_class(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                              pool_block=pool_block))
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        self._health_check = health_check
+        self._health_check_ttl = health_check_ttl
+        self._executor_lock = threading.Lock()
+        self._local = threading.local()
+
+        if cache is True:
+            cache = MemoryCache()
+        elif cache is False:
+            cache = None
+        self._cache = cache
+        self._cache_policy = cache_policy or CachePolicy()
+        self._json_loads = get_decoder(json_decoder)
+
+        if rate_limit is not None and not isinstance(rate_limit, RateLimiter):
+            rate_limit = RateLimiter.for_key(api_key, rate_limit)
+        self._rate_limiter = rate_limit
+        self._throttle_retries = throttle_retries
+        self._max_throttle_wait = max_throttle_wait
+        self._retry = RetryPolicy() if retry is True else retry or None
+        self._hedge = HedgePolicy() if hedge is True else hedge or None
+        self._timeout = timeout
+        if single_flight or coalesce_window:
+            self._single_flight = SingleFlight(coalesce_window, copy=copy_value)
+        self._metrics = metrics_module.as_sink(metrics)
+
+    def close(self):
+        """
+        Close pooled connections. The object can't be used after that
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+            self._hedge_executor = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    @property
+    def last_transfer(self):
+        """
+        TransferStats of the last API call made by the current thread
+        """
+        return getattr(self._local, 'transfer', None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _get_executor(self):
+        """
+        Thread pool shared by batch calls, one thread per pooled connection.
+        It is never replaced while batches may still submit to it; each batch bounds its own calls in flight
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._pool_maxsize)
+            return self._executor
+
+    def batch(self, func, keys, max_workers=None, deadline=None, plan=False):
+        """
+        Call `func` once per item of `keys` on the shared thread pool.
+        `func` API method of this object, e.g. client.get_player
+        `keys` iterable of call arguments: a tuple is passed as positional arguments,
+        a dict as keyword arguments, anything else as the single argument
+        `max_workers` int max number of calls in flight, defaults to the connection pool size.
+        Raises ValueError when larger than `pool_maxsize`, which sizes both the connection pool and the thread pool
+        `deadline` float seconds the whole batch may take. Calls still running then fail with
+        DeadlineExceeded. An enclosing fantasy_data.deadline.deadline() applies too
+        `plan` bool answer per-team calls of one season and week with a single league-wide call
+        when there are enough teams, see fantasy_data.planner. Off by default
+        Returns BatchResult in the order of `keys`. A failed call doesn't abort the batch
+        """
+        if deadline is not None:
+            with deadlines.deadline(deadline):
+                return self.batch(func, keys, max_workers, plan=plan)
+        max_workers = max_workers or self._pool_maxsize
+        if max_workers > self._pool_maxsize:
+            raise ValueError('max_workers={0} is larger than pool_maxsize={1}: create the client with '
+                             'pool_maxsize={0}'.format(max_workers, self._pool_maxsize))
+        keys = list(keys)
+        calls = planner.plan(self, func, keys) if plan else None
+        if calls is not None:
+            return self._planned_batch(keys, calls, max_workers)
+        executor = self._get_executor()
+        results = [None] * len(keys)
+        errors = {}
+        pending = {}
+
+        def collect(done):
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    errors[index] = e
+
+        for index, key in enumerate(keys):
+            if len(pending) >= max_workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            # every call runs in a copy of this context, so deadlines and timeouts carry over
+            context = contextvars.copy_context()
+            if isinstance(key, tuple):
+                future = executor.submit(context.run, func, *key)
+            elif isinstance(key, dict):
+                future = executor.submit(context.run, func, **key)
+            else:
+                future = executor.submit(context.run, func, key)
+            pending[future] = index
+        collect(wait(pending)[0])
+        return BatchResult(results, errors)
+
+    def _planned_batch(self, keys, calls, max_workers):
+        """
+        Run planned `calls`, see planner.plan, and map their results back to `keys`
+        """
+        done = self.batch(_run, [call for call, _, _ in calls], max_workers, plan=False)
+        results = [None] * len(keys)
+        errors = {}
+        for position, (_, indexes, split) in enumerate(calls):
+            error = done.errors.get(position)
+            if error is None:
+                try:
+                    results_of_call = split(done[position])
+                except Exception as e:
+                    error = e
+            for offset, index in enumerate(indexes):
+                if error is None:
+                    results[index] = results_of_call[offset]
+                else:
+                    errors[index] = error
+        return BatchResult(results, errors)
+
+    def check_health(self):
+        """
+        Probe the API host. The result is cached for `health_check_ttl` seconds
+        """
+        if time.time() < self._healthy_until:
+            return
+        if self._session is None:
+            raise FantasyDataError('Error: Client is closed')
+        try:
+            self._session.get(self._api_schema + self._api_address, headers=self._headers,
+                              timeout=deadlines.current_timeout(self._timeout)).close()
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            self._healthy_until = 0
+            raise FantasyDataError('Error: Cannot connect to the FantasyData API')
+        self._healthy_until = time.time() + self._health_check_ttl
 
     def _method_call(self, method, category, **kwargs):
         """
@@ -41,33 +374,296 @@ class FantasyDataBase(object):
         `method` str API method url for request. Contains parameters
         `params` dict parameters for method url
         """
-        session = requests.Session()
+        ttl = None
+        if self._cache is not None:
+            ttl = self._cache_policy.ttl(self.game_type, category, method, kwargs)
+        method = method.format(format=self._response_format, **kwargs)
+        load = self._load if self._metrics is None else self._traced_load
+        if self._single_flight is None:
+            return load(method, category, ttl)
+        # callers sharing another thread's call transferred nothing themselves
+        self._local.transfer = TransferStats(0, 0)
+        key = "{0}/{1}/{2}".format(self.game_type, category, method)
+        # a timeout caused by this caller's own deadline or per-call timeout isn't shared
+        scoped = deadlines.active()
+        return self._single_flight.do(key, lambda: load(method, category, ttl), DeadlineExceeded,
+                                      lambda error: scoped and isinstance(error, FantasyDataTimeout))
+
+    def _traced_load(self, method, category, ttl):
+        """
+        _load reporting a RequestEvent to the metrics sink
+        """
+        trace, token = metrics_module.start_trace()
+        self._local.transfer = None
+        started = time.perf_counter()
+        error = None
         try:
-            response = session.get("http://" + self._api_address)
-        except requests.exceptions.ConnectionError:
-            raise FantasyDataError('Error: Cannot connect to the FantasyData API')
+            return self._load(method, category, ttl)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            seconds = time.perf_counter() - started
+            metrics_module.end_trace(token)
+            self._metrics(metrics_module.RequestEvent.from_trace(
+                self.game_type, method.split('/', 1)[0], seconds, trace, self.last_transfer, error))
+
+    def _load(self, method, category, ttl):
+        """
+        Result of formatted API `method` from the cache or the API
+        `ttl` seconds to cache the result for, None to bypass the cache
+        """
+        cache_key = entry = None
+        headers = self._headers
+        if ttl:
+            cache_key = "{0}/{1}/{2}".format(self.game_type, category, method)
+            entry = self._cache.get(cache_key)
+            if entry is not None:
+                if entry.is_fresh():
+                    self._local.transfer = TransferStats(0, 0)
+                    metrics_module.mark('cache', 'hit')
+                    # every caller gets its own result to change
+                    return copy_value(entry.value)
+                headers = self._revalidation_headers(entry)
+            metrics_module.mark('cache', 'miss')
+
+        response, body = self._fetch(self._request_url(method, category), headers, method.split('/', 1)[0])
+
+        if response.status_code == 304 and entry is not None:
+            # cached body is still valid
+            metrics_module.mark('cache', 'revalidated')
+            entry.expires_at = time.time() + ttl
+            self._cache.set(cache_key, entry)
+            return copy_value(entry.value)
+
+        started = time.perf_counter()
+        result = self._json_loads(body)
+        metrics_module.note('decode', time.perf_counter() - started)
+        self._check_response(response, result)
+
+        if cache_key is not None and response.status_code == 200:
+            self._cache.set(cache_key, CacheEntry(copy_value(result), time.time() + ttl,
+                                                  etag=response.headers.get('ETag'),
+                                                  last_modified=response.headers.get('Last-Modified')))
+        return result
 
+    def _method_iter(self, method, category, **kwargs):
+        """
+        Call API method returning a JSON array. Yield its items as they are downloaded.
+        Bypasses the response cache
+        """
         method = method.format(format=self._response_format, **kwargs)
+        response = self._get(self._request_url(method, category), self._headers, method.split('/', 1)[0])
+        if response.status_code != 200:
+            result = self._json_loads(self._read_body(response))
+            self._check_response(response, result)
+            for item in result:
+                yield item
+            return
+
+        wire_bytes = decoded_bytes = 0
+        parser = JSONArrayParser()
+        try:
+            for chunk in response.iter_content(self._chunk_size):
+                decoded_bytes += len(chunk)
+                for item in parser.feed(chunk):
+                    yield item
+            for item in parser.close():
+                yield item
+            wire_bytes = response.raw.tell()
+        except _BODY_ERRORS as e:
+            raise _body_error(e)
+        finally:
+            self._local.transfer = TransferStats(wire_bytes, decoded_bytes)
+            response.close()
+
+    def _request_url(self, method, category):
+        """
+        Full url for formatted API `method`
+        """
         request_url = "/v3/{game_type}/{category}/{format}/{method}?{get_params}".format(
             game_type=self.game_type,
             category=category,
             format=self._response_format,
             method=method,
             get_params=self._get_params)
-        response = session.get(self._api_schema + self._api_address + request_url,
-                               headers=self._headers)
-        result = response.json()
-
+        return self._api_schema + self._api_address + request_url
+
+    def _fetch(self, url, headers, endpoint=None):
+        """
+        Send GET request and read the whole body. Returns (response, body).
+        A connection reset, truncated body or read timeout while reading is retried like a failed request
+        """
+        attempts = _Attempts()
+        while True:
+            response = self._get(url, headers, endpoint, attempts)
+            try:
+                return response, self._read_body(response)
+            except _BODY_ERRORS as e:
+                delay = self._retry.delay(attempts.count, None, attempts.elapsed) if self._retry else None
+                if delay is None:
+                    raise _body_error(e)
+            metrics_module.note('retries', 1)
+            self._sleep(delay)
+
+    def _get(self, url, headers, endpoint=None, attempts=None):
+        """
+        Send GET request over the pooled session. The body is not read yet.
+        `endpoint` str API endpoint name, the part of the method url before the first "/"
+        `attempts` _Attempts of the call, when it may send the request again
+        """
+        if self._session is None:
+            raise FantasyDataError('Error: Client is closed')
+        if self._health_check:
+            self.check_health()
+        hedge = self._hedge
+        if hedge is not None and hedge.applies(endpoint):
+            delay = hedge.delay(endpoint)
+            if delay is not None:
+                return self._hedged_send(url, headers, endpoint, delay, attempts)
+        return self._send(url, headers, endpoint, attempts)
+
+    def _send(self, url, headers, endpoint, attempts=None):
+        """
+        Send GET request. Throttled calls are resent after the delay the API asks for,
+        connection errors and 5xx responses as the retry policy says
+        """
+        session = self._session
+        if session is None:
+            raise FantasyDataError('Error: Client is closed')
+        limiter = self._rate_limiter
+        retry = self._retry
+        attempts = attempts or _Attempts()
+        throttled = 0
+        while True:
+            left = deadlines.remaining()
+            if left is not None and left <= 0:
+                raise DeadlineExceeded('Error: Deadline exceeded')
+            if limiter is not None and not limiter.acquire(left):
+                raise DeadlineExceeded('Error: Deadline exceeded')
+            sent = time.time()
+            attempts.add()
+            try:
+                response = session.get(url, headers=headers, stream=True,
+                                       timeout=deadlines.current_timeout(self._timeout))
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                delay = retry.delay(attempts.count, None, attempts.elapsed) if retry else None
+                if delay is not None:
+                    metrics_module.note('retries', 1)
+                    self._sleep(delay)
+                    continue
+                left = deadlines.remaining()
+                if left is not None and left <= 0:
+                    raise DeadlineExceeded('Error: Deadline exceeded')
+                if isinstance(e, requests.exceptions.Timeout):
+                    raise FantasyDataTimeout('Error: FantasyData API timed out')
+                raise FantasyDataError('Error: Cannot connect to the FantasyData API')
+
+            status = response.status_code
+            metrics_module.mark('status', status)
+            metrics_module.note('request', response.elapsed.total_seconds())
+            if status in THROTTLE_STATUS_CODES:
+                response.close()
+                delay = retry_after(response.headers)
+                if limiter is not None:
+                    limiter.throttled(delay, self._max_throttle_wait)
+                if throttled == self._throttle_retries or (delay is not None and delay > self._max_throttle_wait):
+                    raise RateLimitError('Error: Rate limit exceeded', delay)
+                if limiter is None:
+                    self._sleep(min(2 ** throttled, 30) if delay is None else delay)
+                throttled += 1
+                metrics_module.note('retries', 1)
+                continue
+            if retry is not None and status >= 500:
+                delay = retry.delay(attempts.count, status, attempts.elapsed)
+                if delay is not None:
+                    response.close()
+                    metrics_module.note('retries', 1)
+                    self._sleep(delay)
+                    continue
+
+            if limiter is not None:
+                limiter.succeeded()
+            if self._hedge is not None:
+                self._hedge.observe(endpoint, time.time() - sent)
+            return response
+
+    def _hedged_send(self, url, headers, endpoint, delay, attempts=None):
+        """
+        Send GET request, and a backup copy if no answer came within `delay` seconds.
+        Returns the first successful response, the other one is closed
+        """
+        with self._executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=self._pool_maxsize)
+            executor = self._hedge_executor
+        pending = {executor.submit(contextvars.copy_context().run, self._send, url, headers, endpoint, attempts)}
+        done, _ = wait(pending, timeout=delay)
+        if not done:
+            pending.add(executor.submit(contextvars.copy_context().run, self._send, url, headers, endpoint, attempts))
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in (done | pending) - {future}:
+                        other.add_done_callback(_close_response)
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def _sleep(self, seconds):
+        """
+        Wait before resending a request. Raises DeadlineExceeded if the deadline comes first
+        """
+        left = deadlines.remaining()
+        if left is not None and seconds >= left:
+            raise DeadlineExceeded('Error: Deadline exceeded')
+        time.sleep(seconds)
+
+    def _check_response(self, response, result):
+        """
+        Raise FantasyDataError for API error responses
+        """
         if isinstance(result, dict) and response.status_code:
             if response.status_code == 401:
-                raise FantasyDataError('Error: Invalid API key')
+                raise InvalidKeyError('Error: Invalid API key')
+
             elif response.status_code == 200:
                 # for NBA everything is ok here.
                 pass
             else:
                 raise FantasyDataError('Error: Failed to get response')
 
-        return result
+    def _read_body(self, response):
+        """
+        Read the response body, decompressing it chunk by chunk as it arrives
+        """
+        started = time.perf_counter()
+        try:
+            chunks = []
+            for chunk in response.iter_content(self._chunk_size):
+                chunks.append(chunk)
+                left = deadlines.remaining()
+                if left is not None and left <= 0:
+                    raise DeadlineExceeded('Error: Deadline exceeded')
+            body = b''.join(chunks)
+            self._local.transfer = TransferStats(response.raw.tell(), len(body))
+        finally:
+            response.close()
+            metrics_module.note('download', time.perf_counter() - started)
+        return body
+
+    def _revalidation_headers(self, entry):
+        """
+        Request headers for a conditional refetch of a stale cache entry
+        """
+        headers = dict(self._headers)
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
 
 
 class FantasyData(FantasyDataBase):
@@ -86,6 +682,16 @@ class FantasyData(FantasyDataBase):
         result = self._method_call("UpcomingSeason", "stats")
         return int(result)
 
+    def get_current_timeframe(self):
+        """
+        Where the NFL calendar is: dict with "Season", "SeasonType" (1 regular season,
+        2 preseason, 3 postseason, 4 offseason) and "Week".
+        In the offseason the season is the upcoming one
+        """
+        result = self._method_call("Timeframes/current", "scores")
+        return result[0] if result else None
+
+    @returns(Game)
     def get_schedules_for_season(self, season, season_type="REG"):
         """
         Game schedule for a specified season.
@@ -101,12 +707,20 @@ class FantasyData(FantasyDataBase):
         result = self._method_call("Schedules/{season}", "stats", season=season_param)
         return result
 
+    @returns(Player)
     def get_free_agents(self):
         """
         """
         result = self._method_call("FreeAgents", "stats")
         return result
 
+    @returns(Player)
+    def iter_free_agents(self):
+        """
+        Same as get_free_agents, yields players one at a time as they are downloaded
+        """
+        return self._method_iter("FreeAgents", "stats")
+
     def get_current_week(self):
         """
         Number of the current week of the NFL season.
@@ -117,6 +731,7 @@ class FantasyData(FantasyDataBase):
         result = self._method_call("CurrentWeek", "stats")
         return int(result)
 
+    @returns(Player)
     def get_team_roster_and_depth_charts(self, team_name):
         """
         `team_name` str Team short name
@@ -124,6 +739,7 @@ class FantasyData(FantasyDataBase):
         result = self._method_call("Players/{team}", "stats", team=team_name)
         return result
 
+    @returns(PlayerGame)
     def get_players_game_stats_for_season_for_week(self, season, week, season_type="REG"):
         """
         Game stats for a specified season and week.
@@ -143,6 +759,24 @@ class FantasyData(FantasyDataBase):
         result = self._method_call("PlayerGameStatsByWeek/{season}/{week}", "stats", season=season_param, week=week)
         return result
 
+    @returns(PlayerGame)
+    def iter_players_game_stats_for_season_for_week(self, season, week, season_type="REG"):
+        """
+        Same as get_players_game_stats_for_season_for_week,
+        yields player game stats one at a time as they are downloaded
+        """
+        try:
+            season = int(season)
+            week = int(week)
+            if season_type not in ["REG", "PRE", "POST"]:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise FantasyDataError('Error: Invalid method parameters')
+
+        season_param = "{0}{1}".format(season, season_type)
+        return self._method_iter("PlayerGameStatsByWeek/{season}/{week}", "stats", season=season_param, week=week)
+
+    @returns(Team)
     def get_teams_active(self):
         """
         Gets all active teams.
@@ -150,6 +784,7 @@ class FantasyData(FantasyDataBase):
         result = self._method_call("Teams", "stats")
         return result
 
+    @returns(Player)
     def get_player(self, player_id):
         """
         Player profile information for one specific player.
@@ -158,6 +793,7 @@ class FantasyData(FantasyDataBase):
         result = self._method_call("Player/{player_id}", "stats", player_id=player_id)
         return result
 
+    @returns(Projection)
     def get_projected_player_game_stats_by_player(self, season, week, player_id):
         """
         Projected Player Game Stats by Player
@@ -165,6 +801,7 @@ class FantasyData(FantasyDataBase):
         result = self._method_call("PlayerGameProjectionStatsByPlayerID/{season}/{week}/{player_id}", "projections", season=season, week=week, player_id=player_id)
         return result
 
+    @returns(Projection)
     def get_projected_player_game_stats_by_team(self, season, week, team_id):
         """
         Projected Player Game Stats by Team
@@ -172,6 +809,7 @@ class FantasyData(FantasyDataBase):
         result = self._method_call("PlayerGameProjectionStatsByTeam/{season}/{week}/{team_id}", "projections", season=season, week=week, team_id=team_id)
         return result
 
+    @returns(Projection)
     def get_projected_player_game_stats_by_week(self, season, week):
         """
         Projected Player Game Stats by Week
@@ -186,6 +824,7 @@ class FantasyData(FantasyDataBase):
         result = self._method_call("FantasyDefenseProjectionsByGame/{season}/{week}", "projections", season=season, week=week)
         return result
 
+    @returns(Projection)
     def get_player_season_projected_stats(self, season):
         """
         Projected Stats By Player By Season
@@ -193,6 +832,13 @@ class FantasyData(FantasyDataBase):
         result = self._method_call("PlayerSeasonProjectionStats/{season}", "projections", season=season)
         return result
 
+    @returns(Projection)
+    def iter_player_season_projected_stats(self, season):
+        """
+        Same as get_player_season_projected_stats, yields projections one at a time as they are downloaded
+        """
+        return self._method_iter("PlayerSeasonProjectionStats/{season}", "projections", season=season)
+
     def get_fantasy_defense_projections_by_season(self, season):
         """
         Projected Fantasy Defense Projections By Season
@@ -229,6 +875,7 @@ class FantasyData(FantasyDataBase):
         result = self._method_call("RotoBallerPremiumNewsByTeam/{team_id}", "news-rotoballer", team_id=team_id)
         return result
 
+    @returns(Injury)
     def get_injuries(self, season, week):
         """
         Injuries by week
@@ -236,6 +883,7 @@ class FantasyData(FantasyDataBase):
         result = self._method_call("Injuries/{season}/{week}", "stats", season=season, week=week)
         return result
 
+    @returns(Injury)
     def get_injuries_by_team(self, season, week, team_id):
         """
         Injuries by week and team
@@ -272,6 +920,7 @@ class FantasyDataNBA(FantasyDataBase):
         result = self._method_call("CurrentSeason", "stats")
         return int(result.get('Season'))
 
+    @returns(NBAGame)
     def get_games_by_season(self, season):
         """
         Game schedule for a specified season.
@@ -284,6 +933,7 @@ class FantasyDataNBA(FantasyDataBase):
         result = self._method_call("Games/{season}", "stats", season=season)
         return result
 
+    @returns(NBAGame)
     def get_games_by_date(self, game_date):
         """
         Game schedule for a specified day.
@@ -291,6 +941,7 @@ class FantasyDataNBA(FantasyDataBase):
         result = self._method_call("GamesByDate/{game_date}", "scores", game_date=game_date)
         return result
 
+    @returns(NBAPlayerGame)
     def get_players_game_stats_by_date(self, game_date):
         """
         Game stats for each player at a specified date.
@@ -298,6 +949,13 @@ class FantasyDataNBA(FantasyDataBase):
         result = self._method_call("PlayerGameStatsByDate/{game_date}", "stats", game_date=game_date)
         return result
 
+    @returns(NBAPlayerGame)
+    def iter_players_game_stats_by_date(self, game_date):
+        """
+        Same as get_players_game_stats_by_date, yields player game stats one at a time as they are downloaded
+        """
+        return self._method_iter("PlayerGameStatsByDate/{game_date}", "stats", game_date=game_date)
+
     def get_team_game_stats_by_date(self, game_date):
         """
         Game stats for each team at a specified date.
@@ -305,6 +963,7 @@ class FantasyDataNBA(FantasyDataBase):
         result = self._method_call("TeamGameStatsByDate/{game_date}", "stats", game_date=game_date)
         return result
 
+    @returns(Standing)
     def get_standings(self, season):
         """
         Get standings for season
@@ -312,6 +971,7 @@ class FantasyDataNBA(FantasyDataBase):
         result = self._method_call("Standings/{season}", "stats", season=season)
         return result
 
+    @returns(Team)
     def get_teams_active(self):
         """
         Gets all active teams.
@@ -323,5 +983,5 @@ class FantasyDataNBA(FantasyDataBase):
         """
         Get all stadiums.
         """
-        result = self._method_call("Stadiums")
+        result = self._method_call("Stadiums", "scores")
         return result
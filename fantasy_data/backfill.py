@@ -0,0 +1,174 @@
+#coding:utf-8
+"""
+Multi-process backfills of NFL seasons into a SnapshotStore.
+
+    python -m fantasy_data.backfill --store nfl-snapshot --seasons 2001-2020 [--season-types PRE,REG,POST]
+                                    [--processes 8] [--threads 4] [--rate-limit 20] [--no-projections]
+
+The work is split into jobs of one season type of one season (its schedule,
+every week of player game stats and projections), run on a process pool so
+JSON decoding and column building use every core. Each worker process has
+its own pooled client; a rate limit is one SharedRateLimiter for all of
+them. Workers write partitions straight to the store, and a partition only
+appears once complete, so the store is the checkpoint: an interrupted
+backfill run again skips the partitions already written. The API key is
+read from --key or the FANTASYDATA_API_KEY environment variable.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from fantasy_data.FantasyData import FantasyData
+from fantasy_data.ratelimit import SharedRateLimiter
+from fantasy_data.snapshot import SEASON_TYPES, SnapshotStore, season_calls, store_calls
+
+# client and store of this worker process
+_worker = None
+
+
+def _start_worker(client_class, api_key, client_kwargs, store_path):
+    global _worker
+    _worker = (client_class(api_key, **client_kwargs), SnapshotStore(store_path))
+
+
+def _run_job(calls, threads):
+    """
+    Fetch and store `calls` in a worker process, on its client's thread pool.
+    Returns (written, failed): lists of (table, partition) and (table, partition, error message)
+    """
+    client, store = _worker
+    calls = [(table, partition, getattr(client, method), args) for table, partition, method, args in calls]
+    written, failed = store_calls(client, store, calls, threads, return_failed=True)
+    # exceptions don't always survive pickling, messages do
+    return written, [(table, partition, '{0}: {1}'.format(type(error).__name__, error))
+                     for table, partition, error in failed]
+
+
+class BackfillResult(object):
+    """
+    `written` list of (table, partition) stored
+    `failed` list of (table, partition, error message), fetched again by the next run
+    `skipped` int partitions already in the store
+    """
+    def __init__(self, written, failed, skipped):
+        self.written = written
+        self.failed = failed
+        self.skipped = skipped
+
+    @property
+    def ok(self):
+        return not self.failed
+
+
+class Backfill(object):
+    """
+    Downloads NFL seasons into a SnapshotStore on a process pool
+    `api_key` str
+    `store` SnapshotStore or a directory path
+    `processes` int worker processes, defaults to the number of CPUs
+    `threads` int calls in flight per worker process
+    `rate_limit` float calls per second for all workers together. Off by default
+    `client_kwargs` passed to the client of every worker, e.g. retry=True
+    """
+    client_class = FantasyData
+
+    def __init__(self, api_key, store, processes=None, threads=4, rate_limit=None, **client_kwargs):
+        self.api_key = api_key
+        self.store = store if isinstance(store, SnapshotStore) else SnapshotStore(store)
+        self.processes = processes or os.cpu_count() or 1
+        self.threads = threads
+        client_kwargs.setdefault('pool_maxsize', threads)
+        if rate_limit is not None:
+            client_kwargs['rate_limit'] = SharedRateLimiter(rate_limit)
+        self.client_kwargs = client_kwargs
+
+    def jobs(self, seasons, season_types=SEASON_TYPES, projections=True, refresh=False):
+        """
+        Calls still to make, grouped in jobs by season and season type: list of lists of
+        (table, partition, method name, args), and the number of partitions skipped
+        """
+        jobs = {}
+        skipped = 0
+        for call in season_calls(seasons, season_types, projections):
+            table, partition = call[0], call[1]
+            if not refresh and self.store.has(table, partition):
+                skipped += 1
+                continue
+            # "2016REG/5" -> "2016REG", bye weeks "2016" are a job of their own
+            jobs.setdefault(partition.split('/')[0], []).append(call)
+        return [calls for _, calls in sorted(jobs.items())], skipped
+
+    def run(self, seasons, season_types=SEASON_TYPES, projections=True, refresh=False, progress=None):
+        """
+        Download `seasons`, skipping partitions already stored unless `refresh`.
+        `progress` callable(written, failed) called as each job finishes
+        Returns BackfillResult. Failed calls don't stop the backfill
+        """
+        jobs, skipped = self.jobs(seasons, season_types, projections, refresh)
+        written = []
+        failed = []
+        if not jobs:
+            return BackfillResult(written, failed, skipped)
+        executor = ProcessPoolExecutor(
+            max_workers=min(self.processes, len(jobs)), initializer=_start_worker,
+            initargs=(self.client_class, self.api_key, self.client_kwargs, self.store.path))
+        futures = []
+        try:
+            futures.extend(executor.submit(_run_job, calls, self.threads) for calls in jobs)
+            for future in as_completed(futures):
+                job_written, job_failed = future.result()
+                written.extend(job_written)
+                failed.extend(job_failed)
+                if progress is not None:
+                    progress(job_written, job_failed)
+        finally:
+            # on interrupt, drop the queued jobs; stored partitions stay for the next run
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+        return BackfillResult(written, failed, skipped)
+
+
+def _seasons(value):
+    """
+    "2001-2020" or "2014,2016"
+    """
+    seasons = []
+    for part in value.split(','):
+        first, _, last = part.partition('-')
+        seasons.extend(range(int(first), int(last or first) + 1))
+    return seasons
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--key', default=os.environ.get('FANTASYDATA_API_KEY'), help='API key')
+    parser.add_argument('--store', required=True, help='snapshot store directory')
+    parser.add_argument('--seasons', required=True, type=_seasons, help='e.g. 2001-2020 or 2014,2016')
+    parser.add_argument('--season-types', default=','.join(SEASON_TYPES))
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--threads', type=int, default=4, help='calls in flight per process')
+    parser.add_argument('--rate-limit', type=float, default=None, help='calls per second, all processes')
+    parser.add_argument('--no-projections', dest='projections', action='store_false',
+                        help="don't store weekly projections")
+    parser.add_argument('--refresh', action='store_true', help='download stored partitions again')
+    args = parser.parse_args(argv)
+    if not args.key:
+        parser.error('an API key is needed: --key or FANTASYDATA_API_KEY')
+
+    def progress(written, failed):
+        for table, partition, error in failed:
+            print('failed {0}/{1}: {2}'.format(table, partition, error))
+        if written:
+            print('stored {0} partitions, {1}'.format(len(written), written[0][1].split('/')[0]))
+
+    backfill = Backfill(args.key, args.store, args.processes, args.threads, args.rate_limit, retry=True)
+    result = backfill.run(args.seasons, args.season_types.split(','), args.projections, args.refresh, progress)
+    print('{0} partitions stored, {1} already stored, {2} failed'.format(
+        len(result.written), result.skipped, len(result.failed)))
+    return 0 if result.ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
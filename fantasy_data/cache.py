@@ -0,0 +1,228 @@
+#coding:utf-8
+"""
+Response cache for FantasyData API calls.
+
+A cache is a backend (where entries live) plus a policy (how long each
+endpoint's responses stay fresh). Expired entries are kept until evicted,
+so they can be revalidated instead of refetched.
+"""
+import datetime
+import pickle
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+FOREVER = float('inf')
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# decoded JSON values that are never changed in place
+_SCALARS = frozenset((str, int, float, bool))
+
+
+def copy_value(value):
+    """
+    Copy of a decoded JSON value: lists and dicts are copied, all other values are immutable
+    """
+    if isinstance(value, list):
+        return [item if item is None or type(item) in _SCALARS else copy_value(item) for item in value]
+    if isinstance(value, dict):
+        return dict((key, item if item is None or type(item) in _SCALARS else copy_value(item))
+                    for key, item in value.items())
+    return value
+
+
+class CacheEntry(object):
+    """
+    Cached API response
+    `value` decoded response
+    `expires_at` float unix time when the entry goes stale
+    `etag`, `last_modified` str validators sent by the API, if any
+    """
+    __slots__ = ('value', 'expires_at', 'etag', 'last_modified')
+
+    def __init__(self, value, expires_at, etag=None, last_modified=None):
+        self.value = value
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def __getstate__(self):
+        return (self.value, self.expires_at, self.etag, self.last_modified)
+
+    def __setstate__(self, state):
+        self.value, self.expires_at, self.etag, self.last_modified = state
+
+    def is_fresh(self, now=None):
+        return (now or time.time()) < self.expires_at
+
+
+class CacheBackend(object):
+    """
+    Storage interface for cache entries. Keys are str, values CacheEntry
+    """
+    def get(self, key):
+        """
+        Entry for `key`, fresh or stale, or None
+        """
+        raise NotImplementedError
+
+    def set(self, key, entry):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """
+    In-memory LRU cache holding at most `maxsize` entries
+    """
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SqliteCache(CacheBackend):
+    """
+    Persistent cache in a sqlite database file, shared between processes
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, entry BLOB)")
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT entry FROM cache WHERE key = ?", (key,)).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def set(self, key, entry):
+        data = pickle.dumps(entry, pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO cache (key, entry) VALUES (?, ?)", (key, data))
+
+    def delete(self, key):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM cache")
+
+    def close(self):
+        self._db.close()
+
+
+# Freshness in seconds by endpoint name, the part of the method url before the first "/"
+DEFAULT_TTLS = {
+    'Teams': DAY,
+    'Stadiums': DAY,
+    'Byes': HOUR,
+    'Schedules': HOUR,
+    'Games': HOUR,
+    'Standings': 15 * MINUTE,
+    'UpcomingSeason': 10 * MINUTE,
+    'CurrentWeek': 10 * MINUTE,
+    'CurrentSeason': 10 * MINUTE,
+    'Player': HOUR,
+    'Players': HOUR,
+    'FreeAgents': HOUR,
+    'PlayerGameStatsByWeek': MINUTE,
+    'PlayerGameStatsByDate': MINUTE,
+    'TeamGameStatsByDate': MINUTE,
+    'GamesByDate': MINUTE,
+    'BoxScoreV3': MINUTE,
+    'Injuries': 5 * MINUTE,
+    'RotoBallerPremiumNews': 5 * MINUTE,
+    'RotoBallerPremiumNewsByDate': 5 * MINUTE,
+    'RotoBallerPremiumNewsByPlayerID': 5 * MINUTE,
+    'RotoBallerPremiumNewsByTeam': 5 * MINUTE,
+    'PlayerGameProjectionStatsByPlayerID': 15 * MINUTE,
+    'PlayerGameProjectionStatsByTeam': 15 * MINUTE,
+    'PlayerGameProjectionStatsByWeek': 15 * MINUTE,
+    'FantasyDefenseProjectionsByGame': 15 * MINUTE,
+    'PlayerSeasonProjectionStats': HOUR,
+    'FantasyDefenseProjectionsBySeason': HOUR,
+}
+
+_DATE_FORMATS = ("%Y-%m-%d", "%Y-%b-%d")
+
+
+class CachePolicy(object):
+    """
+    Decides how long an API response stays fresh
+    `ttls` dict endpoint name -> seconds, merged over DEFAULT_TTLS. 0 or None disables caching
+    `default_ttl` seconds for endpoints missing in `ttls`
+    `past_ttl` seconds for calls about a finished season or a date older than `past_days`
+    """
+    def __init__(self, ttls=None, default_ttl=None, past_ttl=FOREVER, past_days=2):
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+        self.past_ttl = past_ttl
+        self.past_days = past_days
+
+    def ttl(self, game_type, category, method, params):
+        """
+        Seconds to keep the response of a call fresh, None to skip caching
+        `method` str API method url template, e.g. "Byes/{season}"
+        `params` dict parameters for method url
+        """
+        ttl = self.ttls.get(method.split('/', 1)[0], self.default_ttl)
+        if ttl and self.past_ttl and self._is_past(params):
+            return self.past_ttl
+        return ttl
+
+    def _is_past(self, params):
+        today = datetime.date.today()
+        season = params.get('season')
+        if season is not None:
+            match = re.match(r'\d{4}', str(season))
+            # NFL seasons end in February of the next year, NBA seasons are named after their end year
+            return bool(match) and int(match.group()) + 1 < today.year
+        for name in ('date', 'game_date'):
+            if params.get(name) is None:
+                continue
+            for date_format in _DATE_FORMATS:
+                try:
+                    date = datetime.datetime.strptime(str(params[name]), date_format).date()
+                except ValueError:
+                    continue
+                return (today - date).days > self.past_days
+        return False
@@ -0,0 +1,105 @@
+#coding:utf-8
+"""
+Columnar results: one NumPy array per field instead of one dict per row.
+
+Rows are taken apart as they arrive: with the iter_ methods, and the get_
+methods that have an iter_ variant, the incremental JSON parser feeds every
+row to the column builder and the row dict is dropped right after decoding.
+Only clients with a response cache convert the whole cached result. Each column gets the narrowest dtype that
+holds its values (bool, int64, float64, object for strings and nested data)
+and is a masked array: nulls and fields missing from a row are masked.
+
+NumPy is optional, ``pip install fantasy_data[numpy]``.
+"""
+import six
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('Columnar results need NumPy: pip install fantasy_data[numpy]')
+    return numpy
+
+
+class Columns(dict):
+    """
+    Field name -> numpy.ma.MaskedArray, all of length `rows`
+    """
+    def __init__(self, columns, rows):
+        dict.__init__(self, columns)
+        self.rows = rows
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError("'Columns' object has no attribute {0!r}".format(name))
+
+    def to_rows(self):
+        """
+        Rows back as a list of dicts, masked values as None
+        """
+        fields = list(self)
+        values = [self[field].tolist() for field in fields]
+        return [dict(zip(fields, row)) for row in zip(*values)]
+
+
+def _dtype(values):
+    """
+    Narrowest dtype for the non-null `values` of a column
+    """
+    types = set(type(value) for value in values if value is not None)
+    if not types:
+        return object, None
+    if types == {bool}:
+        return bool, False
+    if all(issubclass(t, six.integer_types) and t is not bool for t in types):
+        return 'int64', 0
+    if all((issubclass(t, six.integer_types) or t is float) and t is not bool for t in types):
+        return 'float64', 0.0
+    return object, None
+
+
+def to_columns(rows, fields=None):
+    """
+    Build Columns from an API result: a dict, a list of dicts or an iterator of dicts
+    `fields` iterable of field names to keep, all fields by default
+    """
+    numpy = _numpy()
+    if isinstance(rows, dict):
+        rows = [rows]
+    values = {}
+    if fields is not None:
+        for field in fields:
+            values[field] = []
+    count = 0
+    for row in rows:
+        for field, value in six.iteritems(row):
+            column = values.get(field)
+            if column is None:
+                if fields is not None:
+                    continue
+                # field first seen in this row, earlier rows don't have it
+                column = values[field] = [None] * count
+            column.append(value)
+        count += 1
+        for column in six.itervalues(values):
+            if len(column) < count:
+                column.append(None)
+
+    columns = {}
+    for field, column in six.iteritems(values):
+        dtype, fill = _dtype(column)
+        mask = numpy.fromiter((value is None for value in column), bool, count)
+        if fill is not None:
+            column = [fill if value is None else value for value in column]
+        data = numpy.empty(count, dtype=dtype)
+        if dtype is object:
+            # element-wise, so nested lists stay single values
+            for index, value in enumerate(column):
+                data[index] = value
+        else:
+            data[:] = column
+        columns[field] = numpy.ma.MaskedArray(data, mask=mask)
+    return Columns(columns, count)
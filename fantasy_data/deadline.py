@@ -0,0 +1,74 @@
+#coding:utf-8
+"""
+Deadlines and per-call timeouts.
+
+Both are context managers backed by context variables, so they apply to
+every API call made inside the block by the same thread or asyncio task.
+FantasyDataBase.batch and the async clients carry them over to their
+worker threads, so a fan-out started under ``deadline(5)`` stops within
+five seconds in total. Nested deadlines never extend an outer one.
+"""
+import contextlib
+import contextvars
+import time
+
+_deadline = contextvars.ContextVar('fantasy_data_deadline', default=None)
+_timeout = contextvars.ContextVar('fantasy_data_timeout', default=None)
+
+
+@contextlib.contextmanager
+def deadline(seconds):
+    """
+    API calls inside the block must finish within `seconds` from now
+    """
+    at = time.time() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(at if outer is None else min(at, outer))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextlib.contextmanager
+def timeout(value):
+    """
+    Socket timeouts for API calls inside the block, overriding the client's.
+    `value` float seconds or a (connect, read) tuple, like requests
+    """
+    token = _timeout.set(value)
+    try:
+        yield
+    finally:
+        _timeout.reset(token)
+
+
+def remaining():
+    """
+    Seconds left before the current deadline, None without one
+    """
+    at = _deadline.get()
+    return None if at is None else at - time.time()
+
+
+def active():
+    """
+    True when a deadline or a per-call timeout applies to calls made now
+    """
+    return _deadline.get() is not None or _timeout.get() is not None
+
+
+def current_timeout(default):
+    """
+    (connect, read) timeout for a request sent now: the per-call timeout or `default`,
+    shortened to the time left before the deadline
+    """
+    value = _timeout.get()
+    if value is None:
+        value = default
+    if not isinstance(value, tuple):
+        value = (value, value)
+    left = remaining()
+    if left is None:
+        return value
+    return tuple(left if part is None else min(part, left) for part in value)
@@ -0,0 +1,51 @@
+#coding:utf-8
+"""
+JSON decoding backends.
+
+orjson and ujson decode large stats payloads several times faster than the
+standard library. They are optional: "auto" picks the fastest one installed
+and falls back to json.
+"""
+import json
+
+
+def _orjson():
+    import orjson
+    return orjson.loads
+
+
+def _ujson():
+    import ujson
+    return ujson.loads
+
+
+def _json():
+    return json.loads
+
+
+# Backends in order of preference for "auto"
+DECODERS = (
+    ('orjson', _orjson),
+    ('ujson', _ujson),
+    ('json', _json),
+)
+
+
+def get_decoder(name='auto'):
+    """
+    JSON decode function taking bytes
+    `name` str one of "auto", "orjson", "ujson", "json", or a callable returned as is
+    Raises ValueError for an unknown name and ImportError for a backend that is not installed
+    """
+    if callable(name):
+        return name
+    factories = dict(DECODERS)
+    if name != 'auto':
+        if name not in factories:
+            raise ValueError('Unknown JSON decoder: {0}'.format(name))
+        return factories[name]()
+    for _, factory in DECODERS:
+        try:
+            return factory()
+        except ImportError:
+            continue
@@ -0,0 +1,327 @@
+#coding:utf-8
+"""
+Game-day polling with change events.
+
+A Poller calls a set of feeds (API calls such as box scores or player game
+stats by date) on the client's thread pool. Each feed is polled every
+`live_interval` seconds while one of its games is in progress, every
+`idle_interval` seconds otherwise, or not at all between games when
+`idle_interval` is None. Game times come from a Schedule built from
+get_schedules_for_season (NFL) or get_games_by_season (NBA).
+
+Responses identical to the previous poll are recognized by their hash and
+skipped. Otherwise the rows are matched by key with the previous ones and
+every added, updated or removed row is reported as a Change, to a callback
+(Poller.run) or an async iterator (Poller.changes).
+"""
+import asyncio
+import contextvars
+import datetime
+import hashlib
+import json
+import time
+
+from fantasy_data.FantasyData import FantasyDataError
+from fantasy_data.models import to_datetime
+
+try:
+    from zoneinfo import ZoneInfo
+    _EASTERN = ZoneInfo('America/New_York')
+except (ImportError, KeyError):  # Python < 3.9 or no time zone database
+    _EASTERN = None
+
+ADDED = 'added'
+UPDATED = 'updated'
+REMOVED = 'removed'
+
+# Statuses of NBA games that are over or won't be played
+_OVER = ('Final', 'F/OT', 'Canceled', 'Postponed', 'Suspended')
+
+
+def eastern_now():
+    """
+    Current naive datetime in US Eastern time, the time zone of the API's dates
+    """
+    if _EASTERN is not None:
+        return datetime.datetime.now(_EASTERN).replace(tzinfo=None)
+    # US daylight saving time: second Sunday of March 2:00 EST to first Sunday of November 2:00 EDT
+    utc = datetime.datetime.utcnow()
+    march = datetime.datetime(utc.year, 3, 8)
+    november = datetime.datetime(utc.year, 11, 1)
+    starts = march + datetime.timedelta(days=(6 - march.weekday()) % 7, hours=7)
+    ends = november + datetime.timedelta(days=(6 - november.weekday()) % 7, hours=6)
+    return utc - datetime.timedelta(hours=4 if starts <= utc < ends else 5)
+
+
+class PollError(FantasyDataError):
+    """
+    Polls of some feeds failed. `errors` dict feed name -> exception.
+    `changes` list of Change of the feeds polled successfully: they are not reported again
+    """
+    def __init__(self, errors, changes):
+        FantasyDataError.__init__(self, 'Error: Failed to poll {0}'.format(', '.join(sorted(errors))))
+        self.errors = errors
+        self.changes = changes
+
+
+class Schedule(object):
+    """
+    Start times and teams of games
+    `games` schedule or game rows with a "DateTime" or "Date", "HomeTeam" and "AwayTeam",
+    rows without a start time (byes) are ignored
+    `game_length` datetime.timedelta a game is considered in progress after its start
+    """
+    def __init__(self, games, game_length=datetime.timedelta(hours=4)):
+        self.game_length = game_length
+        self.games = []  # (start, teams, status) by start
+        for game in games:
+            start = to_datetime(game.get('DateTime') or game.get('Date'))
+            if not isinstance(start, datetime.datetime) or game.get('Canceled'):
+                continue
+            self.games.append((start, frozenset((game.get('HomeTeam'), game.get('AwayTeam'))), game.get('Status')))
+        self.games.sort(key=lambda game: game[0])
+
+    @classmethod
+    def nfl(cls, client, season, season_type='REG'):
+        return cls(client.get_schedules_for_season(season, season_type), datetime.timedelta(hours=4))
+
+    @classmethod
+    def nba(cls, client, season):
+        return cls(client.get_games_by_season(season), datetime.timedelta(hours=3))
+
+    def _games(self, teams):
+        for start, game_teams, status in self.games:
+            if teams is None or game_teams & teams:
+                yield start, status
+
+    def live(self, now, teams=None):
+        """
+        True if a game of `teams` (all games if None) is in progress at `now`
+        """
+        for start, status in self._games(teams):
+            if start > now:
+                break
+            if status == 'InProgress' or (status not in _OVER and now < start + self.game_length):
+                return True
+        return False
+
+    def next_start(self, now, teams=None):
+        """
+        Start of the next game of `teams` after `now`, None if there is none
+        """
+        for start, _ in self._games(teams):
+            if start > now:
+                return start
+        return None
+
+
+class Change(object):
+    """
+    A row added, updated or removed between two polls of a feed
+    `kind` str ADDED, UPDATED or REMOVED
+    `feed` str feed name
+    `key` value of the feed key fields of the row
+    `row` new row, None if removed
+    `previous` row at the previous poll, None if added
+    """
+    __slots__ = ('kind', 'feed', 'key', 'row', 'previous')
+
+    def __init__(self, kind, feed, key, row, previous=None):
+        self.kind = kind
+        self.feed = feed
+        self.key = key
+        self.row = row
+        self.previous = previous
+
+    def __repr__(self):
+        return 'Change({0} {1} {2!r})'.format(self.kind, self.feed, self.key)
+
+
+def _digest(result):
+    return hashlib.sha1(json.dumps(result, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _rows(result):
+    if result is None:
+        return []
+    return [result] if isinstance(result, dict) else result
+
+
+def diff(name, previous, rows, key):
+    """
+    Changes from `previous` rows by key to `rows`
+    Returns (rows by key, list of Change)
+    """
+    current = {}
+    for row in rows:
+        row_key = tuple(row.get(field) for field in key) if isinstance(key, tuple) else row.get(key)
+        current[row_key] = row
+    changes = []
+    for row_key, row in current.items():
+        old = previous.get(row_key)
+        if old is None:
+            changes.append(Change(ADDED, name, row_key, row))
+        elif old != row:
+            changes.append(Change(UPDATED, name, row_key, row, old))
+    for row_key, old in previous.items():
+        if row_key not in current:
+            changes.append(Change(REMOVED, name, row_key, None, old))
+    return current, changes
+
+
+class Feed(object):
+    """
+    One polled API call, see Poller.add
+    """
+    __slots__ = ('name', 'call', 'args', 'key', 'rows', 'teams', 'digest', 'records', 'due')
+
+    def __init__(self, name, call, args, key, rows, teams):
+        self.name = name
+        self.call = call
+        self.args = args
+        self.key = key
+        self.rows = rows
+        self.teams = teams
+        self.digest = None
+        self.records = {}
+        self.due = None  # datetime of the next poll, None when not scheduled
+
+    def fetch(self):
+        return self.call(*self.args)
+
+
+def _fetch(feed):
+    return feed.fetch()
+
+
+class Poller(object):
+    """
+    Polls feeds on a schedule and reports row changes
+    `client` FantasyData or FantasyDataNBA whose thread pool runs the polls
+    `schedule` Schedule
+    `live_interval` float seconds between polls while a game of the feed is in progress
+    `idle_interval` float seconds between polls otherwise, None to only poll during games
+    `now` callable returning the current naive datetime in the API's time zone (US Eastern)
+    `sleep` callable used to wait between polls
+    """
+    def __init__(self, client, schedule, live_interval=15, idle_interval=600, now=eastern_now,
+                 sleep=time.sleep):
+        self.client = client
+        self.schedule = schedule
+        self.live_interval = datetime.timedelta(seconds=live_interval)
+        self.idle_interval = None if idle_interval is None else datetime.timedelta(seconds=idle_interval)
+        self._now = now
+        self._sleep = sleep
+        self.feeds = {}  # name -> Feed
+
+    def add(self, name, call, args=(), key='PlayerID', rows=None, teams=None):
+        """
+        Poll `call` with `args`, e.g. client.get_box_score_by_team, (2016, 5, "WAS")
+        `key` field name or tuple of field names identifying a row
+        `rows` callable returning the rows of a result, e.g. lambda box: box["PlayerGames"].
+        By default a list result is the rows and a dict result a single row
+        `teams` team keys whose games make the feed live, None for all games
+        """
+        feed = self.feeds[name] = Feed(name, call, tuple(args), key, rows or _rows,
+                                       None if teams is None else frozenset(teams))
+        feed.due = self._now()
+        return feed
+
+    def _next_due(self, feed, now):
+        if self.schedule.live(now, feed.teams):
+            return now + self.live_interval
+        next_start = self.schedule.next_start(now, feed.teams)
+        if self.idle_interval is None:
+            return next_start
+        due = now + self.idle_interval
+        return min(due, next_start) if next_start else due
+
+    def next_poll(self):
+        """
+        Datetime of the next due feed, None if no feed is scheduled
+        """
+        due = [feed.due for feed in self.feeds.values() if feed.due is not None]
+        return min(due) if due else None
+
+    def poll(self, on_error=None):
+        """
+        Poll the feeds that are due, in parallel on the client's thread pool.
+        `on_error` callable(feed, exception) for failed polls, which are retried at the next interval.
+        When not given, PollError carrying the changes of the other feeds is raised after all feeds were polled
+        Returns the list of Change
+        """
+        now = self._now()
+        due = [feed for feed in self.feeds.values() if feed.due is not None and feed.due <= now]
+        if not due:
+            return []
+        results = self.client.batch(_fetch, due)
+        changes = []
+        for index, feed in enumerate(due):
+            feed.due = self._next_due(feed, now)
+            if index in results.errors:
+                continue
+            result = results[index]
+            digest = _digest(result)
+            if digest == feed.digest:
+                continue
+            feed.records, feed_changes = diff(feed.name, feed.records, feed.rows(result), feed.key)
+            feed.digest = digest
+            changes.extend(feed_changes)
+        if results.errors and on_error is None:
+            errors = dict((due[index].name, error) for index, error in results.errors.items())
+            raise PollError(errors, changes) from results.errors[min(results.errors)]
+        for index, error in sorted(results.errors.items()):
+            on_error(due[index], error)
+        return changes
+
+    def _poll(self, on_error):
+        """
+        poll() returning (changes, PollError or None), so changes are delivered before the error is raised
+        """
+        try:
+            return self.poll(on_error), None
+        except PollError as e:
+            return e.changes, e
+
+    def _delay(self):
+        next_poll = self.next_poll()
+        if next_poll is None:
+            return None
+        return max(0.0, (next_poll - self._now()).total_seconds())
+
+    def run(self, callback, stop=None, on_error=None):
+        """
+        Poll until `stop` (threading.Event) is set or no feed is scheduled any more,
+        calling `callback` with every Change. Without `on_error`, a failed poll raises
+        PollError once the changes of the other feeds were passed to `callback`
+        """
+        while stop is None or not stop.is_set():
+            changes, error = self._poll(on_error)
+            for change in changes:
+                callback(change)
+            if error is not None:
+                raise error
+            delay = self._delay()
+            if delay is None:
+                return
+            if stop is not None:
+                stop.wait(delay)
+            else:
+                self._sleep(delay)
+
+    async def changes(self, on_error=None):
+        """
+        Async iterator of Change, polls until no feed is scheduled any more
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            # polls block on the client, run them off the event loop
+            changes, error = await loop.run_in_executor(None, contextvars.copy_context().run, self._poll, on_error)
+            for change in changes:
+                yield change
+            if error is not None:
+                raise error
+            delay = self._delay()
+            if delay is None:
+                return
+            await asyncio.sleep(delay)
@@ -0,0 +1,288 @@
+#coding:utf-8
+"""
+Per-call instrumentation.
+
+With a metrics sink set, every API call (get_ methods) reports a
+RequestEvent: endpoint, status, timings of each phase, payload sizes,
+retries and the cache outcome. Phases are
+
+    connect   DNS lookup and TCP connect of a new connection
+    tls       TLS handshake of a new connection
+    server    request sent until response headers, minus connect and tls
+    download  reading and decompressing the body
+    decode    JSON decoding
+
+A sink is any callable taking a RequestEvent, or an object with a record
+method such as the built-in Histograms collector, which also exports the
+Prometheus text format.
+"""
+import contextvars
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+PHASES = ('connect', 'tls', 'server', 'download', 'decode')
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+_trace = contextvars.ContextVar('fantasy_data_trace', default=None)
+
+
+def start_trace():
+    """
+    Collect phase timings of the calls made in the current context into a new trace dict
+    """
+    trace = {'retries': 0}
+    return trace, _trace.set(trace)
+
+
+def end_trace(token):
+    _trace.reset(token)
+
+
+def note(key, value):
+    """
+    Add `value` to `key` of the current trace, if any
+    """
+    trace = _trace.get()
+    if trace is not None:
+        trace[key] = trace.get(key, 0) + value
+
+
+def mark(key, value):
+    """
+    Set `key` of the current trace, if any
+    """
+    trace = _trace.get()
+    if trace is not None:
+        trace[key] = value
+
+
+class _TimedConnectionMixin(object):
+    def _new_conn(self):
+        started = time.perf_counter()
+        try:
+            return super(_TimedConnectionMixin, self)._new_conn()
+        finally:
+            self._connect_seconds = time.perf_counter() - started
+            note('connect', self._connect_seconds)
+
+    def connect(self):
+        self._connect_seconds = 0
+        started = time.perf_counter()
+        try:
+            super(_TimedConnectionMixin, self).connect()
+        finally:
+            # HTTPS connect is TCP connect followed by the TLS handshake
+            handshake = time.perf_counter() - started - self._connect_seconds
+            if isinstance(self, HTTPSConnection):
+                note('tls', handshake)
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose connections report connect and TLS handshake times
+    """
+    def init_poolmanager(self, *args, **kwargs):
+        HTTPAdapter.init_poolmanager(self, *args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+class RequestEvent(object):
+    """
+    One API call
+    `game_type`, `endpoint` str e.g. "nfl", "PlayerGameStatsByWeek"
+    `status` int HTTP status of the last response, None if none was received
+    `seconds` float whole call
+    `phases` dict phase name -> seconds, see PHASES
+    `wire_bytes`, `decoded_bytes` int body size as transferred and after decompression
+    `retries` int requests resent after errors or throttling
+    `cache` str "hit", "miss", "revalidated", or None when the call isn't cached
+    `error` str exception class name if the call failed
+    """
+    __slots__ = ('game_type', 'endpoint', 'status', 'seconds', 'phases', 'wire_bytes', 'decoded_bytes', 'retries',
+                 'cache', 'error')
+
+    def __init__(self, game_type, endpoint, status, seconds, phases, wire_bytes=0, decoded_bytes=0, retries=0,
+                 cache=None, error=None):
+        self.game_type = game_type
+        self.endpoint = endpoint
+        self.status = status
+        self.seconds = seconds
+        self.phases = phases
+        self.wire_bytes = wire_bytes
+        self.decoded_bytes = decoded_bytes
+        self.retries = retries
+        self.cache = cache
+        self.error = error
+
+    @classmethod
+    def from_trace(cls, game_type, endpoint, seconds, trace, transfer=None, error=None):
+        phases = dict((phase, trace.get(phase, 0.0)) for phase in PHASES)
+        phases['server'] = max(0.0, trace.get('request', 0.0) - phases['connect'] - phases['tls'])
+        return cls(game_type, endpoint, trace.get('status'), seconds, phases,
+                   transfer.wire_bytes if transfer else 0, transfer.decoded_bytes if transfer else 0,
+                   trace.get('retries', 0), trace.get('cache'), error and type(error).__name__)
+
+    def __repr__(self):
+        return 'RequestEvent({0}/{1} status={2} seconds={3:.4f})'.format(
+            self.game_type, self.endpoint, self.status, self.seconds)
+
+
+def as_sink(metrics):
+    """
+    Callable taking a RequestEvent from a sink object, a callable or a list of them
+    """
+    if metrics is None:
+        return None
+    if isinstance(metrics, (list, tuple)):
+        sinks = [as_sink(sink) for sink in metrics]
+
+        def fan_out(event):
+            for sink in sinks:
+                sink(event)
+        return fan_out
+    if hasattr(metrics, 'record'):
+        return metrics.record
+    return metrics
+
+
+class Histogram(object):
+    """
+    Cumulative bucket counts of observed values
+    """
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+    def quantile(self, q):
+        """
+        Upper bound of the bucket holding the `q` quantile, inf if it is past the last bucket
+        """
+        rank = q * self.count
+        for bound, count in zip(self.buckets, self.counts):
+            if count >= rank:
+                return bound
+        return float('inf')
+
+
+def _labels(**labels):
+    return ','.join('{0}="{1}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                    for name, value in sorted(labels.items()))
+
+
+class Histograms(object):
+    """
+    In-memory metrics collector: latency histograms per endpoint and phase, and counters
+    for statuses, cache outcomes, bytes, retries and errors
+    `buckets` histogram bucket upper bounds in seconds
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.histograms = {}  # (game_type, endpoint, phase) -> Histogram, phase "total" for whole calls
+        self.counters = {}  # (metric name, labels tuple) -> number
+
+    def _count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def _observe(self, game_type, endpoint, phase, seconds):
+        key = (game_type, endpoint, phase)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def record(self, event):
+        with self._lock:
+            self._observe(event.game_type, event.endpoint, 'total', event.seconds)
+            for phase, seconds in event.phases.items():
+                if seconds:
+                    self._observe(event.game_type, event.endpoint, phase, seconds)
+            labels = {'game_type': event.game_type, 'endpoint': event.endpoint}
+            self._count('requests_total', status=event.status or 'none', **labels)
+            if event.cache:
+                self._count('cache_total', result=event.cache, **labels)
+            if event.wire_bytes:
+                self._count('response_wire_bytes_total', event.wire_bytes, **labels)
+            if event.decoded_bytes:
+                self._count('response_decoded_bytes_total', event.decoded_bytes, **labels)
+            if event.retries:
+                self._count('retries_total', event.retries, **labels)
+            if event.error:
+                self._count('errors_total', error=event.error, **labels)
+
+    def quantile(self, endpoint, q, phase='total', game_type=None):
+        """
+        Approximate `q` quantile of `endpoint` latency in seconds, None if never called
+        """
+        histogram = Histogram(self.buckets)
+        with self._lock:
+            for (histogram_game_type, histogram_endpoint, histogram_phase), other in self.histograms.items():
+                if histogram_endpoint != endpoint or histogram_phase != phase:
+                    continue
+                if game_type is not None and histogram_game_type != game_type:
+                    continue
+                histogram.count += other.count
+                histogram.counts = [a + b for a, b in zip(histogram.counts, other.counts)]
+        return histogram.quantile(q) if histogram.count else None
+
+    def prometheus(self, prefix='fantasydata'):
+        """
+        All metrics in the Prometheus text exposition format
+        """
+        lines = []
+        with self._lock:
+            name = prefix + '_request_seconds'
+            lines.append('# HELP {0} API call latency by phase'.format(name))
+            lines.append('# TYPE {0} histogram'.format(name))
+            for (game_type, endpoint, phase), histogram in sorted(self.histograms.items()):
+                labels = dict(game_type=game_type, endpoint=endpoint, phase=phase)
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append('{0}_bucket{{{1}}} {2}'.format(name, _labels(le=bound, **labels), count))
+                lines.append('{0}_bucket{{{1}}} {2}'.format(name, _labels(le='+Inf', **labels), histogram.count))
+                lines.append('{0}_sum{{{1}}} {2}'.format(name, _labels(**labels), histogram.sum))
+                lines.append('{0}_count{{{1}}} {2}'.format(name, _labels(**labels), histogram.count))
+            names = sorted(set(counter for counter, _ in self.counters))
+            for counter in names:
+                name = '{0}_{1}'.format(prefix, counter)
+                lines.append('# TYPE {0} counter'.format(name))
+                for (counter_name, labels), value in sorted(self.counters.items(), key=lambda item: str(item[0])):
+                    if counter_name == counter:
+                        lines.append('{0}{{{1}}} {2}'.format(name, _labels(**dict(labels)), value))
+        return '\n'.join(lines) + '\n'
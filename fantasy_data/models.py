@@ -0,0 +1,368 @@
+#coding:utf-8
+"""
+Compact record classes for API results.
+
+Records keep field values in __slots__ instead of a per-row dict, which about
+halves memory per row for wide stat rows. Values are stored as they
+come from the API and converted on first attribute access (dates to
+datetime, numeric strings to numbers). Fields a model doesn't declare are
+kept in a small per-row dict, so no data is lost.
+
+Every API method returning these entities accepts ``as_models=True``,
+``as_columns=True`` for a columnar result (see fantasy_data.columns) and
+``as_table=True`` for an indexed result (see fantasy_data.query).
+"""
+import datetime
+import functools
+
+import six
+
+from fantasy_data.columns import to_columns
+from fantasy_data.query import Table
+
+_DATE_FORMATS = ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%d")
+
+
+def to_datetime(value):
+    """
+    Parse an API date string, "2016-10-09T13:00:00"
+    """
+    if not isinstance(value, six.string_types):
+        return value
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    return value
+
+
+def to_number(value):
+    """
+    Parse a numeric string, leave everything else as is
+    """
+    if not isinstance(value, six.string_types):
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+class _Field(object):
+    """
+    Attribute reading a slot and converting its value once
+    """
+    __slots__ = ('name', 'slot', 'bit', 'convert')
+
+    def __init__(self, name, slot, bit, convert):
+        self.name = name
+        self.slot = slot
+        self.bit = bit
+        self.convert = convert
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        value = self.slot.__get__(obj, cls)
+        if self.convert is not None and not obj._converted & self.bit:
+            value = self.convert(value)
+            self.slot.__set__(obj, value)
+            obj._converted |= self.bit
+        return value
+
+    def __set__(self, obj, value):
+        self.slot.__set__(obj, value)
+        obj._converted |= self.bit
+
+
+class RecordMeta(type):
+    """
+    Builds slots and lazy fields from the `_fields` declaration of a record class.
+    `_fields` entries are field names or (name, converter) pairs
+    """
+    def __new__(mcs, name, bases, namespace):
+        declared = [field if isinstance(field, tuple) else (field, None) for field in namespace.get('_fields', ())]
+        inherited = [field for base in bases for field in getattr(base, '_field_specs', ())]
+        specs = inherited + [field for field in declared if field[0] not in dict(inherited)]
+        namespace['_fields'] = tuple(field for field, _ in specs)
+        namespace['_field_specs'] = tuple(specs)
+        if '__slots__' not in namespace:
+            namespace['__slots__'] = tuple('_' + field for field, _ in declared if field not in dict(inherited))
+        cls = type.__new__(mcs, name, bases, namespace)
+        members = []
+        bit = 1
+        for field, convert in specs:
+            member = getattr(cls, '_' + field)
+            if isinstance(member, _Field):
+                member = member.slot
+            setattr(cls, field, _Field(field, member, bit if convert else 0, convert))
+            if convert:
+                # only fields with a converter need a "converted" flag
+                bit <<= 1
+            members.append((field, member))
+        cls._members = tuple(members)
+        return cls
+
+
+class Record(six.with_metaclass(RecordMeta, object)):
+    """
+    Base class for API entities
+    """
+    __slots__ = ('_converted', '_extra')
+    _fields = ()
+
+    def __init__(self, **values):
+        self._converted = 0
+        self._extra = None
+        for field, member in self._members:
+            member.__set__(self, values.pop(field, None))
+        if values:
+            self._extra = values
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    @classmethod
+    def from_result(cls, result):
+        """
+        Convert an API result: a dict, a list of dicts or an iterator of dicts
+        """
+        if isinstance(result, dict):
+            return cls(**result)
+        if isinstance(result, list):
+            return [cls(**row) for row in result]
+        return (cls(**row) for row in result)
+
+    def to_dict(self):
+        """
+        Field values as a dict, including fields the model doesn't declare
+        """
+        data = dict((field, getattr(self, field)) for field in self._fields)
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def __getattr__(self, name):
+        # only called for names that are neither fields nor methods
+        extra = object.__getattribute__(self, '_extra')
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError("{0!r} object has no attribute {1!r}".format(type(self).__name__, name))
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name)
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __repr__(self):
+        key = ', '.join('{0}={1!r}'.format(field, getattr(self, field)) for field in self._fields[:3])
+        return '{0}({1})'.format(type(self).__name__, key)
+
+
+NFL_STAT_FIELDS = (
+    'PassingAttempts', 'PassingCompletions', 'PassingYards', 'PassingCompletionPercentage',
+    'PassingYardsPerAttempt', 'PassingYardsPerCompletion', 'PassingTouchdowns', 'PassingInterceptions',
+    'PassingRating', 'PassingLong', 'PassingSacks', 'PassingSackYards', 'RushingAttempts', 'RushingYards',
+    'RushingYardsPerAttempt', 'RushingTouchdowns', 'RushingLong', 'ReceivingTargets', 'Receptions',
+    'ReceivingYards', 'ReceivingYardsPerReception', 'ReceivingTouchdowns', 'ReceivingLong', 'Fumbles',
+    'FumblesLost', 'PuntReturns', 'PuntReturnYards', 'PuntReturnTouchdowns', 'KickReturns', 'KickReturnYards',
+    'KickReturnTouchdowns', 'SoloTackles', 'AssistedTackles', 'TacklesForLoss', 'Sacks', 'SackYards',
+    'QuarterbackHits', 'PassesDefended', 'FumblesForced', 'FumblesRecovered', 'FumbleReturnYards',
+    'FumbleReturnTouchdowns', 'Interceptions', 'InterceptionReturnYards', 'InterceptionReturnTouchdowns',
+    'BlockedKicks', 'SpecialTeamsSoloTackles', 'SpecialTeamsAssistedTackles', 'MiscSoloTackles',
+    'MiscAssistedTackles', 'Punts', 'PuntYards', 'PuntAverage', 'FieldGoalsAttempted', 'FieldGoalsMade',
+    'FieldGoalsLongestMade', 'ExtraPointsMade', 'TwoPointConversionPasses', 'TwoPointConversionRuns',
+    'TwoPointConversionReceptions', 'FantasyPoints', 'FantasyPointsPPR', 'ReceptionPercentage',
+    'ReceivingYardsPerTarget', 'Tackles', 'OffensiveTouchdowns', 'DefensiveTouchdowns',
+    'SpecialTeamsTouchdowns', 'Touchdowns', 'FantasyPosition', 'FieldGoalPercentage', 'FumblesOwnRecoveries',
+    'FumblesOutOfBounds', 'KickReturnFairCatches', 'PuntReturnFairCatches', 'PuntTouchbacks', 'PuntInside20',
+    'PuntNetAverage', 'ExtraPointsAttempted', 'BlockedKickReturnTouchdowns', 'FieldGoalReturnTouchdowns',
+    'Safeties', 'FieldGoalsHadBlocked', 'PuntsHadBlocked', 'ExtraPointsHadBlocked', 'PuntLong',
+    'BlockedKickReturnYards', 'FieldGoalReturnYards', 'PuntNetYards', 'SpecialTeamsFumblesForced',
+    'SpecialTeamsFumblesRecovered', 'MiscFumblesForced', 'MiscFumblesRecovered', 'SafetiesAllowed',
+    'FantasyPointsFanDuel', 'FieldGoalsMade0to19', 'FieldGoalsMade20to29', 'FieldGoalsMade30to39',
+    'FieldGoalsMade40to49', 'FieldGoalsMade50Plus', 'FantasyPointsDraftKings', 'FantasyPointsYahoo',
+    'OffensiveSnapsPlayed', 'DefensiveSnapsPlayed', 'SpecialTeamsSnapsPlayed', 'OffensiveTeamSnaps',
+    'DefensiveTeamSnaps', 'SpecialTeamsTeamSnaps', 'FanDuelSalary', 'DraftKingsSalary', 'YahooSalary',
+)
+
+NBA_STAT_FIELDS = (
+    'Minutes', 'Seconds', 'FieldGoalsMade', 'FieldGoalsAttempted', 'FieldGoalsPercentage',
+    'EffectiveFieldGoalsPercentage', 'TwoPointersMade', 'TwoPointersAttempted', 'TwoPointersPercentage',
+    'ThreePointersMade', 'ThreePointersAttempted', 'ThreePointersPercentage', 'FreeThrowsMade',
+    'FreeThrowsAttempted', 'FreeThrowsPercentage', 'OffensiveRebounds', 'DefensiveRebounds', 'Rebounds',
+    'OffensiveReboundsPercentage', 'DefensiveReboundsPercentage', 'TotalReboundsPercentage', 'Assists',
+    'Steals', 'BlockedShots', 'Turnovers', 'PersonalFouls', 'Points', 'TrueShootingAttempts',
+    'TrueShootingPercentage', 'PlayerEfficiencyRating', 'AssistsPercentage', 'StealsPercentage',
+    'BlocksPercentage', 'TurnOversPercentage', 'UsageRatePercentage', 'FantasyPointsFanDuel',
+    'FantasyPointsDraftKings', 'FantasyPointsYahoo', 'PlusMinus', 'DoubleDoubles', 'TripleDoubles',
+    'FantasyPoints', 'FanDuelSalary', 'DraftKingsSalary', 'YahooSalary',
+)
+
+
+class Player(Record):
+    """
+    NFL player profile
+    """
+    _fields = (
+        'PlayerID', 'Team', 'Number', 'FirstName', 'LastName', 'Name', 'ShortName', 'Position',
+        'PositionCategory', 'FantasyPosition', 'Status', 'Active', 'Height', ('Weight', to_number),
+        ('BirthDate', to_datetime), 'BirthDateString', 'College', 'Experience', 'ExperienceString', 'Age',
+        'ByeWeek', 'UpcomingGameOpponent', 'UpcomingGameWeek', 'InjuryStatus', 'DepthPositionCategory',
+        'DepthPosition', 'DepthOrder', 'DepthDisplayOrder', 'AverageDraftPosition', 'PhotoUrl', 'LatestNews',
+        'PlayerSeason',
+    )
+
+
+class PlayerGame(Record):
+    """
+    NFL player stats for one game
+    """
+    _fields = (
+        'PlayerGameID', 'PlayerID', 'GameKey', 'SeasonType', 'Season', ('GameDate', to_datetime), 'Week',
+        'Team', 'Opponent', 'HomeOrAway', 'Number', 'Name', 'ShortName', 'Position', 'PositionCategory',
+        'Activated', 'Played', 'Started', 'Stadium', 'IsGameOver', 'InjuryStatus', 'ScoringDetails',
+    ) + NFL_STAT_FIELDS
+
+
+class Projection(PlayerGame):
+    """
+    NFL projected player stats for a game or a season
+    """
+    __slots__ = ()
+
+
+class Team(Record):
+    """
+    NFL or NBA team
+    """
+    _fields = (
+        'TeamID', 'Key', 'Active', 'City', 'Name', 'FullName', 'Conference', 'Division', 'StadiumID',
+        'PrimaryColor', 'SecondaryColor', 'TertiaryColor', 'QuaternaryColor', 'WikipediaLogoUrl',
+        'WikipediaWordMarkUrl', 'ByeWeek', 'HeadCoach', 'OffensiveCoordinator', 'DefensiveCoordinator',
+    )
+
+
+class Game(Record):
+    """
+    NFL scheduled game
+    """
+    _fields = (
+        'GameKey', 'SeasonType', 'Season', 'Week', ('Date', to_datetime), 'AwayTeam', 'HomeTeam', 'Channel',
+        ('PointSpread', to_number), ('OverUnder', to_number), 'StadiumID', 'Canceled', 'GeoLat', 'GeoLong',
+        'ForecastTempLow', 'ForecastTempHigh', 'ForecastDescription', 'ForecastWindChill', 'ForecastWindSpeed',
+        'AwayTeamMoneyLine', 'HomeTeamMoneyLine',
+    )
+
+
+class Injury(Record):
+    """
+    NFL player injury report
+    """
+    _fields = (
+        'InjuryID', 'SeasonType', 'Season', 'Week', 'PlayerID', 'Name', 'Position', 'Number', 'Team',
+        'Opponent', 'BodyPart', 'Status', 'Practice', 'PracticeDescription', ('Updated', to_datetime),
+        'DeclaredInactive',
+    )
+
+
+class NBAPlayerGame(Record):
+    """
+    NBA player stats for one game
+    """
+    _fields = (
+        'StatID', 'TeamID', 'PlayerID', 'SeasonType', 'Season', 'Name', 'Team', 'Position', 'Started',
+        'InjuryStatus', 'GameID', 'OpponentID', 'Opponent', ('Day', to_datetime), ('DateTime', to_datetime),
+        'HomeOrAway', 'Games', ('Updated', to_datetime),
+    ) + NBA_STAT_FIELDS
+
+
+class NBAGame(Record):
+    """
+    NBA game
+    """
+    _fields = (
+        'GameID', 'Season', 'SeasonType', 'Status', ('Day', to_datetime), ('DateTime', to_datetime),
+        'AwayTeam', 'HomeTeam', 'AwayTeamID', 'HomeTeamID', 'StadiumID', 'Channel', 'Attendance',
+        'AwayTeamScore', 'HomeTeamScore', ('Updated', to_datetime), 'Quarter', 'TimeRemainingMinutes',
+        'TimeRemainingSeconds', ('PointSpread', to_number), ('OverUnder', to_number),
+        'AwayTeamMoneyLine', 'HomeTeamMoneyLine', 'GlobalGameID', 'IsClosed',
+    )
+
+
+class Standing(Record):
+    """
+    NBA team standing
+    """
+    _fields = (
+        'Season', 'SeasonType', 'TeamID', 'Key', 'City', 'Name', 'Conference', 'Division', 'Wins', 'Losses',
+        'Percentage', 'ConferenceWins', 'ConferenceLosses', 'DivisionWins', 'DivisionLosses', 'HomeWins',
+        'HomeLosses', 'AwayWins', 'AwayLosses', 'LastTenWins', 'LastTenLosses', 'PointsPerGameFor',
+        'PointsPerGameAgainst', 'Streak', 'GamesBack', 'StreakDescription', 'GlobalTeamID',
+    )
+
+
+def _streamed(method, args):
+    """
+    iter_ variant of get_ API `method` bound to the client in `args`, None when there's none
+    or when the client has a response cache, whose cached rows are converted instead
+    """
+    name = method.__name__
+    if not name.startswith('get_') or not args or getattr(args[0], '_cache', None) is not None:
+        return None
+    return getattr(args[0], 'iter_' + name[len('get_'):], None)
+
+
+def returns(model):
+    """
+    Decorator for API methods: adds an `as_models` keyword argument
+    converting the result to `model` records, an `as_columns` keyword
+    argument converting it to Columns of NumPy arrays, and an `as_table`
+    keyword argument returning the rows (or records) as an indexed Table
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def call(*args, **kwargs):
+            as_models = kwargs.pop('as_models', False)
+            as_columns = kwargs.pop('as_columns', False)
+            as_table = kwargs.pop('as_table', False)
+            if as_columns and (as_models or as_table):
+                raise ValueError('as_columns excludes as_models and as_table')
+            if as_columns:
+                stream = _streamed(method, args)
+                if stream is not None:
+                    # rows go from the JSON parser straight into the columns, no list of rows is built
+                    return to_columns(stream(*args[1:], **kwargs))
+            result = method(*args, **kwargs)
+            if as_models:
+                result = model.from_result(result)
+            elif as_columns:
+                result = to_columns(result)
+            if as_table:
+                result = Table([result] if isinstance(result, (dict, Record)) else result)
+            return result
+        return call
+    return decorator
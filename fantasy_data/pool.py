@@ -0,0 +1,301 @@
+#coding:utf-8
+"""
+Client pools spreading calls over several API keys.
+
+A pool holds one client, with its own session and rate limiter, per
+subscription key and exposes the same API methods. Every call goes to the
+key with the fewest calls in flight. Keys the API rejects (401) are taken
+out of rotation, throttled keys rest until the API's Retry-After, and keys
+past their quota are skipped, so the call is retried on another key right
+away. Only when every key rests does the pool wait for the first one back.
+Requests sent are counted per key; cache hits don't count.
+
+The async clients take a pool as their client: AsyncFantasyData(client=pool).
+"""
+import functools
+import threading
+import time
+
+from fantasy_data import deadline as deadlines
+from fantasy_data import metrics as metrics_module
+from fantasy_data.cache import MemoryCache
+from fantasy_data.FantasyData import (DeadlineExceeded, FantasyData, FantasyDataBase, FantasyDataError,
+                                      FantasyDataNBA, InvalidKeyError, RateLimitError)
+
+_END = object()  # marks the end of a routed iteration
+
+
+class KeyUsage(object):
+    """
+    Usage of one API key
+    `calls` int API method calls routed to the key
+    `requests` int HTTP requests sent with the key, retries included
+    `errors` int failed calls
+    `throttled` int calls that ended throttled
+    `in_flight` int calls running now
+    `quota` int requests allowed, None for no limit
+    `disabled` bool the API rejected the key
+    `resting_until` float time.monotonic() until which a throttled key is skipped
+    """
+    __slots__ = ('key', 'calls', 'requests', 'errors', 'throttled', 'in_flight', 'quota', 'disabled',
+                 'resting_until')
+
+    def __init__(self, key, quota=None):
+        self.key = key
+        self.calls = self.requests = self.errors = self.throttled = self.in_flight = 0
+        self.quota = quota
+        self.disabled = False
+        self.resting_until = 0
+
+    @property
+    def remaining(self):
+        """
+        Requests left in the quota, None for no limit
+        """
+        return None if self.quota is None else max(0, self.quota - self.requests)
+
+    def usable(self, now):
+        return not self.disabled and self.resting_until <= now and self.remaining != 0
+
+    def to_dict(self):
+        data = dict((field, getattr(self, field)) for field in self.__slots__ if field != 'key')
+        data['remaining'] = self.remaining
+        return data
+
+    def __repr__(self):
+        # never show a whole key
+        return 'KeyUsage(...{0} calls={1} requests={2})'.format(self.key[-4:], self.calls, self.requests)
+
+
+class FantasyDataPoolBase(object):
+    """
+    Base class for client pools
+    """
+    _client_class = None
+
+    def __init__(self, api_keys, quota=None, rest=60, throttle_retries=3, max_throttle_wait=300, **client_kwargs):
+        """
+        `api_keys` list of subscription keys
+        `quota` int requests allowed per key, or dict key -> int. No limit by default
+        `rest` float seconds a throttled key is skipped when the API didn't say how long
+        `throttle_retries` int times a call waits for a key when all of them are throttled
+        `max_throttle_wait` float longest wait for a key. RateLimitError is raised right away when
+        the first key back rests longer
+        `client_kwargs` passed to every client, e.g. rate_limit (per key) or retry.
+        A response cache is shared by all keys
+        """
+        if not api_keys:
+            raise ValueError('At least one API key is needed')
+        if client_kwargs.get('cache') is True:
+            client_kwargs['cache'] = MemoryCache()
+        # a throttled key hands the call to another key instead of waiting
+        client_kwargs['throttle_retries'] = 0
+        client_kwargs['max_throttle_wait'] = max_throttle_wait
+        self._rest = rest
+        self._throttle_retries = throttle_retries
+        self._max_throttle_wait = max_throttle_wait
+        self._lock = threading.Lock()
+        self.usage = []  # KeyUsage per key, in the order of `api_keys`
+        self._clients = []
+        for key in api_keys:
+            usage = KeyUsage(key, quota.get(key) if isinstance(quota, dict) else quota)
+            kwargs = dict(client_kwargs)
+            kwargs['metrics'] = [functools.partial(_count_requests, self._lock, usage)] + \
+                _sinks(client_kwargs.get('metrics'))
+            self.usage.append(usage)
+            self._clients.append(self._client_class(key, **kwargs))
+        # for batch(), see FantasyDataBase
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._pool_maxsize = sum(client._pool_maxsize for client in self._clients)
+
+    @property
+    def clients(self):
+        return list(self._clients)
+
+    def usage_report(self):
+        """
+        dict key suffix -> usage dict, for logs and dashboards
+        """
+        with self._lock:
+            return dict(('...' + usage.key[-4:], usage.to_dict()) for usage in self.usage)
+
+    def _acquire(self, tried):
+        """
+        Index of the key for the next call and mark it in flight.
+        Raises if every key not in `tried` is disabled, resting or out of quota
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [index for index, usage in enumerate(self.usage)
+                          if index not in tried and usage.usable(now)]
+            if not candidates:
+                raise self._no_key(now)
+            index = min(candidates, key=lambda index: (self.usage[index].in_flight, self.usage[index].requests))
+            usage = self.usage[index]
+            usage.in_flight += 1
+            usage.calls += 1
+            return index
+
+    def _no_key(self, now):
+        resting = [usage.resting_until - now for usage in self.usage
+                   if not usage.disabled and usage.resting_until > now and usage.remaining != 0]
+        if resting:
+            return RateLimitError('Error: Rate limit exceeded on every API key', min(resting))
+        if all(usage.disabled for usage in self.usage):
+            return InvalidKeyError('Error: Invalid API key')
+        return FantasyDataError('Error: API quota used up on every key')
+
+    def _call(self, name, *args, **kwargs):
+        """
+        Call client method `name` on the least busy key, then on the other keys
+        while keys are rejected or throttled
+        """
+        tried = set()
+        waits = 0
+        while True:
+            try:
+                index = self._acquire(tried)
+            except RateLimitError as e:
+                if waits == self._throttle_retries:
+                    raise
+                waits += 1
+                self._sleep(e.retry_after)
+                tried.clear()
+                continue
+            usage = self.usage[index]
+            try:
+                return getattr(self._clients[index], name)(*args, **kwargs)
+            except (InvalidKeyError, RateLimitError) as e:
+                self._failed(usage, e)
+            except Exception as e:
+                self._failed(usage, e)
+                raise
+            finally:
+                with self._lock:
+                    usage.in_flight -= 1
+            tried.add(index)
+
+    def _failed(self, usage, error):
+        """
+        Count a failed call of the key of `usage`: rejected keys leave the rotation, throttled keys rest
+        """
+        with self._lock:
+            usage.errors += 1
+            if isinstance(error, InvalidKeyError):
+                usage.disabled = True
+            elif isinstance(error, RateLimitError):
+                usage.throttled += 1
+                usage.resting_until = time.monotonic() + (self._rest if error.retry_after is None else error.retry_after)
+
+    def _sleep(self, seconds):
+        if seconds > self._max_throttle_wait:
+            raise RateLimitError('Error: Rate limit exceeded on every API key', seconds)
+        left = deadlines.remaining()
+        if left is not None and seconds >= left:
+            raise DeadlineExceeded('Error: Deadline exceeded')
+        time.sleep(seconds)
+
+    def _route(self, name, *args, **kwargs):
+        """
+        Iterate client generator method `name` on the least busy key, without failover.
+        For iter_ methods, whose requests are only sent while iterating: the key is picked when
+        the iteration starts and stays in flight until it is exhausted, fails or is closed
+        """
+        index = self._acquire(())
+        usage = self.usage[index]
+        items = None
+        try:
+            items = iter(getattr(self._clients[index], name)(*args, **kwargs))
+            # the request and its retries are sent on the first item
+            trace, token = metrics_module.start_trace()
+            try:
+                item = next(items, _END)
+            finally:
+                metrics_module.end_trace(token)
+                with self._lock:
+                    # streamed calls don't report metrics events
+                    usage.requests += 1 + trace['retries']
+            while item is not _END:
+                yield item
+                item = next(items, _END)
+        except Exception as e:
+            self._failed(usage, e)
+            raise
+        finally:
+            close = getattr(items, 'close', None)
+            if close is not None:
+                close()
+            with self._lock:
+                usage.in_flight -= 1
+
+    _get_executor = FantasyDataBase._get_executor
+    batch = FantasyDataBase.batch
+    _planned_batch = FantasyDataBase._planned_batch
+
+    def close(self):
+        """
+        Close every client
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        for client in self._clients:
+            client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _sinks(metrics):
+    if metrics is None:
+        return []
+    return list(metrics) if isinstance(metrics, (list, tuple)) else [metrics]
+
+
+def _count_requests(lock, usage, event):
+    """
+    Metrics sink counting the requests a call sent with the key of `usage`
+    """
+    if event.cache == 'hit':
+        return
+    with lock:
+        usage.requests += 1 + event.retries
+
+
+def _pool_method(name, method, route):
+    @functools.wraps(method)
+    def call(self, *args, **kwargs):
+        return route(self, name, *args, **kwargs)
+    return call
+
+
+def _pool_api(cls):
+    """
+    Expose every public get_* and iter_* method of `cls._client_class`
+    """
+    for name in dir(cls._client_class):
+        if name.startswith('get_') and not hasattr(cls, name):
+            setattr(cls, name, _pool_method(name, getattr(cls._client_class, name), cls._call))
+        elif name.startswith('iter_') and not hasattr(cls, name):
+            setattr(cls, name, _pool_method(name, getattr(cls._client_class, name), cls._route))
+    return cls
+
+
+@_pool_api
+class FantasyDataPool(FantasyDataPoolBase):
+    """
+    NFL API calls spread over several keys
+    """
+    _client_class = FantasyData
+
+
+@_pool_api
+class FantasyDataNBAPool(FantasyDataPoolBase):
+    """
+    NBA API calls spread over several keys
+    """
+    _client_class = FantasyDataNBA
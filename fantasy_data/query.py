@@ -0,0 +1,150 @@
+#coding:utf-8
+"""
+Indexed query results.
+
+A Table is the list of rows an API method returned, with hash indexes on
+fields built the first time they are queried. A lookup by PlayerID, Team,
+GameKey, Position or Week then takes a dict lookup instead of a scan of
+every row, and later lookups on the same field reuse the index.
+
+Every API method returning entities accepts ``as_table=True``, which can be
+combined with ``as_models=True``. Rows may be dicts or records.
+"""
+
+
+_MANY = (list, tuple, set, frozenset)
+
+# _indexes key of the row id -> position map
+_POSITIONS = object()
+
+
+def _key(row, on):
+    """
+    Value of field `on` in `row`, a tuple of values when `on` is a tuple of fields
+    """
+    if isinstance(on, tuple):
+        return tuple(row.get(field) for field in on)
+    return row.get(on)
+
+
+def _invalidating(name):
+    method = getattr(list, name)
+
+    def call(self, *args, **kwargs):
+        self._indexes.clear()
+        return method(self, *args, **kwargs)
+    call.__name__ = name
+    return call
+
+
+class Table(list):
+    """
+    List of rows with lazily built hash indexes
+    """
+    def __init__(self, rows=()):
+        list.__init__(self, rows)
+        self._indexes = {}  # field or tuple of fields -> {value: Table}
+
+    # indexes are dropped whenever the rows change
+    __setitem__ = _invalidating('__setitem__')
+    __delitem__ = _invalidating('__delitem__')
+    __iadd__ = _invalidating('__iadd__')
+    __imul__ = _invalidating('__imul__')
+    append = _invalidating('append')
+    extend = _invalidating('extend')
+    insert = _invalidating('insert')
+    pop = _invalidating('pop')
+    remove = _invalidating('remove')
+    sort = _invalidating('sort')
+    reverse = _invalidating('reverse')
+    clear = _invalidating('clear')
+
+    def indexed(self, on):
+        """
+        Index on field `on` (or a tuple of fields): value -> Table of the rows holding it.
+        Built on first use, don't modify it
+        """
+        index = self._indexes.get(on)
+        if index is None:
+            index = {}
+            for row in self:
+                value = _key(row, on)
+                rows = index.get(value)
+                if rows is None:
+                    rows = index[value] = Table()
+                list.append(rows, row)
+            self._indexes[on] = index
+        return index
+
+    def lookup(self, on, value):
+        """
+        Table of the rows whose field `on` equals `value`
+        """
+        return Table(self.indexed(on).get(value, ()))
+
+    def first(self, on, value, default=None):
+        """
+        First row whose field `on` equals `value`, `default` if there is none
+        """
+        rows = self.indexed(on).get(value)
+        return rows[0] if rows else default
+
+    def where(self, **criteria):
+        """
+        Rows matching all `criteria`, field name -> value, or a list, tuple or set of accepted values.
+        Rows are taken from the index of the most selective criterion and checked against the others
+        """
+        accepted = dict((field, set(value) if isinstance(value, _MANY) else {value})
+                        for field, value in criteria.items())
+        if not accepted:
+            return Table(self)
+        _, field = min((sum(len(self.indexed(field).get(value, ())) for value in values), field)
+                          for field, values in accepted.items())
+        index = self.indexed(field)
+        buckets = [index[value] for value in accepted.pop(field) if value in index]
+        if len(buckets) > 1:
+            # back to table order
+            positions = self._positions()
+            rows = sorted((row for bucket in buckets for row in bucket), key=lambda row: positions[id(row)])
+        else:
+            rows = buckets[0] if buckets else ()
+        return Table(row for row in rows if all(row.get(other) in values for other, values in accepted.items()))
+
+    def _positions(self):
+        positions = self._indexes.get(_POSITIONS)
+        if positions is None:
+            positions = self._indexes[_POSITIONS] = dict((id(row), position) for position, row in enumerate(self))
+        return positions
+
+    def group_by(self, on):
+        """
+        dict value of field `on` -> Table of its rows
+        """
+        return dict(self.indexed(on))
+
+    def join(self, other, on='PlayerID', how='inner'):
+        """
+        Pairs (row, other row) of rows with equal `on` field(s), using the index of `other`.
+        `other` list of rows, e.g. a roster or injuries result
+        `on` field name or tuple of field names
+        `how` "inner" drops rows without a match, "left" pairs them with None
+        """
+        if how not in ('inner', 'left'):
+            raise ValueError('how must be "inner" or "left"')
+        if not isinstance(other, Table):
+            other = Table(other)
+        index = other.indexed(on)
+        pairs = []
+        for row in self:
+            matches = index.get(_key(row, on))
+            if matches:
+                pairs.extend((row, match) for match in matches)
+            elif how == 'left':
+                pairs.append((row, None))
+        return pairs
+
+    def to_list(self):
+        """
+        Rows as a plain list
+        """
+        return list(self)
@@ -0,0 +1,167 @@
+#coding:utf-8
+"""
+Client-side rate limiting for FantasyData API calls.
+
+A RateLimiter is a token bucket shared by every thread using it; the async
+clients run calls on worker threads, so they share it too. Limiters made
+with for_key are shared by all clients using the same API key, since the
+quota is per key. When the API throttles anyway (429/503), the limiter
+halves its rate, holds all callers until the Retry-After time and climbs
+back to the configured rate as calls succeed. A SharedRateLimiter keeps
+its bucket in shared memory, so worker processes share it as well.
+"""
+import email.utils
+import multiprocessing
+import threading
+import time
+
+# Headers giving seconds, an HTTP date or (the reset headers of many APIs) an epoch
+# timestamp to wait for after a throttled response
+RETRY_AFTER_HEADERS = ('Retry-After', 'X-RateLimit-Reset', 'RateLimit-Reset')
+
+# Numbers above this are epoch timestamps rather than seconds to wait (2001-09-09)
+_EPOCH = 1e9
+
+THROTTLE_STATUS_CODES = (429, 503)
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def retry_after(headers, now=None):
+    """
+    Seconds to wait according to throttling response `headers`, None if they don't say
+    """
+    for name in RETRY_AFTER_HEADERS:
+        value = headers.get(name)
+        if not value:
+            continue
+        try:
+            seconds = float(value)
+        except ValueError:
+            pass
+        else:
+            if seconds > _EPOCH:
+                seconds -= now or time.time()
+            return max(0.0, seconds)
+        date = email.utils.parsedate_tz(value)
+        if date is not None:
+            return max(0.0, email.utils.mktime_tz(date) - (now or time.time()))
+    return None
+
+
+class RateLimiter(object):
+    """
+    Token bucket with adaptive rate
+    `rate` float calls per second allowed
+    `burst` int calls that may go out at once after idling, defaults to max(1, rate)
+    `min_rate` float lowest rate backoff goes down to, defaults to rate / 16
+    `recovery` int successful calls to climb back from min_rate to `rate`
+    """
+    def __init__(self, rate, burst=None, min_rate=None, recovery=32, clock=time.monotonic, sleep=time.sleep):
+        self.max_rate = float(rate)
+        self.rate = self.max_rate
+        self.burst = burst or max(1, int(rate))
+        self.min_rate = min_rate or self.max_rate / 16
+        self._step = (self.max_rate - self.min_rate) / recovery
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._blocked_until = 0
+
+    @classmethod
+    def for_key(cls, api_key, rate, **kwargs):
+        """
+        Limiter shared by every client using `api_key`. The first call for a key sets its rate
+        """
+        with _shared_lock:
+            limiter = _shared.get(api_key)
+            if limiter is None:
+                limiter = _shared[api_key] = cls(rate, **kwargs)
+            return limiter
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        """
+        Block until a call may be sent. Returns False if that takes longer than `timeout` seconds
+        """
+        give_up_at = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return True
+                    wait = (1 - self._tokens) / self.rate
+                if give_up_at is not None and now + wait > give_up_at:
+                    return False
+            self._sleep(wait)
+
+    def throttled(self, delay=None, max_wait=None):
+        """
+        The API throttled a call: halve the rate and hold everyone for `delay` seconds,
+        or the time one call takes at the new rate
+        `max_wait` float longest hold, whatever `delay` says
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0
+            if delay is None:
+                delay = 1 / self.rate
+            if max_wait is not None:
+                delay = min(delay, max_wait)
+            self._blocked_until = max(self._blocked_until, now + delay)
+
+    def succeeded(self):
+        """
+        A call went through: step the rate back up towards the configured one
+        """
+        if self.rate < self.max_rate:
+            with self._lock:
+                self._refill(self._clock())
+                self.rate = min(self.max_rate, self.rate + self._step)
+
+
+def _shared_state(index):
+    return property(lambda self: self._state[index],
+                    lambda self, value: self._state.__setitem__(index, value))
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    RateLimiter shared by processes: create it in the parent and hand it to the worker
+    processes as they start, e.g. in a process pool initializer's arguments.
+    Uses time.monotonic, which is the same clock in every process
+    """
+    # bucket state in shared memory
+    rate = _shared_state(0)
+    _tokens = _shared_state(1)
+    _updated = _shared_state(2)
+    _blocked_until = _shared_state(3)
+
+    def __init__(self, rate, burst=None, min_rate=None, recovery=32, _shared=None):
+        if _shared is None:
+            self._state, lock = multiprocessing.RawArray('d', 4), multiprocessing.Lock()
+            RateLimiter.__init__(self, rate, burst, min_rate, recovery)
+        else:
+            # unpickled in a worker: keep the bucket state of the other processes
+            self._state, lock = _shared
+            state = list(self._state)
+            RateLimiter.__init__(self, rate, burst, min_rate, recovery)
+            self._state[:] = state
+        self._recovery = recovery
+        self._lock = lock
+
+    def __reduce__(self):
+        return SharedRateLimiter, (self.max_rate, self.burst, self.min_rate, self._recovery,
+                                   (self._state, self._lock))
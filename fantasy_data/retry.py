@@ -0,0 +1,109 @@
+#coding:utf-8
+"""
+Retries and request hedging for FantasyData API calls.
+
+RetryPolicy decides whether a failed request (connection error or 5xx
+response) is sent again and how long to wait first: exponential backoff
+with full jitter, per-status limits and a total deadline. HedgePolicy sends
+a second copy of a slow request for latency-critical endpoints once the
+first has been out longer than the endpoint's p95 latency, and takes
+whichever answers first.
+"""
+import random
+import threading
+from collections import deque
+
+# 503 is handled as throttling, see fantasy_data.ratelimit
+RETRY_STATUS_CODES = (500, 502, 504)
+
+# Endpoints polled on game days, where tail latency matters more than an extra request
+HEDGE_ENDPOINTS = ('CurrentWeek', 'CurrentSeason', 'BoxScoreV3', 'GamesByDate', 'PlayerGameStatsByDate')
+
+
+class RetryPolicy(object):
+    """
+    When and how often to resend a failed request
+    `max_attempts` int total attempts per call, including the first
+    `backoff` float seconds before the first retry, doubling with every attempt
+    `max_backoff` float cap on the wait between attempts
+    `jitter` bool wait a random time up to the backoff, so clients don't retry in lockstep
+    `status_codes` statuses that are retried
+    `rules` dict status -> max attempts, overriding `max_attempts` and `status_codes` for that status
+    `connection_errors` bool retry connection errors and resets
+    `deadline` float seconds after the first attempt past which no retry starts
+    """
+    def __init__(self, max_attempts=3, backoff=0.5, max_backoff=10, jitter=True, status_codes=RETRY_STATUS_CODES,
+                 rules=None, connection_errors=True, deadline=None):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_codes = frozenset(status_codes)
+        self.rules = dict(rules or {})
+        self.connection_errors = connection_errors
+        self.deadline = deadline
+
+    def _max_attempts(self, status):
+        if status is None:
+            return self.max_attempts if self.connection_errors else 1
+        if status in self.rules:
+            return self.rules[status]
+        return self.max_attempts if status in self.status_codes else 1
+
+    def delay(self, attempt, status=None, elapsed=0):
+        """
+        Seconds to wait before resending, None to give up
+        `attempt` int attempts made so far
+        `status` int response status, None for a connection error
+        `elapsed` float seconds since the first attempt
+        """
+        if attempt >= self._max_attempts(status):
+            return None
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if self.deadline is not None and elapsed + delay >= self.deadline:
+            return None
+        return delay
+
+
+class HedgePolicy(object):
+    """
+    Which requests get a backup copy and when
+    `endpoints` endpoint names, the part of the method url before the first "/"
+    `delay` float fixed seconds before hedging. By default the `quantile` of the
+    endpoint's recent latencies, once `min_samples` of them are known
+    `window` int latencies remembered per endpoint
+    """
+    def __init__(self, endpoints=HEDGE_ENDPOINTS, delay=None, quantile=0.95, min_samples=20, window=200):
+        self.endpoints = frozenset(endpoints)
+        self.fixed_delay = delay
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.window = window
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    def applies(self, endpoint):
+        return endpoint in self.endpoints
+
+    def observe(self, endpoint, seconds):
+        """
+        Record the time to response headers of one request
+        """
+        latencies = self._latencies.get(endpoint)
+        if latencies is None:
+            with self._lock:
+                latencies = self._latencies.setdefault(endpoint, deque(maxlen=self.window))
+        latencies.append(seconds)
+
+    def delay(self, endpoint):
+        """
+        Seconds to wait for the first request before sending a backup, None for no backup
+        """
+        if self.fixed_delay is not None:
+            return self.fixed_delay
+        latencies = sorted(self._latencies.get(endpoint, ()))
+        if len(latencies) < self.min_samples:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * self.quantile))]
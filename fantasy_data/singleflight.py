@@ -0,0 +1,87 @@
+#coding:utf-8
+"""
+Request coalescing.
+
+When several threads (or async tasks, which run calls on worker threads)
+make the same API call at once, only the first one goes to the network;
+the others wait for it and get the same result (or a copy of it) or exception. Exceptions
+tied to the first caller's own context, like its deadline running out, are
+not shared: one of the waiting callers makes the call again instead. With a
+window, callers arriving shortly after the call finished reuse its result too.
+"""
+import threading
+import time
+
+from fantasy_data import deadline as deadlines
+
+
+class _Call(object):
+    __slots__ = ('done', 'result', 'error', 'private', 'expires_at')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.private = False  # error not shared with the waiting callers
+        self.expires_at = None  # set when the call finished
+
+
+class SingleFlight(object):
+    """
+    Shares one execution of a call between concurrent callers with the same key
+    `window` float seconds a finished call's result is reused for, 0 to share in-flight calls only
+    `copy` function giving a waiting caller its own copy of the result, None to share the result itself
+    """
+    def __init__(self, window=0, copy=None):
+        self.window = window
+        self._copy = copy
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def _sweep(self, now):
+        for key, call in list(self._calls.items()):
+            if call.expires_at is not None and call.expires_at <= now:
+                del self._calls[key]
+
+    def do(self, key, func, timeout_error=TimeoutError, private=None):
+        """
+        Result of `func()`, run once for all callers of `key` that overlap.
+        A waiting caller raises `timeout_error` if its deadline runs out first.
+        `private` function of an exception of `func`, true when it is tied to the context of
+        the caller that ran it. Waiting callers don't get it, one of them runs `func` instead
+        """
+        while True:
+            now = time.time()
+            with self._lock:
+                call = self._calls.get(key)
+                if call is not None and call.expires_at is not None and call.expires_at <= now:
+                    call = None
+                leader = call is None
+                if leader:
+                    if len(self._calls) > 1024:
+                        self._sweep(now)
+                    call = self._calls[key] = _Call()
+
+            if leader:
+                break
+            if not call.done.wait(deadlines.remaining()):
+                raise timeout_error('Error: Deadline exceeded')
+            if call.private:
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result if self._copy is None else self._copy(call.result)
+
+        try:
+            call.result = func()
+            return call.result
+        except Exception as e:
+            call.error = e
+            call.private = private is not None and private(e)
+            raise
+        finally:
+            with self._lock:
+                call.expires_at = time.time() + (self.window if call.error is None else 0)
+                if call.expires_at <= time.time() and self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
@@ -0,0 +1,330 @@
+#coding:utf-8
+"""
+Local snapshots of whole NFL seasons.
+
+A SnapshotStore is a directory of tables split into partitions, e.g. player
+game stats by season and week. Every partition keeps one file per column:
+numeric and bool columns as .npy files that are memory-mapped on read, so a
+decade of stats opens without loading it into RAM; strings and nested values
+as JSON. Snapshot downloads a season range into a store once, later reads
+make no API calls. to_arrow/export_parquet need pyarrow.
+"""
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from fantasy_data.columns import Columns, _numpy, to_columns
+
+PLAYER_GAME_STATS = 'player_game_stats'
+SCHEDULES = 'schedules'
+BYE_WEEKS = 'bye_weeks'
+PROJECTIONS = 'projections'
+
+SEASON_TYPES = ('PRE', 'REG', 'POST')
+
+_MANIFEST = 'manifest.json'
+_STAGING = '.tmp-'
+
+
+def season_weeks(season, season_type):
+    """
+    Week numbers of an NFL season type. The regular season has 18 weeks since 2021
+    """
+    if season_type == 'PRE':
+        return range(0, 4) if season >= 2021 else range(0, 5)
+    if season_type == 'POST':
+        return range(1, 5)
+    return range(1, 19) if season >= 2021 else range(1, 18)
+
+
+def season_calls(seasons, season_types=SEASON_TYPES, projections=False):
+    """
+    API calls downloading whole seasons, as (table, partition, method name, args).
+    Player game stats and schedules for every season type, bye weeks, and
+    regular season projections by week if `projections`
+    """
+    calls = []
+    for season in seasons:
+        for season_type in season_types:
+            partition = '{0}{1}'.format(season, season_type)
+            calls.append((SCHEDULES, partition, 'get_schedules_for_season', (season, season_type)))
+            for week in season_weeks(season, season_type):
+                calls.append((PLAYER_GAME_STATS, '{0}/{1}'.format(partition, week),
+                              'get_players_game_stats_for_season_for_week', (season, week, season_type)))
+                if projections and season_type == 'REG':
+                    calls.append((PROJECTIONS, '{0}/{1}'.format(partition, week),
+                                  'get_projected_player_game_stats_by_week', (season, week)))
+        calls.append((BYE_WEEKS, str(season), 'get_bye_weeks', (season,)))
+    return calls
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('Arrow export needs pyarrow: pip install fantasy_data[arrow]')
+    return pyarrow
+
+
+def store_calls(client, store, calls, max_workers=None, return_failed=False):
+    """
+    Run API calls on the client's batch thread pool and write each result as a partition.
+    `calls` list of (table, partition, method, args)
+    Returns the list of (table, partition) written. Raises the first failed call's
+    error after storing everything else, or with `return_failed` returns (written, failed):
+    `failed` list of (table, partition, exception) of the calls or writes that failed
+    """
+    written = []
+    failed = []
+    by_method = {}
+    for call in calls:
+        by_method.setdefault(call[2], []).append(call)
+    for method, method_calls in by_method.items():
+        results = client.batch(method, [args for _, _, _, args in method_calls], max_workers=max_workers)
+        for index, (table, partition, _, _) in enumerate(method_calls):
+            error = results.errors.get(index)
+            if error is None:
+                try:
+                    store.write(table, partition, results[index] or [])
+                    written.append((table, partition))
+                    continue
+                except Exception as e:
+                    if not return_failed:
+                        raise
+                    error = e
+            failed.append((table, partition, error))
+    if return_failed:
+        return written, failed
+    if failed:
+        raise failed[0][2]
+    return written
+
+
+def _replace_directory(staging, target, attempts=10):
+    """
+    Move directory `staging` to `target`, replacing it. The old directory is renamed aside
+    and deleted afterwards, so `target` is only missing between two renames. Writers of the
+    same target at once each move the other's directory aside in turn; the last one wins
+    """
+    old = []
+    for attempt in range(attempts):
+        aside = '{0}.old{1}'.format(staging, attempt)
+        try:
+            os.rename(target, aside)
+            old.append(aside)
+        except FileNotFoundError:
+            pass
+        try:
+            os.rename(staging, target)
+            break
+        except OSError:
+            # another writer moved its directory in after ours was renamed aside
+            if attempt == attempts - 1:
+                raise
+    for aside in old:
+        shutil.rmtree(aside, ignore_errors=True)
+
+
+def _read_manifest(directory, attempts=50):
+    """
+    Manifest of the partition in `directory`, None if it is not stored.
+    While a write of the partition moves the old one aside, it is missing between two renames:
+    the read is tried again as long as a staging directory is next to it
+    """
+    parent = os.path.dirname(directory)
+    for _ in range(attempts):
+        try:
+            with io.open(os.path.join(directory, _MANIFEST), encoding='utf-8') as f:
+                return json.load(f)
+        except IOError:
+            try:
+                replacing = any(name.startswith(_STAGING) for name in os.listdir(parent))
+            except OSError:
+                replacing = False
+            if not replacing:
+                return None
+            time.sleep(0.001)
+    return None
+
+
+class SnapshotStore(object):
+    """
+    Columnar tables on disk under `path`
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def _partition_path(self, table, partition):
+        return os.path.join(self.path, table, *str(partition).split('/'))
+
+    def has(self, table, partition):
+        return os.path.exists(os.path.join(self._partition_path(table, partition), _MANIFEST))
+
+    def partitions(self, table):
+        """
+        Sorted partition keys of `table`, e.g. "2014REG/5"
+        """
+        root = os.path.join(self.path, table)
+        found = []
+        for directory, _, files in os.walk(root):
+            if _MANIFEST in files:
+                found.append(os.path.relpath(directory, root).replace(os.sep, '/'))
+        return sorted(found)
+
+    def write(self, table, partition, rows):
+        """
+        Store `rows` (API result or Columns) as partition `partition` of `table`, replacing it.
+        The partition appears at once, a failed write leaves no partial files
+        """
+        numpy = _numpy()
+        columns = rows if isinstance(rows, Columns) else to_columns(rows)
+        target = self._partition_path(table, partition)
+        parent = os.path.dirname(target)
+        # several processes may write partitions of one table at once
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=_STAGING, dir=parent)
+        try:
+            manifest = {'rows': columns.rows, 'columns': {}}
+            for field, column in columns.items():
+                name = '{0}.{1}'.format(field, 'json' if column.dtype == object else 'npy')
+                if column.dtype == object:
+                    with io.open(os.path.join(staging, name), 'w', encoding='utf-8') as f:
+                        f.write(json.dumps(column.tolist(), ensure_ascii=False))
+                    manifest['columns'][field] = {'dtype': 'json', 'file': name}
+                    continue
+                numpy.save(os.path.join(staging, name), column.data)
+                manifest['columns'][field] = {'dtype': str(column.dtype), 'file': name}
+                if column.mask.any():
+                    mask = '{0}.mask.npy'.format(field)
+                    numpy.save(os.path.join(staging, mask), numpy.ma.getmaskarray(column))
+                    manifest['columns'][field]['mask'] = mask
+            with io.open(os.path.join(staging, _MANIFEST), 'w', encoding='utf-8') as f:
+                f.write(json.dumps(manifest, sort_keys=True))
+            _replace_directory(staging, target)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    def read(self, table, partition, fields=None):
+        """
+        Columns of one partition. Numeric columns are memory-mapped read-only
+        `fields` iterable of field names to open, all by default
+        Raises KeyError for a partition that is not stored
+        """
+        numpy = _numpy()
+        directory = self._partition_path(table, partition)
+        manifest = _read_manifest(directory)
+        if manifest is None:
+            raise KeyError('{0}/{1}'.format(table, partition))
+        rows = manifest['rows']
+        columns = {}
+        for field, spec in manifest['columns'].items():
+            if fields is not None and field not in fields:
+                continue
+            path = os.path.join(directory, spec['file'])
+            if spec['dtype'] == 'json':
+                with io.open(path, encoding='utf-8') as f:
+                    values = json.load(f)
+                data = numpy.empty(rows, dtype=object)
+                for index, value in enumerate(values):
+                    data[index] = value
+                mask = numpy.fromiter((value is None for value in values), bool, rows)
+            else:
+                # empty files can't be memory-mapped
+                data = numpy.load(path, mmap_mode='r' if rows else None)
+                mask = numpy.load(os.path.join(directory, spec['mask'])) if 'mask' in spec else False
+            columns[field] = numpy.ma.MaskedArray(data, mask=mask)
+        return Columns(columns, rows)
+
+    def open_table(self, table, fields=None):
+        """
+        Partition key -> Columns for every stored partition of `table`
+        """
+        return dict((partition, self.read(table, partition, fields)) for partition in self.partitions(table))
+
+    def to_arrow(self, table, fields=None):
+        """
+        All partitions of `table` as one pyarrow.Table.
+        Nested values are JSON strings. Columns typed differently across partitions become
+        float64 if all numeric, JSON strings otherwise
+        """
+        pyarrow = _pyarrow()
+        numpy = _numpy()
+        parts = list(self.open_table(table, fields).values())
+        kinds = {}
+        for part in parts:
+            for field, column in part.items():
+                kind = kinds.setdefault(field, set())
+                if column.dtype != object:
+                    kind.add(column.dtype.kind)
+                elif not column.mask.all():
+                    kind.add('O')
+        arrays = {}
+        for field, kind in kinds.items():
+            kind = kind.pop() if len(kind) == 1 else 'f' if kind and kind <= set('if') else 'O'
+            chunks = []
+            for part in parts:
+                column = part.get(field)
+                if column is None:
+                    column = numpy.ma.masked_all(part.rows, dtype=object)
+                mask = numpy.ma.getmaskarray(column)
+                if kind == 'O':
+                    values = [None if masked else value if isinstance(value, str) else json.dumps(value)
+                              for value, masked in zip(column.data.tolist(), mask)]
+                    chunks.append(pyarrow.array(values, type=pyarrow.string()))
+                else:
+                    dtype = {'b': bool, 'i': 'int64', 'f': 'float64'}[kind]
+                    data = numpy.asarray(column.data)
+                    if data.dtype == object:
+                        data = numpy.zeros(part.rows, dtype=dtype)
+                    chunks.append(pyarrow.array(data.astype(dtype), mask=mask))
+            arrays[field] = pyarrow.chunked_array(chunks) if chunks else pyarrow.chunked_array([], pyarrow.null())
+        return pyarrow.table(arrays)
+
+    def export_parquet(self, table, path, fields=None):
+        """
+        Write all partitions of `table` to one Parquet file
+        """
+        import pyarrow.parquet
+        pyarrow.parquet.write_table(self.to_arrow(table, fields), path)
+
+
+class Snapshot(object):
+    """
+    Downloads NFL seasons with a FantasyData client into a SnapshotStore and reads them back.
+    `client` FantasyData
+    `store` SnapshotStore or a directory path
+    """
+    def __init__(self, client, store):
+        self.client = client
+        self.store = store if isinstance(store, SnapshotStore) else SnapshotStore(store)
+
+    def download(self, seasons, season_types=SEASON_TYPES, refresh=False, max_workers=None):
+        """
+        Store player game stats, schedules and bye weeks of every season in `seasons`.
+        Partitions already on disk are skipped unless `refresh`, so an interrupted
+        download resumes where it stopped. Calls run on the client's batch thread pool
+        Returns the list of (table, partition) written. Raises the first failed call's
+        error after storing everything else
+        """
+        calls = [(table, partition, getattr(self.client, method), args)
+                 for table, partition, method, args in season_calls(seasons, season_types)]
+        if not refresh:
+            calls = [call for call in calls if not self.store.has(call[0], call[1])]
+
+        return store_calls(self.client, self.store, calls, max_workers)
+
+    def player_game_stats(self, season, week, season_type='REG', fields=None):
+        return self.store.read(PLAYER_GAME_STATS, '{0}{1}/{2}'.format(season, season_type, week), fields)
+
+    def schedules(self, season, season_type='REG', fields=None):
+        return self.store.read(SCHEDULES, '{0}{1}'.format(season, season_type), fields)
+
+    def bye_weeks(self, season, fields=None):
+        return self.store.read(BYE_WEEKS, str(season), fields)
+
+    def projections(self, season, week, fields=None):
+        return self.store.read(PROJECTIONS, '{0}REG/{1}'.format(season, week), fields)
@@ -0,0 +1,103 @@
+#coding:utf-8
+"""
+Incremental parsing of JSON array responses.
+
+Large endpoints return one JSON array of records. iter_json_array yields the
+records one at a time while the body is still downloading, so only the
+current chunk and the record being parsed are held in memory.
+"""
+import codecs
+import json
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+
+
+class JSONArrayParser(object):
+    """
+    Push parser for a JSON array. Feed it bytes, get back the completed items
+    `decoder` json.JSONDecoder used for every item
+    """
+    def __init__(self, decoder=None):
+        self._decoder = decoder or json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._started = False
+        self._expect_comma = False
+        self.finished = False
+
+    def feed(self, data):
+        """
+        Add a chunk of the document. Returns the list of items completed by it
+        """
+        self._buf += self._text.decode(data)
+        return self._parse(final=False)
+
+    def close(self):
+        """
+        Signal the end of the document. Returns the remaining items
+        Raises ValueError if the document is incomplete
+        """
+        self._buf += self._text.decode(b'', True)
+        items = self._parse(final=True)
+        if not self.finished:
+            raise ValueError('Unterminated JSON array')
+        return items
+
+    def _parse(self, final):
+        buf = self._buf
+        index = 0
+        items = []
+        while not self.finished:
+            while index < len(buf) and buf[index] in _WHITESPACE:
+                index += 1
+            if index == len(buf):
+                break
+            char = buf[index]
+            if not self._started:
+                if char == u'﻿':
+                    index += 1
+                    continue
+                if char != '[':
+                    raise ValueError('Expected a JSON array')
+                self._started = True
+                index += 1
+            elif char == ']':
+                self.finished = True
+                index += 1
+            elif self._expect_comma:
+                if char != ',':
+                    raise ValueError('Expected "," or "]" at {0!r}'.format(buf[index:index + 20]))
+                self._expect_comma = False
+                index += 1
+            else:
+                try:
+                    item, end = self._decoder.raw_decode(buf, index)
+                except ValueError:
+                    if final:
+                        raise
+                    break
+                if not final and (end == len(buf) or buf[end] not in _DELIMITERS):
+                    # a number may continue in the next chunk
+                    break
+                items.append(item)
+                self._expect_comma = True
+                index = end
+        self._buf = buf[index:]
+        if final and not self._started:
+            raise ValueError('Expected a JSON array, got an empty document')
+        return items
+
+
+def iter_json_array(chunks, decoder=None):
+    """
+    Yield the items of a JSON array from an iterable of byte chunks
+    `chunks` iterable of bytes, e.g. response.iter_content()
+    Raises ValueError if the document is not a JSON array
+    """
+    parser = JSONArrayParser(decoder)
+    for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
@@ -0,0 +1,225 @@
+#coding:utf-8
+"""
+Incremental sync of a SnapshotStore.
+
+Past weeks and dates don't change, so a sync asks the API where the season
+is (current timeframe for NFL, current season for NBA), refetches only partitions
+that are still open and fills in partitions missing from the store. The
+position reached is saved as a watermark next to the store, so the weeks
+or dates that were open in the previous run get one last refetch.
+"""
+import datetime
+import io
+import json
+import os
+
+from fantasy_data.snapshot import (PLAYER_GAME_STATS, SCHEDULES, SEASON_TYPES, SnapshotStore, season_weeks,
+                                   store_calls)
+
+INJURIES = 'injuries'
+NEWS = 'news'
+# NBA tables have their own names, so one store can hold both leagues
+NBA_GAMES = 'nba_games'
+NBA_PLAYER_GAME_STATS = 'nba_player_game_stats'
+
+_STATE = 'sync_state.json'
+
+# SeasonType of the API's timeframes
+TIMEFRAME_SEASON_TYPES = {1: 'REG', 2: 'PRE', 3: 'POST', 4: 'OFF'}
+
+
+def news_date(date):
+    """
+    Date in the format of the news endpoints, 2017-JUL-31
+    """
+    return date.strftime('%Y-%b-%d').upper()
+
+
+def season_order(season):
+    """
+    (season type, week) of every week of an NFL season, in playing order
+    """
+    return [(season_type, week) for season_type in SEASON_TYPES for week in season_weeks(season, season_type)]
+
+
+def season_week(season, season_type, week):
+    """
+    (season type, week) of a week as the API's timeframes and current week give it.
+    The API also numbers postseason weeks after the regular season (18 to 21 until 2020,
+    19 to 22 since 2021), while the store numbers them 1 to 4
+    """
+    if season_type == 'OFF':
+        return season_type, 0
+    regular_weeks = len(season_weeks(season, 'REG'))
+    if season_type in ('REG', 'POST') and week > regular_weeks:
+        season_type, week = 'POST', week - regular_weeks
+    weeks = season_weeks(season, season_type)
+    return season_type, min(max(week, weeks[0]), weeks[-1])
+
+
+def season_position(season, season_type, week):
+    """
+    Index of a week in season_order(season), -1 in the offseason before the season
+    """
+    if season_type == 'OFF':
+        return -1
+    return season_order(season).index((season_type, week))
+
+
+def _days(first, last):
+    while first <= last:
+        yield first
+        first += datetime.timedelta(days=1)
+
+
+class SyncBase(object):
+    """
+    Base class for sync engines
+    `client` FantasyData or FantasyDataNBA
+    `store` SnapshotStore or a directory path
+    """
+    game_type = None
+
+    def __init__(self, client, store):
+        self.client = client
+        self.store = store if isinstance(store, SnapshotStore) else SnapshotStore(store)
+
+    @property
+    def _state_path(self):
+        return os.path.join(self.store.path, _STATE)
+
+    def load_state(self):
+        """
+        Watermark saved by the last successful sync, {} before the first one
+        """
+        try:
+            with io.open(self._state_path, encoding='utf-8') as f:
+                return json.load(f).get(self.game_type, {})
+        except IOError:
+            return {}
+
+    def save_state(self, state):
+        try:
+            with io.open(self._state_path, encoding='utf-8') as f:
+                states = json.load(f)
+        except IOError:
+            states = {}
+        states[self.game_type] = state
+        if not os.path.isdir(self.store.path):
+            os.makedirs(self.store.path)
+        temp_path = self._state_path + '.tmp'
+        with io.open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(states, sort_keys=True))
+        os.replace(temp_path, self._state_path)
+
+    def _run(self, calls, state, max_workers):
+        """
+        Fetch and store `calls`, then advance the watermark to `state`.
+        The watermark stays put if a call fails, so the next sync retries
+        """
+        written = store_calls(self.client, self.store, calls, max_workers)
+        self.save_state(state)
+        return written
+
+
+class Sync(SyncBase):
+    """
+    Keeps NFL player game stats, injuries, schedules and news of the current season up to date
+    """
+    game_type = 'nfl'
+
+    def _week_calls(self, season, season_types, first_open, last):
+        """
+        Calls for the weeks of `season` up to position `last` (to the end of the season if None)
+        that are open from position `first_open` on, or missing from the store
+        """
+        calls = []
+        for position, (season_type, week) in enumerate(season_order(season)):
+            if last is not None and position > last:
+                break
+            if season_type not in season_types:
+                continue
+            refetch = position >= first_open
+            partition = '{0}{1}/{2}'.format(season, season_type, week)
+            if refetch or not self.store.has(PLAYER_GAME_STATS, partition):
+                calls.append((PLAYER_GAME_STATS, partition, self.client.get_players_game_stats_for_season_for_week,
+                              (season, week, season_type)))
+            partition = '{0}/{1}'.format(season, week)
+            if season_type == 'REG' and (refetch or not self.store.has(INJURIES, partition)):
+                calls.append((INJURIES, partition, self.client.get_injuries, (season, week)))
+        return calls
+
+    def sync(self, season_types=('REG', 'POST'), reopen_weeks=1, news=True, today=None, max_workers=None):
+        """
+        Refetch open partitions and fetch missing ones.
+        `season_types` season types whose weekly player game stats are kept
+        `reopen_weeks` int weeks before the current one that are still refetched, for stat corrections
+        `news` bool also fetch RotoBaller news for every date since the last sync
+        `today` datetime.date, defaults to today
+        Returns the list of (table, partition) written
+        """
+        today = today or datetime.date.today()
+        timeframe = self.client.get_current_timeframe()
+        season = int(timeframe['Season'])
+        season_type = TIMEFRAME_SEASON_TYPES.get(timeframe['SeasonType'], 'OFF')
+        season_type, week = season_week(season, season_type, int(timeframe.get('Week') or 0))
+        position = season_position(season, season_type, week)
+        state = self.load_state()
+
+        calls = []
+        if state.get('season') == season:
+            # weeks open at the last sync get refetched once more to pick up final stats
+            last = season_position(season, state.get('season_type', 'REG'), state['week'])
+        else:
+            last = position
+            if state.get('season') is not None:
+                previous = state['season']
+                previous_position = season_position(previous, state.get('season_type', 'REG'), state['week'])
+                calls.extend(self._week_calls(previous, season_types, previous_position - reopen_weeks, None))
+        # game times and flexed games change through the season
+        schedule_type = 'REG' if season_type == 'OFF' else season_type
+        calls.append((SCHEDULES, '{0}{1}'.format(season, schedule_type), self.client.get_schedules_for_season,
+                      (season, schedule_type)))
+        calls.extend(self._week_calls(season, season_types, min(last, position) - reopen_weeks, position))
+        if news:
+            last_news = state.get('news_date')
+            first_news = datetime.datetime.strptime(last_news, '%Y-%m-%d').date() if last_news else today
+            for date in _days(min(first_news, today), today):
+                calls.append((NEWS, date.isoformat(), self.client.get_rotoballer_premium_news_by_date,
+                              (news_date(date),)))
+
+        state = {'season': season, 'season_type': season_type, 'week': week,
+                 'news_date': today.isoformat() if news else state.get('news_date')}
+        return self._run(calls, state, max_workers)
+
+
+class NBASync(SyncBase):
+    """
+    Keeps NBA games and player game stats of the current season up to date, by date
+    """
+    game_type = 'nba'
+
+    def sync(self, since=None, reopen_days=1, today=None, max_workers=None):
+        """
+        Refetch open dates and fetch dates not synced yet.
+        `since` datetime.date to backfill from on the first sync or a new season, defaults to today
+        `reopen_days` int days before today that are still refetched, for late stat updates
+        `today` datetime.date, defaults to today
+        Returns the list of (table, partition) written
+        """
+        today = today or datetime.date.today()
+        season = self.client.get_current_season()
+        state = self.load_state()
+        if state.get('season') == season and state.get('date'):
+            first = datetime.datetime.strptime(state['date'], '%Y-%m-%d').date()
+        else:
+            first = since or today
+        first = min(first, today - datetime.timedelta(days=reopen_days))
+
+        calls = []
+        for date in _days(first, today):
+            game_date = date.isoformat()
+            calls.append((NBA_GAMES, game_date, self.client.get_games_by_date, (game_date,)))
+            calls.append((NBA_PLAYER_GAME_STATS, game_date, self.client.get_players_game_stats_by_date,
+                          (game_date,)))
+        return self._run(calls, {'season': season, 'date': today.isoformat()}, max_workers)
@@ -0,0 +1,213 @@
+#coding:utf-8
+"""
+Local stub of the FantasyData API for offline tests and benchmarks.
+
+Routes are keyed by request path without the query string. A route value is
+either a JSON-serializable payload (served with status 200) or a callable
+``handler(request) -> (status, headers, body)``.
+"""
+import json
+import socket
+import struct
+import threading
+import time
+
+from six.moves import BaseHTTPServer, socketserver, urllib
+
+
+class StubRequest(object):
+    """
+    Request seen by the stub server
+    """
+    def __init__(self, method, path, query, headers, client_address):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.client_address = client_address
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        parsed = urllib.parse.urlsplit(self.path)
+        request = StubRequest("GET", parsed.path, urllib.parse.parse_qs(parsed.query),
+                              dict(self.headers.items()), self.client_address)
+        with server.lock:
+            server.requests.append(request)
+
+        route = server.routes.get(parsed.path)
+        if route is None:
+            status, headers, body = 404, {}, b'{"Message": "Not found"}'
+        elif callable(route):
+            status, headers, body = route(request)
+        else:
+            status, headers, body = 200, {}, route
+
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        headers = dict(headers)
+        headers.setdefault("Content-Type", "application/json")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        BaseHTTPServer.HTTPServer.__init__(self, *args, **kwargs)
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.requests = []
+        self.connections = 0
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+        socketserver.ThreadingMixIn.process_request(self, request, client_address)
+
+
+class StubServer(object):
+    """
+    Threaded HTTP/1.1 server with keep-alive support
+    """
+    def __init__(self):
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+
+    @property
+    def address(self):
+        return "{0}:{1}".format(*self._server.server_address)
+
+    @property
+    def routes(self):
+        return self._server.routes
+
+    @property
+    def requests(self):
+        return self._server.requests
+
+    @property
+    def connections(self):
+        """
+        Number of TCP connections accepted so far
+        """
+        return self._server.connections
+
+    def route(self, game_type, category, method, payload):
+        """
+        Register `payload` for /v3/{game_type}/{category}/json/{method}
+        """
+        path = "/v3/{0}/{1}/json/{2}".format(game_type, category, method)
+        self._server.routes[path] = payload
+        return path
+
+    def reset(self):
+        with self._server.lock:
+            self._server.routes.clear()
+            del self._server.requests[:]
+            self._server.connections = 0
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class ResettingServer(object):
+    """
+    Raw socket server for connection failures requests can't be made to see otherwise.
+    Answers requests in turn with a status code (body 5), "reset": the headers and part
+    of the body, then a TCP reset, or "stall": the headers and part of the body, then nothing for 1s
+    """
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.requests = 0
+        self._socket = socket.socket()
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.listen(8)
+        self._thread = threading.Thread(target=self._serve)
+        self._thread.daemon = True
+
+    @property
+    def address(self):
+        return "{0}:{1}".format(*self._socket.getsockname())
+
+    def _serve(self):
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                return
+            thread = threading.Thread(target=self._handle, args=(connection,))
+            thread.daemon = True
+            thread.start()
+
+    def _handle(self, connection):
+        buffer = b""
+        with connection:
+            while self.answers:
+                while b"\r\n\r\n" not in buffer:
+                    data = connection.recv(65536)
+                    if not data:
+                        return
+                    buffer += data
+                buffer = buffer.split(b"\r\n\r\n", 1)[1]
+                self.requests += 1
+                answer = self.answers.pop(0)
+                if answer == "stall":
+                    connection.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                                       b"Content-Length: 100\r\n\r\n[1, ")
+                    time.sleep(1)
+                    return
+                if answer == "reset":
+                    connection.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                                       b"Content-Length: 100\r\n\r\n[1, ")
+                    time.sleep(0.05)
+                    # close with a RST instead of a FIN
+                    connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+                    return
+                body = b"5"
+                connection.sendall("HTTP/1.1 {0} Answer\r\nContent-Type: application/json\r\n"
+                                   "Content-Length: {1}\r\n\r\n".format(answer, len(body)).encode("ascii") + body)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._socket.close()
+
+
+def point_at(client, server):
+    """
+    Redirect `client` to the stub server
+    """
+    client._api_schema = "http://"
+    client._api_address = server.address
+    return client
+
+
+def slow(delay, payload):
+    """
+    Route handler answering `payload` after `delay` seconds
+    """
+    def handler(request):
+        time.sleep(delay)
+        return 200, {}, payload
+    return handler
@@ -0,0 +1,173 @@
+#coding:utf-8
+"""
+Record/replay transports for offline, deterministic runs.
+
+Transports are requests transport adapters, passed to the client as
+``transport=``. RecordingAdapter sends requests over the network and appends
+every request/response pair to a cassette; ReplayAdapter answers from a
+cassette without any network access. A cassette is two files: NAME.json
+indexes the responses (status, headers, body position), NAME.bin holds the
+bodies exactly as transferred, still compressed. Replay memory-maps NAME.bin,
+so even large cassettes open instantly. API keys are never recorded.
+"""
+import io
+import json
+import mmap
+import os
+import threading
+
+from requests.adapters import HTTPAdapter
+from six.moves import urllib
+from urllib3.response import HTTPResponse
+
+from fantasy_data.FantasyData import FantasyDataError
+
+# Query parameters left out of cassettes and request matching
+SECRET_PARAMS = ('subscription-key',)
+
+# Headers describing the transfer framing, which doesn't apply to stored bodies
+_FRAMING_HEADERS = ('transfer-encoding', 'connection', 'keep-alive')
+
+
+class CassetteMiss(FantasyDataError):
+    """
+    A replayed request is not in the cassette
+    """
+
+
+def request_key(method, url):
+    """
+    Matching key of a request: method and url without secret query parameters
+    """
+    parts = urllib.parse.urlsplit(url)
+    query = [(name, value) for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+             if name not in SECRET_PARAMS]
+    url = urllib.parse.urlunsplit((parts.scheme, parts.netloc, parts.path, urllib.parse.urlencode(query), ''))
+    return '{0} {1}'.format(method, url)
+
+
+class _CassetteAdapter(HTTPAdapter):
+    def __init__(self, path):
+        HTTPAdapter.__init__(self)
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _response(self, request, status, reason, headers, body):
+        """
+        requests Response reading `body` as if it came from the network, so content
+        decoding and transfer stats work as for a live response
+        """
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status, reason=reason,
+                           preload_content=False, decode_content=True, request_url=request.url)
+        return self.build_response(request, raw)
+
+
+class RecordingAdapter(_CassetteAdapter):
+    """
+    Sends requests with `adapter` and records them to cassette `path`. Without `adapter`, the client
+    passes it a pooled HTTPAdapter with its own pool settings.
+    Existing recordings in the cassette are kept, new ones are appended. The index is written after
+    every recorded response, so a cassette is complete even when the client is never closed
+    """
+    def __init__(self, path, adapter=None):
+        _CassetteAdapter.__init__(self, path)
+        self._default_adapter = adapter is None
+        self.adapter = adapter or HTTPAdapter()
+        self._index = []
+        if os.path.exists(path + '.json'):
+            with io.open(path + '.json', encoding='utf-8') as f:
+                self._index = json.load(f)
+        self._bodies = open(path + '.bin', 'ab')
+
+    def use_adapter(self, adapter):
+        """
+        Send requests with `adapter` unless one was given to the constructor
+        """
+        if self._default_adapter:
+            self._default_adapter = False
+            self.adapter.close()
+            self.adapter = adapter
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        response = self.adapter.send(request, stream=True, timeout=timeout, verify=verify, cert=cert,
+                                     proxies=proxies)
+        try:
+            body = response.raw.read(decode_content=False)
+        finally:
+            response.close()
+        headers = [(name, value) for name, value in response.raw.headers.items()
+                   if name.lower() not in _FRAMING_HEADERS]
+        with self._lock:
+            offset = self._bodies.tell()
+            self._bodies.write(body)
+            self._index.append({
+                'request': request_key(request.method, request.url),
+                'status': response.status_code,
+                'reason': response.reason,
+                'headers': headers,
+                'offset': offset,
+                'length': len(body),
+            })
+            self._save()
+        return self._response(request, response.status_code, response.reason, headers, body)
+
+    def save(self):
+        """
+        Write the cassette index
+        """
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        # bodies first: the index never points past the end of NAME.bin
+        self._bodies.flush()
+        temp_path = self.path + '.json.tmp'
+        with io.open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self._index, ensure_ascii=False, indent=1))
+        os.replace(temp_path, self.path + '.json')
+
+    def close(self):
+        if not self._bodies.closed:
+            self.save()
+            self._bodies.close()
+        self.adapter.close()
+        _CassetteAdapter.close(self)
+
+
+class ReplayAdapter(_CassetteAdapter):
+    """
+    Answers requests from cassette `path` without network access.
+    Responses recorded several times for one request are replayed in order, the last one repeats.
+    Raises CassetteMiss for requests that were not recorded
+    """
+    def __init__(self, path):
+        _CassetteAdapter.__init__(self, path)
+        with io.open(path + '.json', encoding='utf-8') as f:
+            index = json.load(f)
+        self._responses = {}
+        for entry in index:
+            self._responses.setdefault(entry['request'], []).append(entry)
+        self._served = {}
+        self._file = open(path + '.bin', 'rb')
+        # mmap can't map empty files
+        size = os.fstat(self._file.fileno()).st_size
+        self._bodies = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = request_key(request.method, request.url)
+        entries = self._responses.get(key)
+        if not entries:
+            raise CassetteMiss('Error: No recorded response for {0}'.format(key))
+        with self._lock:
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+        entry = entries[min(served, len(entries) - 1)]
+        body = self._bodies[entry['offset']:entry['offset'] + entry['length']]
+        return self._response(request, entry['status'], entry['reason'], entry['headers'], body)
+
+    def close(self):
+        if self._bodies:
+            self._bodies.close()
+            self._bodies = b''
+        self._file.close()
+        _CassetteAdapter.close(self)
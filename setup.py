@@ -1,7 +1,7 @@
 #coding:utf-8
 import sys
-from distutils.core import setup
 
+from setuptools import setup
 from setuptools.command.test import test as TestCommand
 
 
@@ -33,10 +33,17 @@ setup(
     url='https://fantasyfootballcalculator.com/fantasydata-python',
     packages=['fantasy_data'],
     keywords=['fantasy', 'sports', 'football', 'nba'],
+    python_requires='>=3.7',
     install_requires=[
         "requests",
         "six",
     ],
+    extras_require={
+        'brotli': ['brotli'],
+        'orjson': ['orjson'],
+        'numpy': ['numpy'],
+        'arrow': ['numpy', 'pyarrow'],
+    },
     tests_require=['pytest'],
     cmdclass = {'test': PyTest},
     download_url='https://github.com/ffcalculator/fantasydata-python/archive/v2.1.4.tar.gz'
@@ -0,0 +1,51 @@
+#coding:utf-8
+import os
+
+import pytest
+
+from fantasy_data.testing import StubServer
+from fantasy_data.transport import RecordingAdapter, ReplayAdapter
+
+CASSETTES = os.path.join(os.path.dirname(__file__), "cassettes")
+
+
+@pytest.fixture(scope="session")
+def _stub_server():
+    server = StubServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def stub_server(_stub_server):
+    """
+    Local FantasyData API stub, emptied before every test
+    """
+    _stub_server.reset()
+    return _stub_server
+
+
+@pytest.fixture(scope="module")
+def cassette():
+    """
+    Transports for tests of the real API: cassette(NAME) replays tests/cassettes/NAME offline.
+    With FANTASYDATA_RECORD=1 in the environment the calls go to the API and NAME is recorded again
+    """
+    record = bool(os.environ.get("FANTASYDATA_RECORD"))
+    adapters = {}
+
+    def open_cassette(name):
+        if name not in adapters:
+            path = os.path.join(CASSETTES, name)
+            if record:
+                for suffix in (".json", ".bin"):
+                    if os.path.exists(path + suffix):
+                        os.remove(path + suffix)
+                adapters[name] = RecordingAdapter(path)
+            else:
+                adapters[name] = ReplayAdapter(path)
+        return adapters[name]
+
+    yield open_cassette
+    for adapter in adapters.values():
+        adapter.close()
@@ -0,0 +1,110 @@
+#coding:utf-8
+import asyncio
+import gc
+import time
+
+import pytest
+
+from fantasy_data.AsyncFantasyData import AsyncFantasyData, AsyncFantasyDataNBA
+from fantasy_data.FantasyData import FantasyDataError
+from fantasy_data.testing import point_at, slow
+
+
+TEAMS = ["ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE"]
+
+
+class TestAsyncFantasyData:
+    """
+    """
+    def test_fan_out_runs_concurrently(self, stub_server):
+        """
+        Given
+            An API that takes 0.2s per call
+        When
+            I request injuries for 8 teams at once
+        Then
+            The whole fan-out takes about as long as one call
+        """
+        for team in TEAMS:
+            stub_server.route("nfl", "stats", "Injuries/2016/5/" + team, slow(0.2, [{"Team": team}]))
+
+        async def run():
+            async with AsyncFantasyData("key", max_concurrency=len(TEAMS)) as client:
+                point_at(client.client, stub_server)
+                return await asyncio.gather(*[client.get_injuries_by_team(2016, 5, team) for team in TEAMS])
+
+        started = time.time()
+        results = asyncio.run(run())
+        assert time.time() - started < 0.2 * len(TEAMS) / 2
+        assert [result[0]["Team"] for result in results] == TEAMS
+
+    def test_concurrency_limit(self, stub_server):
+        """
+        No more than max_concurrency calls are in flight
+        """
+        for team in TEAMS:
+            stub_server.route("nfl", "stats", "Injuries/2016/5/" + team, slow(0.1, []))
+
+        async def run():
+            async with AsyncFantasyData("key", max_concurrency=2) as client:
+                point_at(client.client, stub_server)
+                await asyncio.gather(*[client.get_injuries_by_team(2016, 5, team) for team in TEAMS])
+
+        started = time.time()
+        asyncio.run(run())
+        assert time.time() - started >= 0.1 * len(TEAMS) / 2
+
+    def test_error_semantics(self, stub_server):
+        """
+        Errors are the same FantasyDataError as in the sync class
+        """
+        stub_server.route("nba", "stats", "CurrentSeason", lambda request: (401, {}, {"statusCode": 401}))
+
+        async def run():
+            async with AsyncFantasyDataNBA("key") as client:
+                point_at(client.client, stub_server)
+                await client.get_current_season()
+
+        with pytest.raises(FantasyDataError):
+            asyncio.run(run())
+
+    def test_iter_and_batch(self, stub_server):
+        """
+        Given
+            An API with player game stats and injuries
+        When
+            I iterate stats with an async for loop, stop one iteration early and batch injury calls
+        Then
+            I get the same rows as the sync client, and the client keeps no state of finished event loops
+        """
+        rows = [{"PlayerID": n} for n in range(50)]
+        stub_server.route("nfl", "stats", "PlayerGameStatsByWeek/2016REG/5", rows)
+        for team in TEAMS:
+            stub_server.route("nfl", "stats", "Injuries/2016/5/" + team, [{"Team": team}])
+        client = AsyncFantasyData("key", max_concurrency=2)
+        point_at(client.client, stub_server)
+
+        async def run():
+            streamed = [row async for row in client.iter_players_game_stats_for_season_for_week(2016, 5)]
+            async for row in client.iter_players_game_stats_for_season_for_week(2016, 5):
+                break
+            batched = await client.batch(client.get_injuries_by_team, [(2016, 5, team) for team in TEAMS])
+            return streamed, row, batched
+
+        streamed, first, batched = asyncio.run(run())
+        assert streamed == rows and first == rows[0]
+        assert [result[0]["Team"] for result in batched] == TEAMS
+        gc.collect()
+        assert len(client._semaphores) == 0
+        asyncio.run(client.close())
+
+    def test_iter_errors(self, stub_server):
+        stub_server.route("nba", "stats", "PlayerGameStatsByDate/2016-01-01", lambda request: (500, {}, {}))
+
+        async def run():
+            async with AsyncFantasyDataNBA("key") as client:
+                point_at(client.client, stub_server)
+                return [row async for row in client.iter_players_game_stats_by_date("2016-01-01")]
+
+        with pytest.raises(FantasyDataError):
+            asyncio.run(run())
@@ -0,0 +1,88 @@
+#coding:utf-8
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from fantasy_data.backfill import Backfill, _seasons, main
+from fantasy_data.FantasyData import FantasyData
+from fantasy_data.snapshot import BYE_WEEKS, PLAYER_GAME_STATS, PROJECTIONS, SCHEDULES, Snapshot, SnapshotStore
+
+
+class StubFantasyData(FantasyData):
+    """
+    Client of the stub server whose address is in the environment, so worker processes find it
+    """
+    def __init__(self, *args, **kwargs):
+        FantasyData.__init__(self, *args, **kwargs)
+        self._api_schema = "http://"
+        self._api_address = os.environ["STUB_API_ADDRESS"]
+
+
+class StubBackfill(Backfill):
+    client_class = StubFantasyData
+
+
+def _serve_season(stub_server, season, broken_week=None):
+    stub_server.route("nfl", "stats", "Schedules/{0}REG".format(season), [{"GameKey": "1", "Week": 1}])
+    stub_server.route("nfl", "stats", "Byes/{0}".format(season), [{"Team": "WAS", "Week": 9}])
+    for week in range(1, 18):
+        rows = [{"PlayerID": player, "Week": week, "FantasyPoints": player * 1.5} for player in range(50)]
+        path = "PlayerGameStatsByWeek/{0}REG/{1}".format(season, week)
+        if week == broken_week:
+            stub_server.route("nfl", "stats", path, lambda request: (500, {}, {"Message": "error"}))
+        else:
+            stub_server.route("nfl", "stats", path, rows)
+        stub_server.route("nfl", "projections", "PlayerGameProjectionStatsByWeek/{0}/{1}".format(season, week),
+                          rows[:10])
+
+
+class TestBackfill:
+    """
+    """
+    def test_backfill_and_resume(self, stub_server, tmpdir, monkeypatch):
+        """
+        Given
+            Two regular seasons on the API, one week of which fails
+        When
+            I backfill them with two processes, fix the week and run again
+        Then
+            Everything but the failed week is stored by the first run,
+            and the second run only fetches that week
+        """
+        monkeypatch.setenv("STUB_API_ADDRESS", stub_server.address)
+        _serve_season(stub_server, 2015)
+        _serve_season(stub_server, 2016, broken_week=5)
+        backfill = StubBackfill("key", str(tmpdir), processes=2, threads=2, rate_limit=1000)
+        jobs, skipped = backfill.jobs([2015, 2016], ["REG"])
+        assert len(jobs) == 4 and skipped == 0
+
+        progress = []
+        result = backfill.run([2015, 2016], ["REG"], progress=lambda written, failed: progress.append(len(written)))
+        assert [(table, partition) for table, partition, _ in result.failed] == \
+            [(PLAYER_GAME_STATS, "2016REG/5")]
+        assert "FantasyDataError" in result.failed[0][2]
+        assert len(result.written) == 2 * (1 + 1 + 17 + 17) - 1
+        assert sum(progress) == len(result.written) and len(progress) == 4
+
+        store = SnapshotStore(str(tmpdir))
+        snapshot = Snapshot(None, store)
+        assert snapshot.player_game_stats(2015, 17).FantasyPoints.sum() == sum(player * 1.5 for player in range(50))
+        assert snapshot.projections(2016, 5).rows == 10
+        assert store.partitions(BYE_WEEKS) == ["2015", "2016"]
+        assert store.partitions(SCHEDULES) == ["2015REG", "2016REG"]
+        assert len(store.partitions(PROJECTIONS)) == 34
+
+        _serve_season(stub_server, 2016)
+        requests_before = len(stub_server.requests)
+        result = backfill.run([2015, 2016], ["REG"])
+        assert result.ok and result.written == [(PLAYER_GAME_STATS, "2016REG/5")]
+        assert result.skipped == 2 * (1 + 1 + 17 + 17) - 1
+        assert len(stub_server.requests) == requests_before + 1
+
+    def test_cli_arguments(self, tmpdir, monkeypatch):
+        monkeypatch.delenv("FANTASYDATA_API_KEY", raising=False)
+        with pytest.raises(SystemExit):
+            main(["--store", str(tmpdir), "--seasons", "2016"])
+        assert _seasons("2001-2003,2010") == [2001, 2002, 2003, 2010]
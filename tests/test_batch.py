@@ -0,0 +1,82 @@
+#coding:utf-8
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fantasy_data.FantasyData import FantasyData, FantasyDataNBA, FantasyDataError
+from fantasy_data.testing import point_at, slow
+
+
+class TestBatch:
+    """
+    """
+    def test_results_in_order(self, stub_server):
+        """
+        Given
+            An API that answers player profiles slowly
+        When
+            I batch get_player over 10 ids with 10 workers
+        Then
+            Results come back in input order, faster than sequential calls
+        """
+        ids = list(range(100, 110))
+        for player_id in ids:
+            stub_server.route("nfl", "stats", "Player/{0}".format(player_id), slow(0.1, {"PlayerID": player_id}))
+
+        with point_at(FantasyData("key"), stub_server) as client:
+            started = time.time()
+            results = client.batch(client.get_player, ids, max_workers=10)
+            assert time.time() - started < 0.1 * len(ids) / 2
+
+        assert results.ok
+        assert [result["PlayerID"] for result in results] == ids
+
+    def test_errors_are_collected(self, stub_server):
+        """
+        A failed call doesn't abort the batch
+        """
+        stub_server.route("nfl", "projections", "PlayerGameProjectionStatsByTeam/2016/5/WAS", [{"Team": "WAS"}])
+        stub_server.route("nfl", "projections", "PlayerGameProjectionStatsByTeam/2016/5/DAL",
+                          lambda request: (500, {}, {"Message": "error"}))
+
+        with point_at(FantasyData("key"), stub_server) as client:
+            results = client.batch(client.get_projected_player_game_stats_by_team,
+                                   [(2016, 5, "WAS"), {"season": 2016, "week": 5, "team_id": "DAL"}])
+
+        assert not results.ok
+        assert results[0] == [{"Team": "WAS"}]
+        assert results[1] is None
+        assert isinstance(results.errors[1], FantasyDataError)
+
+    def test_max_workers_bounds_concurrency(self, stub_server):
+        """
+        No more than max_workers calls are in flight
+        """
+        dates = ["2015-12-0{0}".format(day) for day in range(1, 7)]
+        for game_date in dates:
+            stub_server.route("nba", "stats", "PlayerGameStatsByDate/" + game_date, slow(0.1, []))
+
+        with point_at(FantasyDataNBA("key"), stub_server) as client:
+            started = time.time()
+            results = client.batch(client.get_players_game_stats_by_date, dates, max_workers=2)
+            assert time.time() - started >= 0.1 * len(dates) / 2
+        assert results == [[]] * len(dates)
+
+    def test_concurrent_batches_share_the_pool(self, stub_server):
+        """
+        Batches with different max_workers running at once all finish
+        """
+        for player_id in range(50):
+            stub_server.route("nfl", "stats", "Player/{0}".format(player_id), {"PlayerID": player_id})
+
+        with point_at(FantasyData("key", pool_maxsize=16), stub_server) as client:
+            with ThreadPoolExecutor(4) as executor:
+                futures = [executor.submit(client.batch, client.get_player, range(50), max_workers=workers)
+                           for workers in (2, 4, 8, 16)]
+                assert all(future.result().ok for future in futures)
+
+    def test_max_workers_above_pool_size(self):
+        with FantasyData("key", pool_maxsize=4) as client:
+            with pytest.raises(ValueError):
+                client.batch(client.get_player, [1, 2], max_workers=8)
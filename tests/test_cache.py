@@ -0,0 +1,175 @@
+#coding:utf-8
+import datetime
+
+from fantasy_data.cache import FOREVER, CacheEntry, CachePolicy, MemoryCache, SqliteCache
+from fantasy_data.FantasyData import FantasyData, FantasyDataNBA
+from fantasy_data.testing import point_at
+
+
+class TestCachePolicy:
+    """
+    """
+    def test_endpoint_ttls(self):
+        policy = CachePolicy(ttls={'Teams': 30})
+        assert policy.ttl("nfl", "stats", "Teams", {}) == 30
+        assert policy.ttl("nfl", "stats", "Injuries/{season}/{week}", {"season": datetime.date.today().year, "week": 1}) == 300
+        assert policy.ttl("nfl", "stats", "Unknown", {}) is None
+
+    def test_past_seasons_and_dates(self):
+        policy = CachePolicy()
+        assert policy.ttl("nfl", "stats", "Byes/{season}", {"season": 2014}) == FOREVER
+        assert policy.ttl("nfl", "stats", "Schedules/{season}", {"season": "2014REG"}) == FOREVER
+        assert policy.ttl("nba", "stats", "PlayerGameStatsByDate/{game_date}", {"game_date": "2015-12-05"}) == FOREVER
+        assert policy.ttl("nfl", "news-rotoballer", "RotoBallerPremiumNewsByDate/{date}", {"date": "2017-JUL-31"}) == FOREVER
+        today = datetime.date.today().strftime("%Y-%m-%d")
+        assert policy.ttl("nba", "stats", "PlayerGameStatsByDate/{game_date}", {"game_date": today}) == 60
+
+
+class TestBackends:
+    """
+    """
+    def test_lru_eviction(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set("a", CacheEntry(1, FOREVER))
+        cache.set("b", CacheEntry(2, FOREVER))
+        cache.get("a")
+        cache.set("c", CacheEntry(3, FOREVER))
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a").value == 1
+
+    def test_sqlite(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        cache = SqliteCache(path)
+        cache.set("a", CacheEntry([{"Team": "WAS"}], FOREVER, etag='"1"'))
+        cache.close()
+
+        entry = SqliteCache(path).get("a")
+        assert entry.value == [{"Team": "WAS"}]
+        assert entry.etag == '"1"'
+        assert entry.is_fresh()
+
+
+class TestCachedCalls:
+    """
+    """
+    def test_repeated_calls_hit_cache(self, stub_server):
+        """
+        Given
+            A FantasyData object with a cache
+        When
+            I call get_teams_active() and get_bye_weeks(2014) twice
+        Then
+            Each endpoint is requested once
+        """
+        stub_server.route("nfl", "stats", "Teams", [{"Key": "WAS"}])
+        stub_server.route("nfl", "stats", "Byes/2014", [{"Team": "WAS", "Week": 10}])
+        with point_at(FantasyData("key", cache=True), stub_server) as client:
+            for _ in range(2):
+                assert client.get_teams_active() == [{"Key": "WAS"}]
+                assert client.get_bye_weeks(2014) == [{"Team": "WAS", "Week": 10}]
+        assert len(stub_server.requests) == 2
+
+    def test_results_are_copies(self, stub_server):
+        """
+        Callers changing a result don't change what the cache returns to later callers
+        """
+        stub_server.route("nfl", "stats", "Teams", [{"Key": "WAS", "Stadium": {"City": "Landover"}}])
+        with point_at(FantasyData("key", cache=True), stub_server) as client:
+            for _ in range(2):
+                teams = client.get_teams_active()
+                assert teams == [{"Key": "WAS", "Stadium": {"City": "Landover"}}]
+                teams[0]["Stadium"]["City"] = "Ashburn"
+                teams.append({"Key": "NYG"})
+        assert len(stub_server.requests) == 1
+
+    def test_expired_entry_is_refetched(self, stub_server):
+        """
+        Stale entries go back to the network
+        """
+        stub_server.route("nba", "stats", "Teams", [{"Key": "BOS"}])
+        cache = MemoryCache()
+        with point_at(FantasyDataNBA("key", cache=cache), stub_server) as client:
+            client.get_teams_active()
+            cache.get("nba/stats/Teams").expires_at = 0
+            client.get_teams_active()
+        assert len(stub_server.requests) == 2
+
+    def test_errors_are_not_cached(self, stub_server):
+        stub_server.route("nfl", "stats", "Teams", lambda request: (500, {}, {"Message": "error"}))
+        cache = MemoryCache()
+        with point_at(FantasyData("key", cache=cache), stub_server) as client:
+            try:
+                client.get_teams_active()
+            except Exception:
+                pass
+        assert len(cache) == 0
+
+
+class TestRevalidation:
+    """
+    Conditional requests for stale cache entries
+    """
+    def _conditional(self, payload, etag=None, last_modified=None):
+        def handler(request):
+            headers = {}
+            if etag:
+                headers['ETag'] = etag
+            if last_modified:
+                headers['Last-Modified'] = last_modified
+            if (etag and request.headers.get('If-None-Match') == etag) or \
+                    (last_modified and request.headers.get('If-Modified-Since') == last_modified):
+                return 304, headers, b''
+            return 200, headers, payload
+        return handler
+
+    def test_etag(self, stub_server):
+        """
+        Given
+            A stale cached response with an ETag
+        When
+            I call the same method again and the data hasn't changed
+        Then
+            The client sends If-None-Match, gets 304 and returns the cached body
+        """
+        stub_server.route("nfl", "stats", "FreeAgents", self._conditional([{"PlayerID": 1}], etag='"v1"'))
+        cache = MemoryCache()
+        with point_at(FantasyData("key", cache=cache), stub_server) as client:
+            assert client.get_free_agents() == [{"PlayerID": 1}]
+            cache.get("nfl/stats/FreeAgents").expires_at = 0
+            assert client.get_free_agents() == [{"PlayerID": 1}]
+            assert cache.get("nfl/stats/FreeAgents").is_fresh()
+
+        assert 'If-None-Match' not in stub_server.requests[0].headers
+        assert stub_server.requests[1].headers['If-None-Match'] == '"v1"'
+
+    def test_last_modified(self, stub_server):
+        """
+        If-Modified-Since is sent when the API gave Last-Modified
+        """
+        last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+        stub_server.route("nfl", "projections", "PlayerSeasonProjectionStats/2016",
+                          self._conditional([{"PlayerID": 2}], last_modified=last_modified))
+        cache = MemoryCache()
+        with point_at(FantasyData("key", cache=cache), stub_server) as client:
+            client.get_player_season_projected_stats(2016)
+            cache.get("nfl/projections/PlayerSeasonProjectionStats/2016").expires_at = 0
+            assert client.get_player_season_projected_stats(2016) == [{"PlayerID": 2}]
+        assert stub_server.requests[1].headers['If-Modified-Since'] == last_modified
+
+    def test_changed_data(self, stub_server):
+        """
+        A 200 on revalidation replaces the cached body
+        """
+        def handler(request):
+            if request.headers.get('If-None-Match') == '"v1"':
+                return 200, {'ETag': '"v2"'}, [{"PlayerID": 3}]
+            return 200, {'ETag': '"v1"'}, [{"PlayerID": 1}]
+
+        stub_server.route("nfl", "stats", "FreeAgents", handler)
+        cache = MemoryCache()
+        with point_at(FantasyData("key", cache=cache), stub_server) as client:
+            client.get_free_agents()
+            cache.get("nfl/stats/FreeAgents").expires_at = 0
+            assert client.get_free_agents() == [{"PlayerID": 3}]
+        assert cache.get("nfl/stats/FreeAgents").etag == '"v2"'
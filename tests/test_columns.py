@@ -0,0 +1,93 @@
+#coding:utf-8
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from fantasy_data.columns import Columns, to_columns
+from fantasy_data.FantasyData import FantasyData
+from fantasy_data.testing import point_at
+
+
+ROWS = [
+    {"PlayerID": 1, "Name": "A", "FantasyPoints": 10.5, "Played": True, "FanDuelSalary": 5000, "ScoringDetails": []},
+    {"PlayerID": 2, "Name": "B", "FantasyPoints": 3, "Played": False, "FanDuelSalary": None,
+     "ScoringDetails": [{"Length": 5}]},
+    {"PlayerID": 3, "Name": None, "FantasyPoints": None, "Played": True, "FanDuelSalary": 4000,
+     "ScoringDetails": [], "Injured": "Q"},
+]
+
+
+class TestColumns:
+    """
+    """
+    def test_dtypes_and_masks(self):
+        columns = to_columns(ROWS)
+        assert isinstance(columns, Columns) and columns.rows == 3
+        assert columns["PlayerID"].dtype == np.int64
+        assert columns["FantasyPoints"].dtype == np.float64
+        assert columns["Played"].dtype == np.bool_
+        assert columns["Name"].dtype == object
+        assert columns.FanDuelSalary.mask.tolist() == [False, True, False]
+        assert columns.FanDuelSalary.sum() == 9000
+        assert columns.FantasyPoints.mean() == 6.75
+        assert columns.ScoringDetails[1] == [{"Length": 5}]
+
+    def test_missing_fields_are_masked(self):
+        assert to_columns(ROWS).Injured.mask.tolist() == [True, True, False]
+
+    def test_selected_fields(self):
+        columns = to_columns(iter(ROWS), fields=["PlayerID", "Nope"])
+        assert sorted(columns) == ["Nope", "PlayerID"]
+        assert columns.Nope.mask.all()
+
+    def test_round_trip(self):
+        expected = [dict({"Injured": None}, **row) for row in ROWS]
+        assert to_columns(ROWS).to_rows() == expected
+
+    def test_empty(self):
+        assert to_columns([]) == {} and to_columns([]).rows == 0
+
+
+class TestAsColumns:
+    """
+    """
+    def test_get_and_iter_methods(self, stub_server):
+        """
+        Given
+            A PlayerGameStatsByWeek response
+        When
+            I call the get_ and iter_ methods with as_columns=True
+        Then
+            I get one array per field
+        """
+        stub_server.route("nfl", "stats", "PlayerGameStatsByWeek/2014REG/5", ROWS)
+        with point_at(FantasyData("key"), stub_server) as client:
+            columns = client.get_players_game_stats_for_season_for_week(2014, 5, as_columns=True)
+            assert columns.PlayerID.tolist() == [1, 2, 3]
+            streamed = client.iter_players_game_stats_for_season_for_week(2014, 5, as_columns=True)
+            assert streamed.FantasyPoints.tolist() == [10.5, 3.0, None]
+            with pytest.raises(ValueError):
+                client.get_players_game_stats_for_season_for_week(2014, 5, as_columns=True, as_models=True)
+
+    def test_get_streams_into_columns(self, stub_server, monkeypatch):
+        """
+        Given
+            A PlayerGameStatsByWeek response
+        When
+            I call the get_ method with as_columns=True, without and with a response cache
+        Then
+            Without cache the rows are streamed into the columns, with cache the cached result is converted
+        """
+        stub_server.route("nfl", "stats", "PlayerGameStatsByWeek/2014REG/5", ROWS)
+        for cache, streamed in ((None, 1), (True, 0)):
+            with point_at(FantasyData("key", cache=cache), stub_server) as client:
+                calls = []
+                method_iter = client._method_iter
+                monkeypatch.setattr(client, "_method_iter", lambda *args, **kwargs: (calls.append(args),
+                                                                                       method_iter(*args, **kwargs))[1])
+                for _ in range(2):
+                    columns = client.get_players_game_stats_for_season_for_week(2014, 5, as_columns=True)
+                    assert columns.to_rows() == to_columns(ROWS).to_rows()
+                assert len(calls) == 2 * streamed
+        # the second cached call is a cache hit
+        assert len(stub_server.requests) == 3
@@ -0,0 +1,53 @@
+#coding:utf-8
+import gzip
+import json
+import zlib
+
+from fantasy_data.FantasyData import FantasyData
+from fantasy_data.testing import point_at
+
+
+ROWS = [{"PlayerID": n, "Name": "Player {0}".format(n), "Team": "WAS", "FantasyPoints": 12.5} for n in range(500)]
+
+
+def _compressed(payload):
+    def handler(request):
+        body = json.dumps(payload).encode("utf-8")
+        accepted = request.headers.get("Accept-Encoding", "")
+        if "gzip" in accepted:
+            return 200, {"Content-Encoding": "gzip"}, gzip.compress(body)
+        if "deflate" in accepted:
+            return 200, {"Content-Encoding": "deflate"}, zlib.compress(body)
+        return 200, {}, body
+    return handler
+
+
+class TestCompression:
+    """
+    """
+    def test_gzip_is_negotiated(self, stub_server):
+        """
+        Given
+            An API that compresses responses on request
+        When
+            I call get_players_game_stats_for_season_for_week()
+        Then
+            The client asks for gzip, decodes the body and reports both sizes
+        """
+        stub_server.route("nfl", "stats", "PlayerGameStatsByWeek/2014REG/5", _compressed(ROWS))
+        with point_at(FantasyData("key"), stub_server) as client:
+            assert client.get_players_game_stats_for_season_for_week(2014, 5) == ROWS
+            stats = client.last_transfer
+
+        assert "gzip" in stub_server.requests[0].headers["Accept-Encoding"]
+        assert stats.decoded_bytes == len(json.dumps(ROWS).encode("utf-8"))
+        assert stats.wire_bytes < stats.decoded_bytes / 5
+
+    def test_identity(self, stub_server):
+        """
+        Uncompressed responses report equal sizes
+        """
+        stub_server.route("nfl", "stats", "Teams", [{"Key": "WAS"}])
+        with point_at(FantasyData("key"), stub_server) as client:
+            client.get_teams_active()
+            assert client.last_transfer.wire_bytes == client.last_transfer.decoded_bytes
@@ -0,0 +1,89 @@
+#coding:utf-8
+import asyncio
+import time
+
+import pytest
+
+from fantasy_data.AsyncFantasyData import AsyncFantasyData
+from fantasy_data.deadline import current_timeout, deadline, remaining, timeout
+from fantasy_data.FantasyData import DeadlineExceeded, FantasyData, FantasyDataTimeout
+from fantasy_data.testing import point_at, slow
+
+
+TEAMS = ["T{0:02d}".format(n) for n in range(32)]
+
+
+class TestContexts:
+    """
+    """
+    def test_nested_deadlines_never_extend(self):
+        assert remaining() is None
+        with deadline(1):
+            with deadline(60):
+                assert remaining() <= 1
+            with deadline(0.5):
+                assert remaining() <= 0.5
+        assert remaining() is None
+
+    def test_timeouts(self):
+        assert current_timeout((10, 60)) == (10, 60)
+        with timeout(3):
+            assert current_timeout((10, 60)) == (3, 3)
+            with deadline(1):
+                assert max(current_timeout(None)) <= 1
+
+
+class TestTimeouts:
+    """
+    """
+    def test_read_timeout(self, stub_server):
+        """
+        Given
+            An API that stalls
+        When
+            I call it with a short timeout, at client level or per call
+        Then
+            FantasyDataTimeout is raised instead of hanging
+        """
+        stub_server.route("nfl", "stats", "CurrentWeek", slow(1, 5))
+        with point_at(FantasyData("key", timeout=0.1), stub_server) as client:
+            with pytest.raises(FantasyDataTimeout):
+                client.get_current_week()
+        with point_at(FantasyData("key"), stub_server) as client:
+            with timeout(0.1), pytest.raises(FantasyDataTimeout):
+                client.get_current_week()
+
+    def test_batch_deadline(self, stub_server):
+        """
+        Given
+            An API that takes 1s per call
+        When
+            I batch 32 team calls over 4 workers with a 0.5s deadline
+        Then
+            The batch returns within the budget and every call failed with DeadlineExceeded
+        """
+        for team in TEAMS:
+            stub_server.route("nfl", "stats", "Injuries/2016/5/" + team, slow(1, []))
+        with point_at(FantasyData("key"), stub_server) as client:
+            started = time.time()
+            result = client.batch(client.get_injuries_by_team, [(2016, 5, team) for team in TEAMS],
+                                  max_workers=4, deadline=0.5)
+            assert time.time() - started < 0.9
+        assert len(result.errors) == len(TEAMS)
+        assert all(isinstance(error, DeadlineExceeded) for error in result.errors.values())
+
+    def test_async_deadline(self, stub_server):
+        for team in TEAMS[:4]:
+            stub_server.route("nfl", "stats", "Injuries/2016/5/" + team, slow(1, []))
+
+        async def run():
+            async with AsyncFantasyData("key", max_concurrency=4) as client:
+                point_at(client.client, stub_server)
+                with deadline(0.3):
+                    return await asyncio.gather(*[client.get_injuries_by_team(2016, 5, team) for team in TEAMS[:4]],
+                                                return_exceptions=True)
+
+        started = time.time()
+        results = asyncio.run(run())
+        assert time.time() - started < 0.9
+        assert all(isinstance(result, DeadlineExceeded) for result in results)
@@ -0,0 +1,41 @@
+#coding:utf-8
+import json
+
+import pytest
+
+from fantasy_data.decoders import get_decoder
+from fantasy_data.FantasyData import FantasyData
+from fantasy_data.testing import point_at
+
+
+class TestDecoders:
+    """
+    """
+    def test_auto_decodes_bytes(self):
+        assert get_decoder()(b'[{"PlayerID": 1, "Name": "Jos\\u00e9"}]') == [{"PlayerID": 1, "Name": u"José"}]
+
+    def test_named_and_custom(self):
+        assert get_decoder("json") is json.loads
+        assert get_decoder(json.loads) is json.loads
+        with pytest.raises(ValueError):
+            get_decoder("yaml")
+
+    def test_client_uses_decoder(self, stub_server):
+        """
+        Given
+            A FantasyData object with a custom decoder
+        When
+            I call an API method
+        Then
+            The response body goes through that decoder
+        """
+        bodies = []
+
+        def loads(body):
+            bodies.append(body)
+            return json.loads(body)
+
+        stub_server.route("nfl", "stats", "Teams", [{"Key": "WAS"}])
+        with point_at(FantasyData("key", json_decoder=loads), stub_server) as client:
+            assert client.get_teams_active() == [{"Key": "WAS"}]
+        assert bodies == [b'[{"Key": "WAS"}]']
@@ -0,0 +1,167 @@
+#coding:utf-8
+import asyncio
+import datetime
+import threading
+
+import pytest
+
+from fantasy_data.FantasyData import FantasyDataError, FantasyDataNBA
+from fantasy_data import live
+from fantasy_data.live import ADDED, REMOVED, UPDATED, PollError, Poller, Schedule, eastern_now
+from fantasy_data.testing import point_at
+
+
+TIP_OFF = datetime.datetime(2016, 1, 5, 19, 0)
+
+GAMES = [
+    {"GameID": 1, "DateTime": "2016-01-05T19:00:00", "HomeTeam": "BOS", "AwayTeam": "NY", "Status": "Scheduled"},
+    {"GameID": 2, "DateTime": "2016-01-05T22:30:00", "HomeTeam": "LAL", "AwayTeam": "GS", "Status": "Scheduled"},
+    {"GameID": 3, "DateTime": "2016-01-06T19:00:00", "HomeTeam": "NY", "AwayTeam": "MIA", "Status": "Scheduled"},
+    {"GameID": 4, "DateTime": None, "HomeTeam": "BYE", "AwayTeam": "CHI"},
+]
+
+
+class Clock(object):
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += datetime.timedelta(seconds=seconds)
+
+
+class TestSchedule:
+    """
+    """
+    def test_live_and_next_start(self):
+        schedule = Schedule(GAMES, datetime.timedelta(hours=3))
+        assert len(schedule.games) == 3
+        assert not schedule.live(TIP_OFF - datetime.timedelta(minutes=1))
+        assert schedule.live(TIP_OFF + datetime.timedelta(hours=1))
+        assert not schedule.live(TIP_OFF + datetime.timedelta(hours=1), teams={"LAL"})
+        assert schedule.next_start(TIP_OFF, teams={"LAL"}) == datetime.datetime(2016, 1, 5, 22, 30)
+        assert schedule.next_start(datetime.datetime(2016, 1, 7)) is None
+
+    def test_status(self):
+        games = [dict(GAMES[0], Status="Final"), dict(GAMES[1], Status="InProgress")]
+        schedule = Schedule(games, datetime.timedelta(hours=3))
+        assert not schedule.live(TIP_OFF + datetime.timedelta(hours=1), teams={"BOS"})
+        # overtime past the expected game length
+        assert schedule.live(datetime.datetime(2016, 1, 6, 2, 0), teams={"GS"})
+
+
+class TestPoller:
+    """
+    """
+    def test_changes_and_intervals(self, stub_server):
+        """
+        Given
+            A feed of player game stats, polled from before tip-off
+        When
+            I poll it as the stats change
+        Then
+            I get added, updated and removed rows, nothing for unchanged responses,
+            and polls are 15s apart during the game, up to 10 minutes apart before it
+        """
+        answers = [
+            [],
+            [{"PlayerID": 1, "Points": 0}, {"PlayerID": 2, "Points": 0}],
+            [{"PlayerID": 1, "Points": 0}, {"PlayerID": 2, "Points": 0}],
+            [{"PlayerID": 1, "Points": 2}, {"PlayerID": 3, "Points": 0}],
+        ]
+        stub_server.route("nba", "stats", "PlayerGameStatsByDate/2016-01-05", lambda request: (200, {}, answers.pop(0)))
+        clock = Clock(TIP_OFF - datetime.timedelta(minutes=25))
+        with point_at(FantasyDataNBA("key"), stub_server) as client:
+            poller = Poller(client, Schedule(GAMES, datetime.timedelta(hours=3)), now=clock, sleep=clock.sleep)
+            poller.add("stats", client.get_players_game_stats_by_date, ("2016-01-05",), teams={"BOS"})
+            polls = []
+            for _ in range(4):
+                polls.append(sorted((change.kind, change.key) for change in poller.poll()))
+                clock.sleep(poller._delay())
+            assert polls == [
+                [],
+                [(ADDED, 1), (ADDED, 2)],
+                [],
+                [(ADDED, 3), (REMOVED, 2), (UPDATED, 1)],
+            ]
+            assert clock.now == TIP_OFF + datetime.timedelta(seconds=15)
+
+    def test_off_between_games(self, stub_server):
+        stub_server.route("nba", "scores", "GamesByDate/2016-01-05", [{"GameID": 1}])
+        clock = Clock(TIP_OFF + datetime.timedelta(hours=4))
+        with point_at(FantasyDataNBA("key"), stub_server) as client:
+            poller = Poller(client, Schedule(GAMES, datetime.timedelta(hours=3)), idle_interval=None, now=clock)
+            poller.add("games", client.get_games_by_date, ("2016-01-05",), key="GameID", teams={"MIA"})
+            assert [change.kind for change in poller.poll()] == [ADDED]
+            assert poller.next_poll() == datetime.datetime(2016, 1, 6, 19, 0)
+            assert poller.poll() == []
+
+    def test_run_and_errors(self, stub_server):
+        stub_server.route("nba", "scores", "GamesByDate/2016-01-05", [{"GameID": 1}])
+        stub_server.route("nba", "scores", "GamesByDate/2016-01-06", lambda request: (401, {}, {"statusCode": 401}))
+        clock = Clock(TIP_OFF)
+        stop = threading.Event()
+        errors = []
+        changes = []
+
+        def callback(change):
+            changes.append(change)
+            stop.set()
+
+        with point_at(FantasyDataNBA("key"), stub_server) as client:
+            poller = Poller(client, Schedule(GAMES, datetime.timedelta(hours=3)), now=clock, sleep=clock.sleep)
+            poller.add("today", client.get_games_by_date, ("2016-01-05",), key="GameID")
+            poller.add("tomorrow", client.get_games_by_date, ("2016-01-06",), key="GameID")
+            poller.run(callback, stop, on_error=lambda feed, error: errors.append(feed.name))
+            assert [change.feed for change in changes] == ["today"] and errors == ["tomorrow"]
+            with pytest.raises(FantasyDataError):
+                clock.sleep(15)
+                poller.poll()
+
+    def test_changes_survive_errors(self, stub_server):
+        """
+        Given
+            Two feeds, one of which fails
+        When
+            I poll them without on_error
+        Then
+            PollError carries the changes of the other feed, which are not lost at the next poll
+        """
+        stub_server.route("nba", "scores", "GamesByDate/2016-01-05", [{"GameID": 1}])
+        stub_server.route("nba", "scores", "GamesByDate/2016-01-06", lambda request: (500, {}, {"Message": "error"}))
+        clock = Clock(TIP_OFF)
+        with point_at(FantasyDataNBA("key"), stub_server) as client:
+            poller = Poller(client, Schedule(GAMES, datetime.timedelta(hours=3)), now=clock, sleep=clock.sleep)
+            poller.add("today", client.get_games_by_date, ("2016-01-05",), key="GameID")
+            poller.add("tomorrow", client.get_games_by_date, ("2016-01-06",), key="GameID")
+            with pytest.raises(PollError) as error:
+                poller.poll()
+            assert list(error.value.errors) == ["tomorrow"]
+            assert [(change.kind, change.feed) for change in error.value.changes] == [(ADDED, "today")]
+
+            changes = []
+            with pytest.raises(PollError):
+                clock.sleep(15)
+                poller.run(changes.append)
+            # unchanged since the first poll
+            assert changes == []
+
+    def test_eastern_clock(self, monkeypatch):
+        eastern = eastern_now()
+        monkeypatch.setattr(live, "_EASTERN", None)
+        assert abs((eastern_now() - eastern).total_seconds()) < 60
+
+    def test_async_changes(self, stub_server):
+        stub_server.route("nba", "scores", "GamesByDate/2016-01-05", [{"GameID": 1}, {"GameID": 2}])
+        clock = Clock(TIP_OFF + datetime.timedelta(hours=7))
+        with point_at(FantasyDataNBA("key"), stub_server) as client:
+            poller = Poller(client, Schedule(GAMES[:2], datetime.timedelta(hours=3)), idle_interval=None, now=clock)
+            poller.add("games", client.get_games_by_date, ("2016-01-05",), key="GameID")
+
+            async def collect():
+                return [change.key async for change in poller.changes()]
+
+            # no game left, the iterator ends after the first poll
+            assert sorted(asyncio.run(collect())) == [1, 2]
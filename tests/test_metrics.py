@@ -0,0 +1,70 @@
+#coding:utf-8
+import pytest
+
+from fantasy_data.FantasyData import FantasyData, FantasyDataError
+from fantasy_data.metrics import Histogram, Histograms, RequestEvent
+from fantasy_data.retry import RetryPolicy
+from fantasy_data.testing import point_at
+
+
+class TestHistograms:
+    """
+    """
+    def test_quantile(self):
+        histogram = Histogram((0.1, 0.5, 1))
+        for value in (0.05, 0.05, 0.2, 0.7, 3):
+            histogram.observe(value)
+        assert histogram.counts == [2, 3, 4]
+        assert histogram.quantile(0.5) == 0.5
+        assert histogram.quantile(0.99) == float('inf')
+
+    def test_prometheus(self):
+        collector = Histograms(buckets=(0.1, 1))
+        collector.record(RequestEvent("nfl", "Teams", 200, 0.2, {"download": 0.05}, 100, 400, 1, "miss"))
+        collector.record(RequestEvent("nfl", "Teams", None, 0.05, {}, error="FantasyDataError"))
+        text = collector.prometheus()
+        assert '# TYPE fantasydata_request_seconds histogram' in text
+        assert 'fantasydata_request_seconds_bucket{endpoint="Teams",game_type="nfl",le="0.1",phase="total"} 1' in text
+        assert 'fantasydata_request_seconds_count{endpoint="Teams",game_type="nfl",phase="total"} 2' in text
+        assert 'fantasydata_requests_total{endpoint="Teams",game_type="nfl",status="200"} 1' in text
+        assert 'fantasydata_cache_total{endpoint="Teams",game_type="nfl",result="miss"} 1' in text
+        assert 'fantasydata_retries_total{endpoint="Teams",game_type="nfl"} 1' in text
+        assert 'fantasydata_errors_total{endpoint="Teams",error="FantasyDataError",game_type="nfl"} 1' in text
+        assert collector.quantile("Teams", 0.5) == 0.1
+
+
+class TestInstrumentation:
+    """
+    """
+    def test_events(self, stub_server):
+        """
+        Given
+            A client with a metrics sink and a cache
+        When
+            I call an API method twice, the first time after a 500
+        Then
+            The sink gets an event per call with phases, sizes, retries and cache outcome
+        """
+        answers = [(500, {}, {}), (200, {}, [{"Key": "WAS"}] * 100)]
+        stub_server.route("nfl", "stats", "Teams", lambda request: answers.pop(0))
+        events = []
+        client = FantasyData("key", metrics=events.append, cache=True, retry=RetryPolicy(backoff=0.01))
+        with point_at(client, stub_server):
+            client.get_teams_active()
+            client.get_teams_active()
+        miss, hit = events
+        assert (miss.endpoint, miss.status, miss.cache, miss.retries) == ("Teams", 200, "miss", 1)
+        assert miss.decoded_bytes == len(b'{"Key": "WAS"}, ') * 100
+        assert miss.phases["connect"] > 0 and miss.phases["tls"] == 0
+        assert miss.phases["decode"] > 0 and miss.phases["download"] > 0
+        assert miss.seconds >= sum(miss.phases.values())
+        assert (hit.cache, hit.status, hit.wire_bytes) == ("hit", None, 0)
+
+    def test_errors_and_collector(self, stub_server):
+        stub_server.route("nfl", "stats", "CurrentWeek", lambda request: (401, {}, {"statusCode": 401}))
+        collector = Histograms()
+        with point_at(FantasyData("key", metrics=[collector]), stub_server) as client:
+            with pytest.raises(FantasyDataError):
+                client.get_current_week()
+        assert 'status="401"' in collector.prometheus()
+        assert 'error="InvalidKeyError"' in collector.prometheus()
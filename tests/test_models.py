@@ -0,0 +1,89 @@
+#coding:utf-8
+import datetime
+import pickle
+import types
+
+import pytest
+
+from fantasy_data.FantasyData import FantasyData, FantasyDataNBA
+from fantasy_data.models import Game, PlayerGame, Projection, Standing, to_datetime, to_number
+from fantasy_data.testing import point_at
+
+
+ROW = {"PlayerID": 732, "Name": "Cam Newton", "GameDate": "2014-10-05T13:00:00", "Week": 5,
+       "PassingYards": 198.0, "FantasyPoints": 17.2, "NotAModelField": "kept"}
+
+
+class TestRecords:
+    """
+    """
+    def test_fields_and_extra(self):
+        row = PlayerGame(**ROW)
+        assert row.PlayerID == 732
+        assert row["Name"] == "Cam Newton"
+        assert row.NotAModelField == "kept"
+        assert row.Opponent is None
+        assert row.get("Missing", 1) == 1
+        with pytest.raises(AttributeError):
+            row.Missing
+        with pytest.raises(KeyError):
+            row["Missing"]
+        assert not hasattr(row, "__dict__")
+
+    def test_lazy_conversion(self):
+        row = PlayerGame(**ROW)
+        assert row._converted == 0
+        assert row.GameDate == datetime.datetime(2014, 10, 5, 13, 0)
+        assert row.GameDate is row.GameDate
+        assert row._converted != 0
+        game = Game(Date="2014-10-05", PointSpread="-3.5", OverUnder="45")
+        assert game.Date == datetime.datetime(2014, 10, 5)
+        assert (game.PointSpread, game.OverUnder) == (-3.5, 45)
+
+    def test_converters_leave_other_values(self):
+        assert to_datetime(None) is None
+        assert to_datetime("soon") == "soon"
+        assert to_number("n/a") == "n/a"
+        assert to_number(3) == 3
+
+    def test_round_trip(self):
+        row = PlayerGame(**ROW)
+        data = row.to_dict()
+        assert data["GameDate"] == datetime.datetime(2014, 10, 5, 13, 0)
+        assert data["NotAModelField"] == "kept"
+        assert PlayerGame.from_dict(data) == row
+        assert pickle.loads(pickle.dumps(row)) == row
+        assert Projection(**ROW) != row
+
+    def test_from_result(self):
+        assert isinstance(Standing.from_result({"Wins": 3}), Standing)
+        assert [row.Wins for row in Standing.from_result([{"Wins": 3}, {"Wins": 4}])] == [3, 4]
+        rows = Standing.from_result(iter([{"Wins": 3}]))
+        assert isinstance(rows, types.GeneratorType)
+        assert next(rows).Wins == 3
+
+
+class TestAsModels:
+    """
+    """
+    def test_get_method(self, stub_server):
+        """
+        Given
+            A PlayerGameStatsByWeek response
+        When
+            I call get_players_game_stats_for_season_for_week(as_models=True)
+        Then
+            I get PlayerGame records holding the same data
+        """
+        stub_server.route("nfl", "stats", "PlayerGameStatsByWeek/2014REG/5", [ROW])
+        with point_at(FantasyData("key"), stub_server) as client:
+            rows = client.get_players_game_stats_for_season_for_week(2014, 5, as_models=True)
+            assert [type(row) for row in rows] == [PlayerGame]
+            assert rows[0].FantasyPoints == 17.2
+            assert client.get_players_game_stats_for_season_for_week(2014, 5) == [ROW]
+
+    def test_iter_method(self, stub_server):
+        stub_server.route("nba", "stats", "PlayerGameStatsByDate/2015-12-05", [{"PlayerID": 1, "Points": 30}])
+        with point_at(FantasyDataNBA("key"), stub_server) as client:
+            rows = client.iter_players_game_stats_by_date("2015-12-05", as_models=True)
+            assert [(row.PlayerID, row.Points) for row in rows] == [(1, 30)]
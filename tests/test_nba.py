@@ -45,11 +45,13 @@ class TestFantasyData:
         Then
             It throws an exception stating "Error: Cannot connect to the FantasyData API"
         """
-        invalid_api_key = 'invalid api key'
+        client = FantasyDataNBA('any api key')
+        # nothing listens there
+        client._api_schema, client._api_address = "http://", "127.0.0.1:1"
         with pytest.raises(FantasyDataError):
-            FantasyDataNBA(invalid_api_key).get_current_season()
+            client.get_current_season()
 
-    def test_get_current_season_invalid_api_key(self):
+    def test_get_current_season_invalid_api_key(self, cassette):
         """
         Invalid API key
 
@@ -63,20 +65,20 @@ class TestFantasyData:
         """
         invalid_api_key = 'invalid api key'
         with pytest.raises(FantasyDataError):
-            FantasyDataNBA(invalid_api_key).get_current_season()
+            FantasyDataNBA(invalid_api_key, transport=cassette("nba_invalid_key")).get_current_season()
 
-    def test_get_current_season(self, api_key):
+    def test_get_current_season(self, cassette, api_key):
         """
         API call get_current_season
         """
-        assert isinstance(FantasyDataNBA(api_key).get_current_season(), int), "Invalid value type"
+        assert isinstance(FantasyDataNBA(api_key, transport=cassette("nba")).get_current_season(), int), "Invalid value type"
 
-    def test_get_games_by_season(self, api_key, season):
+    def test_get_games_by_season(self, cassette, api_key, season):
         """
         API call get_schedules_for_season.
         Test response type and items structure
         """
-        response = FantasyDataNBA(api_key).get_games_by_season(season)
+        response = FantasyDataNBA(api_key, transport=cassette("nba")).get_games_by_season(season)
         assert isinstance(response, list), "response not list"
         assert len(response), "response empty list"
 
@@ -94,16 +96,16 @@ class TestFantasyData:
             assert item["PointSpread"] is None or isinstance(item["PointSpread"], (float, int)), "unexpected type of key 'PointSpread'"
             assert isinstance(item["Season"], int), "unexpected type of key 'Season'"
 
-    def test_get_games_by_date(self, api_key, game_date):
-        response = FantasyDataNBA(api_key).get_games_by_date(game_date)
+    def test_get_games_by_date(self, cassette, api_key, game_date):
+        response = FantasyDataNBA(api_key, transport=cassette("nba")).get_games_by_date(game_date)
 
         assert isinstance(response, list), "response not list"
         assert len(response), "response empty list"
 
         assert isinstance(response[0]["StadiumID"], int), "unexpected type of key 'StadiumID'"
 
-    def test_get_player_game_stats_by_date(self, api_key, game_date):
-        response = FantasyDataNBA(api_key).get_players_game_stats_by_date(game_date)
+    def test_get_player_game_stats_by_date(self, cassette, api_key, game_date):
+        response = FantasyDataNBA(api_key, transport=cassette("nba")).get_players_game_stats_by_date(game_date)
 
         assert isinstance(response, list), "response not list"
         assert len(response), "response empty list"
@@ -112,8 +114,8 @@ class TestFantasyData:
         assert isinstance(response[0]["PlayerID"], int), "unexpected type of key 'PlayerID'"
         assert isinstance(response[0]["Name"], six.text_type), "unexpected type of key 'name'"
 
-    def test_get_team_game_stats_by_date(self, api_key, game_date):
-        response = FantasyDataNBA(api_key).get_team_game_stats_by_date(game_date)
+    def test_get_team_game_stats_by_date(self, cassette, api_key, game_date):
+        response = FantasyDataNBA(api_key, transport=cassette("nba")).get_team_game_stats_by_date(game_date)
 
         assert isinstance(response, list), "response not list"
         assert len(response), "response empty list"
@@ -122,8 +124,8 @@ class TestFantasyData:
         assert isinstance(response[0]["TeamID"], int), "unexpected type of key 'TeamID'"
         assert isinstance(response[0]["Name"], six.text_type), "unexpected type of key 'name'"
 
-    def test_get_standings(self, api_key, season):
-        response = FantasyDataNBA(api_key).get_standings(season)
+    def test_get_standings(self, cassette, api_key, season):
+        response = FantasyDataNBA(api_key, transport=cassette("nba")).get_standings(season)
 
         assert isinstance(response, list), "response not list"
         assert len(response), "response empty list"
@@ -133,16 +135,16 @@ class TestFantasyData:
         assert isinstance(response[0]["Wins"], int), "unexpected type of key 'Wins'"
         assert isinstance(response[0]["Losses"], int), "unexpected type of key 'Losses'"
 
-    def test_get_teams_active(self, api_key):
-        response = FantasyDataNBA(api_key).get_teams_active()
+    def test_get_teams_active(self, cassette, api_key):
+        response = FantasyDataNBA(api_key, transport=cassette("nba")).get_teams_active()
 
         assert isinstance(response, list), "response not list"
         assert len(response), "response empty list"
 
         assert isinstance(response[0]["City"], six.text_type), "unexpected type of key 'City'"
 
-    def test_get_stadiums(self, api_key):
-        response = FantasyDataNBA(api_key).get_stadiums()
+    def test_get_stadiums(self, cassette, api_key):
+        response = FantasyDataNBA(api_key, transport=cassette("nba")).get_stadiums()
 
         assert isinstance(response, list), "response not list"
         assert len(response), "response empty list"
@@ -0,0 +1,56 @@
+#coding:utf-8
+from fantasy_data.FantasyData import FantasyData, FantasyDataError
+from fantasy_data.testing import point_at
+
+
+TEAMS = ["WAS", "DAL", "NYG", "PHI", "ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE", "DEN", "DET", "GB", "HOU"]
+
+INJURIES = [
+    {"PlayerID": 1, "Team": "WAS", "Status": "Out"},
+    {"PlayerID": 2, "Team": "DAL", "Status": "Questionable"},
+    {"PlayerID": 3, "Team": "WAS", "Status": "Doubtful"},
+    {"PlayerID": 4, "Team": "KC", "Status": "Out"},
+]
+
+
+class TestTeamPlans:
+    """
+    """
+    def test_one_league_call(self, stub_server):
+        """
+        Given
+            Injuries of 16 teams requested for one week, and one for another week
+        When
+            I batch get_injuries_by_team with plan=True
+        Then
+            The 16 teams are answered from one league-wide call, the other team per team
+        """
+        stub_server.route("nfl", "stats", "Injuries/2016/5", INJURIES)
+        stub_server.route("nfl", "stats", "Injuries/2016/6/WAS", [INJURIES[0]])
+        keys = [(2016, 5, team) for team in TEAMS] + [{"season": 2016, "week": 6, "team_id": "WAS"}]
+        with point_at(FantasyData("key"), stub_server) as client:
+            results = client.batch(client.get_injuries_by_team, keys, plan=True)
+        assert results.ok
+        assert results == [[INJURIES[0], INJURIES[2]], [INJURIES[1]]] + [[]] * 14 + [[INJURIES[0]]]
+        assert sorted(request.path for request in stub_server.requests) == \
+            ["/v3/nfl/stats/json/Injuries/2016/5", "/v3/nfl/stats/json/Injuries/2016/6/WAS"]
+
+    def test_league_call_error(self, stub_server):
+        stub_server.route("nfl", "projections", "PlayerGameProjectionStatsByWeek/2016/5",
+                          lambda request: (401, {}, {"statusCode": 401}))
+        with point_at(FantasyData("key"), stub_server) as client:
+            results = client.batch(client.get_projected_player_game_stats_by_team,
+                                   [(2016, 5, team) for team in TEAMS], plan=True)
+        assert results == [None] * len(TEAMS)
+        assert sorted(results.errors) == list(range(len(TEAMS)))
+        assert all(isinstance(error, FantasyDataError) for error in results.errors.values())
+
+    def test_few_teams_or_plan_off(self, stub_server):
+        for team in TEAMS:
+            stub_server.route("nfl", "stats", "Injuries/2016/5/" + team, [])
+        with point_at(FantasyData("key"), stub_server) as client:
+            assert client.batch(client.get_injuries_by_team, [(2016, 5, team) for team in TEAMS[:15]],
+                                plan=True) == [[]] * 15
+            # planning is opt-in
+            assert client.batch(client.get_injuries_by_team, [(2016, 5, team) for team in TEAMS]) == [[]] * 16
+        assert len(stub_server.requests) == 31
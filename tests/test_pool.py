@@ -0,0 +1,160 @@
+#coding:utf-8
+import asyncio
+import threading
+import time
+
+import pytest
+
+from fantasy_data.AsyncFantasyData import AsyncFantasyData
+from fantasy_data.FantasyData import FantasyDataError, InvalidKeyError, RateLimitError
+from fantasy_data.pool import FantasyDataPool
+from fantasy_data.retry import RetryPolicy
+from fantasy_data.testing import point_at
+
+
+def _pool(stub_server, keys, **kwargs):
+    pool = FantasyDataPool(keys, **kwargs)
+    for client in pool.clients:
+        point_at(client, stub_server)
+    return pool
+
+
+def _key(request):
+    return request.query["subscription-key"][0]
+
+
+class TestPool:
+    """
+    """
+    def test_spreads_calls(self, stub_server):
+        """
+        Given
+            A pool of three keys and an API that answers slowly
+        When
+            I make six concurrent calls
+        Then
+            Each key gets two of them
+        """
+        def handler(request):
+            time.sleep(0.05)
+            return 200, {}, {"PlayerID": 1}
+
+        for player_id in range(6):
+            stub_server.route("nfl", "stats", "Player/{0}".format(player_id), handler)
+        with _pool(stub_server, ["key-a", "key-b", "key-c"]) as pool:
+            results = pool.batch(pool.get_player, list(range(6)), max_workers=6)
+            assert results.ok
+            assert sorted(_key(request) for request in stub_server.requests) == \
+                ["key-a", "key-a", "key-b", "key-b", "key-c", "key-c"]
+            assert [usage.requests for usage in pool.usage] == [2, 2, 2]
+
+    def test_routes_around_bad_keys(self, stub_server):
+        """
+        Given
+            A pool whose first key is rejected and second key is throttled
+        When
+            I make calls
+        Then
+            They are answered with the third key, the rejected key is dropped and the throttled one rests
+        """
+        def handler(request):
+            if _key(request) == "bad":
+                return 401, {}, {"statusCode": 401}
+            if _key(request) == "busy":
+                return 429, {"Retry-After": "30"}, {"statusCode": 429}
+            return 200, {}, 5
+
+        stub_server.route("nfl", "stats", "CurrentWeek", handler)
+        with _pool(stub_server, ["bad", "busy", "good"], single_flight=False) as pool:
+            assert [pool.get_current_week() for _ in range(3)] == [5, 5, 5]
+            bad, busy, good = pool.usage
+            assert bad.disabled and bad.calls == 1
+            assert busy.throttled == 1 and busy.resting_until > time.monotonic() + 25
+            assert good.calls == 3 and good.requests == 3
+            assert pool.usage_report()["...good"]["calls"] == 3
+
+    def test_no_usable_key(self, stub_server):
+        stub_server.route("nfl", "stats", "CurrentWeek", lambda request: (401, {}, {"statusCode": 401}))
+        with _pool(stub_server, ["a", "b"]) as pool:
+            with pytest.raises(InvalidKeyError):
+                pool.get_current_week()
+        stub_server.route("nfl", "stats", "CurrentWeek",
+                          lambda request: (429, {"Retry-After": "30"}, {"statusCode": 429}))
+        with _pool(stub_server, ["a", "b"], throttle_retries=0) as pool:
+            with pytest.raises(RateLimitError) as error:
+                pool.get_current_week()
+            assert 25 < error.value.retry_after <= 30
+        # keys resting longer than max_throttle_wait aren't waited for
+        with _pool(stub_server, ["a"], max_throttle_wait=10) as pool:
+            started = time.time()
+            with pytest.raises(RateLimitError):
+                pool.get_current_week()
+            assert time.time() - started < 1
+
+    def test_quota(self, stub_server):
+        stub_server.route("nfl", "stats", "CurrentWeek", 5)
+        with _pool(stub_server, ["a", "b"], quota={"a": 1, "b": 2}, cache=True) as pool:
+            assert pool.get_current_week() == 5
+            # cache hits use no quota
+            assert pool.get_current_week() == 5
+            assert [usage.remaining for usage in pool.usage] == [0, 2]
+            assert pool.get_teams_active.__name__ == "get_teams_active"
+        stub_server.route("nfl", "stats", "Teams", [])
+        with _pool(stub_server, ["a"], quota=1) as pool:
+            pool.get_teams_active()
+            with pytest.raises(FantasyDataError):
+                pool.get_teams_active()
+
+    def test_waits_for_rested_key(self, stub_server):
+        answers = [(429, {"Retry-After": "0.2"}, {}), (200, {}, 5)]
+        lock = threading.Lock()
+
+        def handler(request):
+            with lock:
+                return answers.pop(0)
+
+        stub_server.route("nfl", "stats", "CurrentWeek", handler)
+        with _pool(stub_server, ["a"]) as pool:
+            started = time.time()
+            assert pool.get_current_week() == 5
+            assert time.time() - started >= 0.2
+
+    def test_streams_hold_their_key(self, stub_server):
+        """
+        Given
+            A pool of two keys and an API answering a first request with a 500
+        When
+            I iterate two streamed calls at once
+        Then
+            Each stream keeps its key in flight until it is exhausted, and its retry is counted
+        """
+        answers = [(500, {}, {})]
+        lock = threading.Lock()
+
+        def handler(request):
+            with lock:
+                return answers.pop(0) if answers else (200, {}, [{"PlayerID": 1}, {"PlayerID": 2}])
+
+        stub_server.route("nfl", "stats", "FreeAgents", handler)
+        with _pool(stub_server, ["a", "b"], retry=RetryPolicy(backoff=0.01)) as pool:
+            first, second = pool.iter_free_agents(), pool.iter_free_agents()
+            # nothing is sent before iterating
+            assert [usage.in_flight for usage in pool.usage] == [0, 0]
+            assert next(first) == {"PlayerID": 1}
+            assert next(second) == {"PlayerID": 1}
+            assert [usage.in_flight for usage in pool.usage] == [1, 1]
+            assert list(first) == [{"PlayerID": 2}]
+            second.close()
+            assert [usage.in_flight for usage in pool.usage] == [0, 0]
+            assert [usage.requests for usage in pool.usage] == [2, 1]
+            assert len(stub_server.requests) == 3
+
+    def test_async(self, stub_server):
+        stub_server.route("nfl", "stats", "CurrentWeek", 5)
+        pool = _pool(stub_server, ["a", "b"])
+
+        async def run():
+            async with AsyncFantasyData(client=pool) as client:
+                return await asyncio.gather(client.get_current_week(), client.get_current_week())
+
+        assert asyncio.run(run()) == [5, 5]
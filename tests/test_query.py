@@ -0,0 +1,100 @@
+#coding:utf-8
+import pytest
+
+from fantasy_data.FantasyData import FantasyData
+from fantasy_data.models import Injury, PlayerGame
+from fantasy_data.query import Table
+from fantasy_data.testing import point_at
+
+
+STATS = [
+    {"PlayerID": 1, "Team": "WAS", "Position": "QB", "Week": 5, "FantasyPoints": 20.5},
+    {"PlayerID": 2, "Team": "WAS", "Position": "RB", "Week": 5, "FantasyPoints": 11},
+    {"PlayerID": 3, "Team": "DAL", "Position": "QB", "Week": 5, "FantasyPoints": 17},
+    {"PlayerID": 4, "Team": "DAL", "Position": "WR", "Week": 5, "FantasyPoints": 9},
+    {"PlayerID": 5, "Team": "NYG", "Position": "RB", "Week": 5, "FantasyPoints": 4},
+]
+
+INJURIES = [
+    {"PlayerID": 2, "Team": "WAS", "Status": "Questionable"},
+    {"PlayerID": 4, "Team": "DAL", "Status": "Out"},
+    {"PlayerID": 4, "Team": "DAL", "Status": "Doubtful"},
+]
+
+
+class TestTable:
+    """
+    """
+    def test_lookup_and_first(self):
+        table = Table(STATS)
+        assert [row["PlayerID"] for row in table.lookup("Team", "WAS")] == [1, 2]
+        assert table.lookup("Team", "KC") == []
+        assert table.first("PlayerID", 3)["Team"] == "DAL"
+        assert table.first("PlayerID", 99, default="none") == "none"
+        assert set(table._indexes) == {"Team", "PlayerID"}
+
+    def test_where(self):
+        table = Table(STATS)
+        assert [row["PlayerID"] for row in table.where(Team="WAS", Position="RB")] == [2]
+        assert [row["PlayerID"] for row in table.where(Position=("RB", "QB"))] == [1, 2, 3, 5]
+        assert [row["PlayerID"] for row in table.where(Position=["QB", "WR"], Team="DAL")] == [3, 4]
+        assert table.where(Team="KC", Position="QB") == []
+        assert table.where() == STATS
+
+    def test_group_by_tuple(self):
+        groups = Table(STATS).group_by(("Team", "Position"))
+        assert [row["PlayerID"] for row in groups[("WAS", "QB")]] == [1]
+        assert len(groups) == 5
+
+    def test_join(self):
+        table = Table(STATS)
+        pairs = table.join(INJURIES)
+        assert [(row["PlayerID"], injury["Status"]) for row, injury in pairs] == \
+            [(2, "Questionable"), (4, "Out"), (4, "Doubtful")]
+        left = table.join(INJURIES, on=("PlayerID", "Team"), how="left")
+        assert len(left) == 6 and left[0] == (STATS[0], None)
+        with pytest.raises(ValueError):
+            table.join(INJURIES, how="outer")
+
+    def test_changes_drop_indexes(self):
+        table = Table(STATS)
+        assert len(table.lookup("Team", "NYG")) == 1
+        table.append({"PlayerID": 6, "Team": "NYG"})
+        assert len(table.lookup("Team", "NYG")) == 2
+        del table[0]
+        assert table.lookup("PlayerID", 1) == []
+        table += [{"PlayerID": 7, "Team": "NYG"}]
+        assert isinstance(table, Table) and len(table.lookup("Team", "NYG")) == 3
+        table.sort(key=lambda row: row["PlayerID"])
+        table.pop()
+        assert table.lookup("PlayerID", 7) == []
+        assert Table.extend.__name__ == "extend"
+
+    def test_records(self):
+        table = Table(Injury.from_result(INJURIES))
+        assert [injury.Status for injury in table.lookup("PlayerID", 4)] == ["Out", "Doubtful"]
+
+
+class TestAsTable:
+    """
+    """
+    def test_as_table(self, stub_server):
+        """
+        Given
+            Week stats served by the API
+        When
+            I ask for them as a table of records
+        Then
+            I can look players up by indexed fields
+        """
+        stub_server.route("nfl", "stats", "PlayerGameStatsByWeek/2016REG/5", STATS)
+        stub_server.route("nfl", "stats", "Injuries/2016/5", INJURIES)
+        with point_at(FantasyData("key"), stub_server) as client:
+            stats = client.get_players_game_stats_for_season_for_week(2016, 5, as_table=True, as_models=True)
+            injuries = client.get_injuries(2016, 5, as_table=True)
+            assert isinstance(stats, Table) and isinstance(stats[0], PlayerGame)
+            assert stats.first("PlayerID", 3).FantasyPoints == 17
+            assert [(row.PlayerID, injury["Status"]) for row, injury in stats.where(Team="DAL").join(injuries)] == \
+                [(4, "Out"), (4, "Doubtful")]
+            with pytest.raises(ValueError):
+                client.get_injuries(2016, 5, as_table=True, as_columns=True)
@@ -0,0 +1,134 @@
+#coding:utf-8
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from fantasy_data.FantasyData import FantasyData, RateLimitError
+from fantasy_data.ratelimit import RateLimiter, SharedRateLimiter, retry_after
+from fantasy_data.testing import point_at
+
+
+_limiter = None
+
+
+def _use_limiter(limiter):
+    global _limiter
+    _limiter = limiter
+
+
+def _acquire(calls):
+    for _ in range(calls):
+        _limiter.acquire()
+    return _limiter.rate
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter:
+    """
+    """
+    def test_token_bucket(self):
+        clock = FakeClock()
+        limiter = RateLimiter(2, burst=2, clock=clock, sleep=clock.sleep)
+        for _ in range(4):
+            limiter.acquire()
+        assert clock.sleeps == [0.5, 0.5]
+
+    def test_adaptive_backoff(self):
+        clock = FakeClock()
+        limiter = RateLimiter(10, recovery=4, clock=clock, sleep=clock.sleep)
+        limiter.throttled(3)
+        assert limiter.rate == 5
+        limiter.acquire()
+        assert clock.sleeps[0] == 3
+        for _ in range(4):
+            limiter.succeeded()
+        assert limiter.rate == 10
+
+    def test_shared_per_key(self):
+        assert RateLimiter.for_key("key-a", 5) is RateLimiter.for_key("key-a", 50)
+        assert RateLimiter.for_key("key-a", 5) is not RateLimiter.for_key("key-b", 5)
+        client = FantasyData("key-a", rate_limit=5)
+        assert client._rate_limiter is RateLimiter.for_key("key-a", 5)
+        client.close()
+
+    def test_shared_by_processes(self):
+        """
+        Two processes acquiring 10 calls each from one limiter throttled down to 20 calls/s
+        take 1s together, not 0.5s each
+        """
+        limiter = SharedRateLimiter(40, burst=1)
+        limiter.throttled(0.01)
+        started = time.monotonic()
+        with ProcessPoolExecutor(2, initializer=_use_limiter, initargs=(limiter,)) as executor:
+            rates = list(executor.map(_acquire, [10, 10]))
+        assert time.monotonic() - started >= 0.9
+        assert rates == [20, 20]
+
+    def test_retry_after(self):
+        assert retry_after({"Retry-After": "7"}) == 7
+        assert retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, now=1445412470) == 10
+        assert retry_after({}) is None
+        assert retry_after({"X-RateLimit-Reset": "1445412480"}, now=1445412470) == 10
+        assert retry_after({"RateLimit-Reset": "1445412400"}, now=1445412470) == 0
+
+
+class TestThrottling:
+    """
+    """
+    def test_throttled_calls_are_resent(self, stub_server):
+        """
+        Given
+            An API answering 429 with Retry-After twice
+        When
+            I call an API method
+        Then
+            The call is resent and succeeds
+        """
+        answers = [(429, {"Retry-After": "0"}, {"statusCode": 429}),
+                   (503, {"Retry-After": "0"}, b"busy"),
+                   (200, {}, 7)]
+        stub_server.route("nfl", "stats", "CurrentWeek", lambda request: answers.pop(0))
+        with point_at(FantasyData("key", rate_limit=RateLimiter(1000)), stub_server) as client:
+            assert client.get_current_week() == 7
+            assert client._rate_limiter.rate < 1000
+        assert len(stub_server.requests) == 3
+
+    def test_long_retry_after_is_not_waited(self, stub_server):
+        """
+        Given
+            An API answering 429 with a Retry-After of an hour
+        When
+            I call an API method, with or without a rate limiter
+        Then
+            RateLimitError is raised right away and the limiter holds calls no longer than max_throttle_wait
+        """
+        stub_server.route("nfl", "stats", "CurrentWeek", lambda request: (429, {"Retry-After": "3600"}, {}))
+        limiter = RateLimiter(1000)
+        for rate_limit in (None, limiter):
+            with point_at(FantasyData("key", rate_limit=rate_limit, max_throttle_wait=1), stub_server) as client:
+                started = time.time()
+                with pytest.raises(RateLimitError) as error:
+                    client.get_current_week()
+                assert time.time() - started < 0.5 and error.value.retry_after == 3600
+        assert len(stub_server.requests) == 2
+        assert limiter._blocked_until <= time.monotonic() + 1
+
+    def test_retries_exhausted(self, stub_server):
+        stub_server.route("nfl", "stats", "CurrentWeek", lambda request: (429, {"Retry-After": "0"}, {}))
+        with point_at(FantasyData("key", throttle_retries=1), stub_server) as client:
+            with pytest.raises(RateLimitError):
+                client.get_current_week()
+        assert len(stub_server.requests) == 2
@@ -0,0 +1,160 @@
+#coding:utf-8
+import threading
+import time
+
+import pytest
+
+from fantasy_data.FantasyData import FantasyData, FantasyDataError, FantasyDataTimeout
+from fantasy_data.retry import HedgePolicy, RetryPolicy
+from fantasy_data.testing import ResettingServer, point_at
+
+
+class TestRetryPolicy:
+    """
+    """
+    def test_backoff(self):
+        policy = RetryPolicy(max_attempts=4, backoff=1, max_backoff=3, jitter=False)
+        assert [policy.delay(attempt, 500) for attempt in range(1, 5)] == [1, 2, 3, None]
+        assert policy.delay(1, None) == 1
+        assert policy.delay(1, 404) is None
+
+    def test_jitter_and_deadline(self):
+        policy = RetryPolicy(backoff=1, deadline=5)
+        assert all(0 <= policy.delay(1, 502) <= 1 for _ in range(20))
+        assert policy.delay(1, 502, elapsed=5) is None
+
+    def test_rules(self):
+        policy = RetryPolicy(max_attempts=2, rules={500: 5, 502: 1, 404: 2}, connection_errors=False, jitter=False)
+        assert policy.delay(4, 500) is not None
+        assert policy.delay(1, 502) is None
+        assert policy.delay(1, 404) is not None
+        assert policy.delay(1, None) is None
+
+
+class TestHedgePolicy:
+    """
+    """
+    def test_delay_is_p95(self):
+        policy = HedgePolicy(endpoints=["CurrentWeek"], min_samples=10)
+        assert policy.applies("CurrentWeek") and not policy.applies("Teams")
+        for ms in range(1, 10):
+            policy.observe("CurrentWeek", ms / 1000.0)
+        assert policy.delay("CurrentWeek") is None
+        for ms in range(10, 101):
+            policy.observe("CurrentWeek", ms / 1000.0)
+        assert policy.delay("CurrentWeek") == 0.096
+
+
+class TestRetries:
+    """
+    """
+    def test_5xx_is_retried(self, stub_server):
+        """
+        Given
+            An API failing with 502 and 500 before answering
+        When
+            I call an API method with a retry policy
+        Then
+            The call succeeds
+        """
+        answers = [(502, {}, b"bad gateway"), (500, {}, {"Message": "error"}), (200, {}, 5)]
+        stub_server.route("nfl", "stats", "CurrentWeek", lambda request: answers.pop(0))
+        with point_at(FantasyData("key", retry=RetryPolicy(backoff=0.01)), stub_server) as client:
+            assert client.get_current_week() == 5
+
+    def test_gives_up(self, stub_server):
+        stub_server.route("nfl", "stats", "CurrentWeek", lambda request: (500, {}, {"Message": "error"}))
+        with point_at(FantasyData("key", retry=RetryPolicy(max_attempts=2, backoff=0.01)), stub_server) as client:
+            with pytest.raises(FantasyDataError):
+                client.get_current_week()
+        assert len(stub_server.requests) == 2
+
+    def test_attempts_are_counted_per_call(self):
+        """
+        Given
+            An API resetting connections in the middle of the body and failing with 500, in turn
+        When
+            I call an API method with max_attempts=3
+        Then
+            Three requests are sent in total, whatever failed
+        """
+        with ResettingServer(["reset", 500] * 3) as server:
+            client = FantasyData("key", retry=RetryPolicy(max_attempts=3, backoff=0.01))
+            client._api_schema, client._api_address = "http://", server.address
+            with pytest.raises(FantasyDataError):
+                client.get_current_week()
+            client.close()
+            assert server.requests == 3
+
+    def test_reset_body_is_retried(self):
+        with ResettingServer(["reset", 200]) as server:
+            client = FantasyData("key", retry=RetryPolicy(backoff=0.01))
+            client._api_schema, client._api_address = "http://", server.address
+            assert client.get_current_week() == 5
+            client.close()
+        with ResettingServer(["reset"]) as server:
+            client = FantasyData("key")
+            client._api_schema, client._api_address = "http://", server.address
+            with pytest.raises(FantasyDataError):
+                list(client.iter_free_agents())
+            client.close()
+
+    def test_read_timeout_in_body(self):
+        with ResettingServer(["stall"]) as server:
+            client = FantasyData("key", timeout=0.2)
+            client._api_schema, client._api_address = "http://", server.address
+            with pytest.raises(FantasyDataTimeout):
+                client.get_current_week()
+            client.close()
+
+    def test_connection_errors(self):
+        client = FantasyData("key", retry=RetryPolicy(max_attempts=3, backoff=0.01))
+        client._api_schema, client._api_address = "http://", "127.0.0.1:1"
+        with pytest.raises(FantasyDataError):
+            client.get_current_week()
+        client.close()
+
+
+class TestHedging:
+    """
+    """
+    def test_slow_request_is_hedged(self, stub_server):
+        """
+        Given
+            An API whose first answer stalls
+        When
+            I call a hedged endpoint
+        Then
+            A backup request is sent and its answer returned without waiting for the first
+        """
+        release = threading.Event()
+
+        def current_week(request):
+            if len(stub_server.requests) == 1:
+                release.wait(5)
+            return 200, {}, 5
+
+        stub_server.route("nfl", "stats", "CurrentWeek", current_week)
+        hedge = HedgePolicy(endpoints=["CurrentWeek"], delay=0.05)
+        with point_at(FantasyData("key", hedge=hedge), stub_server) as client:
+            started = time.time()
+            assert client.get_current_week() == 5
+            assert time.time() - started < 2
+            release.set()
+        assert len(stub_server.requests) == 2
+
+    def test_hedged_copies_share_attempts(self, stub_server):
+        """
+        Both copies of a hedged request count towards the same max_attempts
+        """
+        def current_week(request):
+            time.sleep(0.1)
+            return 500, {}, {"Message": "error"}
+
+        stub_server.route("nfl", "stats", "CurrentWeek", current_week)
+        hedge = HedgePolicy(endpoints=["CurrentWeek"], delay=0.05)
+        retry = RetryPolicy(max_attempts=4, backoff=0.01)
+        with point_at(FantasyData("key", hedge=hedge, retry=retry), stub_server) as client:
+            with pytest.raises(FantasyDataError):
+                client.get_current_week()
+        assert len(stub_server.requests) == 4
@@ -0,0 +1,86 @@
+#coding:utf-8
+import pytest
+
+from fantasy_data.FantasyData import FantasyData, FantasyDataNBA, FantasyDataError
+from fantasy_data.testing import point_at
+
+
+class TestSession:
+    """
+    Pooled HTTP session
+    """
+    def test_connections_are_reused(self, stub_server):
+        """
+        Given
+            A FantasyData object pointed at a local API
+        When
+            I make several API calls
+        Then
+            All of them go over one TCP connection
+        """
+        stub_server.route("nfl", "stats", "CurrentWeek", 5)
+        with point_at(FantasyData("key"), stub_server) as client:
+            for _ in range(5):
+                assert client.get_current_week() == 5
+        assert stub_server.connections == 1
+
+    def test_keep_alive_disabled(self, stub_server):
+        """
+        Connections are not reused when keep-alive is off
+        """
+        stub_server.route("nba", "stats", "CurrentSeason", {"Season": 2016})
+        with point_at(FantasyDataNBA("key", keep_alive=False), stub_server) as client:
+            for _ in range(3):
+                assert client.get_current_season() == 2016
+        assert stub_server.connections >= 3
+
+    def test_closed_client(self, stub_server):
+        """
+        A closed object raises FantasyDataError
+        """
+        client = point_at(FantasyData("key"), stub_server)
+        client.close()
+        client.close()
+        with pytest.raises(FantasyDataError):
+            client.get_current_week()
+
+
+class TestHealthCheck:
+    """
+    Liveness probe is off the hot path
+    """
+    def test_one_request_per_call(self, stub_server):
+        """
+        Given
+            A FantasyData object with default settings
+        When
+            I call get_current_week() three times
+        Then
+            Exactly three requests reach the API
+        """
+        stub_server.route("nfl", "stats", "CurrentWeek", 5)
+        with point_at(FantasyData("key"), stub_server) as client:
+            for _ in range(3):
+                client.get_current_week()
+        assert [r.path for r in stub_server.requests] == ["/v3/nfl/stats/json/CurrentWeek"] * 3
+
+    def test_probe_is_cached(self, stub_server):
+        """
+        With health_check on, the probe runs once per TTL
+        """
+        stub_server.route("nfl", "stats", "CurrentWeek", 5)
+        with point_at(FantasyData("key", health_check=True, health_check_ttl=60), stub_server) as client:
+            for _ in range(3):
+                client.get_current_week()
+        assert len(stub_server.requests) == 4
+        assert stub_server.requests[0].path in ("", "/")
+
+    def test_connection_error(self):
+        """
+        A refused connection raises FantasyDataError from the API call itself
+        """
+        client = FantasyData("key")
+        client._api_schema = "http://"
+        client._api_address = "127.0.0.1:9"
+        with pytest.raises(FantasyDataError):
+            client.get_current_week()
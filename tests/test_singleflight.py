@@ -0,0 +1,130 @@
+#coding:utf-8
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fantasy_data.AsyncFantasyData import AsyncFantasyData
+from fantasy_data.deadline import deadline
+from fantasy_data.FantasyData import DeadlineExceeded, FantasyData, FantasyDataError
+from fantasy_data.singleflight import SingleFlight
+from fantasy_data.testing import point_at, slow
+
+
+class TestSingleFlight:
+    """
+    """
+    def test_errors_are_shared_and_not_kept(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        calls = []
+
+        def fail():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        with ThreadPoolExecutor(2) as executor:
+            first = executor.submit(flight.do, "key", fail)
+            started.wait()
+            second = executor.submit(flight.do, "key", fail)
+            for future in (first, second):
+                with pytest.raises(ValueError):
+                    future.result()
+        assert len(calls) == 1
+        assert flight.do("key", lambda: 5) == 5
+
+    def test_window(self):
+        flight = SingleFlight(window=60)
+        assert flight.do("key", lambda: 1) == 1
+        assert flight.do("key", lambda: 2) == 1
+        assert SingleFlight().do("key", lambda: 2) == 2
+        flight = SingleFlight(window=60, copy=list)
+        result = flight.do("key", lambda: [1])
+        assert flight.do("key", lambda: [2]) == result
+        assert flight.do("key", lambda: [2]) is not result
+
+
+class TestCoalescing:
+    """
+    """
+    def test_concurrent_calls_share_one_request(self, stub_server):
+        """
+        Given
+            An API that takes 0.2s to answer
+        When
+            8 threads call get_current_week() at once
+        Then
+            One request is sent and every caller gets its result
+        """
+        stub_server.route("nfl", "stats", "CurrentWeek", slow(0.2, 5))
+        with point_at(FantasyData("key", single_flight=True), stub_server) as client:
+            with ThreadPoolExecutor(8) as executor:
+                results = list(executor.map(lambda _: client.get_current_week(), range(8)))
+            assert results == [5] * 8
+            assert len(stub_server.requests) == 1
+            # different params are separate calls
+            stub_server.route("nfl", "stats", "Injuries/2016/5", [])
+            stub_server.route("nfl", "stats", "Injuries/2016/6", [])
+            client.batch(client.get_injuries, [(2016, 5), (2016, 6)])
+            assert len(stub_server.requests) == 3
+
+    def test_async_calls_share_one_request(self, stub_server):
+        stub_server.route("nfl", "stats", "Teams", slow(0.2, [{"Key": "WAS"}]))
+
+        async def run():
+            async with AsyncFantasyData("key", max_concurrency=8, single_flight=True) as client:
+                point_at(client.client, stub_server)
+                return await asyncio.gather(*[client.get_teams_active() for _ in range(8)])
+
+        results = asyncio.run(run())
+        assert results == [[{"Key": "WAS"}]] * 8
+        # every caller gets its own copy
+        results[0][0]["Key"] = "NYG"
+        assert results[1] == [{"Key": "WAS"}]
+        assert len(stub_server.requests) == 1
+
+    def test_off_by_default(self, stub_server):
+        stub_server.route("nfl", "stats", "CurrentWeek", slow(0.1, 5))
+        with point_at(FantasyData("key"), stub_server) as client:
+            with ThreadPoolExecutor(4) as executor:
+                list(executor.map(lambda _: client.get_current_week(), range(4)))
+        assert len(stub_server.requests) == 4
+
+    def test_leader_deadline_is_not_shared(self, stub_server):
+        """
+        Given
+            An API that takes 0.3s to answer
+        When
+            One thread calls get_current_week() under a 0.1s deadline and another one without deadline
+        Then
+            Only the first one fails, the second one sends the call again and gets its result
+        """
+        stub_server.route("nfl", "stats", "CurrentWeek", slow(0.3, 5))
+        started = threading.Event()
+
+        def leader():
+            with deadline(0.1):
+                started.set()
+                return client.get_current_week()
+
+        with point_at(FantasyData("key", single_flight=True), stub_server) as client:
+            with ThreadPoolExecutor(2) as executor:
+                first = executor.submit(leader)
+                started.wait()
+                time.sleep(0.02)
+                second = executor.submit(client.get_current_week)
+                with pytest.raises(DeadlineExceeded):
+                    first.result()
+                assert second.result() == 5
+        assert len(stub_server.requests) == 2
+
+    def test_errors_reach_every_caller(self, stub_server):
+        stub_server.route("nfl", "stats", "CurrentWeek", lambda request: (time.sleep(0.1), (401, {}, {}))[1])
+        with point_at(FantasyData("key", single_flight=True), stub_server) as client:
+            with ThreadPoolExecutor(4) as executor:
+                futures = [executor.submit(client.get_current_week) for _ in range(4)]
+            assert all(isinstance(future.exception(), FantasyDataError) for future in futures)
@@ -0,0 +1,127 @@
+#coding:utf-8
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from fantasy_data.FantasyData import FantasyData, FantasyDataError
+from fantasy_data.snapshot import PLAYER_GAME_STATS, Snapshot, SnapshotStore
+from fantasy_data.testing import point_at
+
+
+ROWS = [
+    {"PlayerID": 1, "Name": u"José", "Week": 1, "FantasyPoints": 10.5, "FanDuelSalary": 5000, "ScoringDetails": []},
+    {"PlayerID": 2, "Name": "B", "Week": 1, "FantasyPoints": None, "FanDuelSalary": None,
+     "ScoringDetails": [{"Length": 5}]},
+]
+
+
+class TestSnapshotStore:
+    """
+    """
+    def test_write_and_read(self, tmpdir):
+        store = SnapshotStore(str(tmpdir))
+        store.write(PLAYER_GAME_STATS, "2014REG/1", ROWS)
+        assert store.has(PLAYER_GAME_STATS, "2014REG/1")
+        assert store.partitions(PLAYER_GAME_STATS) == ["2014REG/1"]
+
+        columns = store.read(PLAYER_GAME_STATS, "2014REG/1")
+        assert isinstance(columns.PlayerID.data, np.memmap)
+        assert columns.FanDuelSalary.mask.tolist() == [False, True]
+        assert columns.to_rows() == ROWS
+        assert sorted(store.read(PLAYER_GAME_STATS, "2014REG/1", fields=["Week"])) == ["Week"]
+
+    def test_missing_and_empty(self, tmpdir):
+        store = SnapshotStore(str(tmpdir))
+        with pytest.raises(KeyError):
+            store.read(PLAYER_GAME_STATS, "2014REG/1")
+        store.write(PLAYER_GAME_STATS, "2014POST/4", [])
+        assert store.read(PLAYER_GAME_STATS, "2014POST/4").rows == 0
+
+    def test_replace_while_reading(self, tmpdir):
+        """
+        Given
+            A stored partition
+        When
+            Two threads keep rewriting it while another one reads it
+        Then
+            Every write succeeds, the reader always finds the partition and nothing is left behind
+        """
+        store = SnapshotStore(str(tmpdir))
+        store.write(PLAYER_GAME_STATS, "2014REG/1", ROWS)
+        done = threading.Event()
+        misses = []
+
+        def read():
+            while not done.is_set():
+                try:
+                    store.read(PLAYER_GAME_STATS, "2014REG/1", fields=["Week"])
+                except KeyError:
+                    misses.append(1)
+                except (IOError, OSError):
+                    pass  # a column file deleted with the old partition under an open manifest
+
+        def write(_):
+            for _ in range(50):
+                store.write(PLAYER_GAME_STATS, "2014REG/1", ROWS)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        try:
+            with ThreadPoolExecutor(2) as executor:
+                list(executor.map(write, range(2)))
+        finally:
+            done.set()
+            reader.join()
+        assert not misses
+        assert store.read(PLAYER_GAME_STATS, "2014REG/1").to_rows() == ROWS
+        assert store.partitions(PLAYER_GAME_STATS) == ["2014REG/1"]
+        assert sorted(tmpdir.join(PLAYER_GAME_STATS, "2014REG").listdir()) == [tmpdir.join(PLAYER_GAME_STATS, "2014REG", "1")]
+
+    def test_parquet_export(self, tmpdir):
+        pq = pytest.importorskip("pyarrow.parquet")
+        store = SnapshotStore(str(tmpdir))
+        store.write(PLAYER_GAME_STATS, "2014REG/1", ROWS)
+        store.write(PLAYER_GAME_STATS, "2014REG/2", [{"PlayerID": 1, "Week": 2, "FantasyPoints": 3}])
+        path = str(tmpdir.join("stats.parquet"))
+        store.export_parquet(PLAYER_GAME_STATS, path)
+        table = pq.read_table(path)
+        assert table.num_rows == 3
+        assert table.column("FantasyPoints").to_pylist() == [10.5, None, 3.0]
+        assert table.column("ScoringDetails").to_pylist() == ["[]", '[{"Length": 5}]', None]
+
+
+class TestSnapshot:
+    """
+    """
+    def test_download_then_read_offline(self, stub_server, tmpdir):
+        """
+        Given
+            A season stored with Snapshot.download
+        When
+            I download it again and read it
+        Then
+            No API calls are made
+        """
+        stub_server.route("nfl", "stats", "Schedules/2014POST", [{"GameKey": "1", "Week": 1}])
+        stub_server.route("nfl", "stats", "Byes/2014", [{"Team": "WAS", "Week": 10}])
+        for week in range(1, 5):
+            stub_server.route("nfl", "stats", "PlayerGameStatsByWeek/2014POST/{0}".format(week), ROWS)
+        with point_at(FantasyData("key"), stub_server) as client:
+            snapshot = Snapshot(client, str(tmpdir))
+            assert len(snapshot.download([2014], season_types=["POST"])) == 6
+            calls = len(stub_server.requests)
+            assert snapshot.download([2014], season_types=["POST"]) == []
+            assert snapshot.player_game_stats(2014, 3, "POST").PlayerID.tolist() == [1, 2]
+            assert snapshot.bye_weeks(2014).Team.tolist() == ["WAS"]
+            assert len(stub_server.requests) == calls
+
+    def test_download_resumes_after_errors(self, stub_server, tmpdir):
+        stub_server.route("nfl", "stats", "Byes/2014", [])
+        with point_at(FantasyData("key"), stub_server) as client:
+            snapshot = Snapshot(client, str(tmpdir))
+            with pytest.raises(FantasyDataError):
+                snapshot.download([2014], season_types=["POST"])
+            assert snapshot.store.has("bye_weeks", "2014")
@@ -0,0 +1,71 @@
+#coding:utf-8
+import json
+import types
+
+import pytest
+
+from fantasy_data.FantasyData import FantasyData, FantasyDataNBA, FantasyDataError
+from fantasy_data.stream import JSONArrayParser, iter_json_array
+from fantasy_data.testing import point_at
+
+
+ROWS = [{"PlayerID": n, "Name": u"José \"{0}\"".format(n), "FantasyPoints": n * 0.5, "ScoringDetails": [],
+         "Injured": None, "Played": True} for n in range(200)]
+
+
+class TestJSONArrayParser:
+    """
+    """
+    @pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 20])
+    def test_any_chunking(self, chunk_size):
+        body = json.dumps(ROWS + [1, 2.25, -3e5, "text", None, [], {}], ensure_ascii=False).encode("utf-8")
+        chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+        assert list(iter_json_array(chunks)) == ROWS + [1, 2.25, -3e5, "text", None, [], {}]
+
+    def test_items_are_yielded_as_they_complete(self):
+        parser = JSONArrayParser()
+        assert parser.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+        assert parser.feed(b': 2}, 1') == [{"b": 2}]
+        assert parser.feed(b'0]') == [10]
+        assert parser.close() == []
+
+    @pytest.mark.parametrize("body", [b'{"statusCode": 401}', b'[1, 2', b'', b'[1 2]'])
+    def test_invalid_documents(self, body):
+        with pytest.raises(ValueError):
+            list(iter_json_array([body]))
+
+
+class TestIterMethods:
+    """
+    """
+    def test_iter_players_game_stats_for_season_for_week(self, stub_server):
+        """
+        Given
+            A large PlayerGameStatsByWeek response
+        When
+            I call iter_players_game_stats_for_season_for_week()
+        Then
+            I get a generator over the same rows as the get_ method returns
+        """
+        stub_server.route("nfl", "stats", "PlayerGameStatsByWeek/2014REG/5", ROWS)
+        with point_at(FantasyData("key"), stub_server) as client:
+            rows = client.iter_players_game_stats_for_season_for_week(2014, 5)
+            assert isinstance(rows, types.GeneratorType)
+            assert list(rows) == client.get_players_game_stats_for_season_for_week(2014, 5)
+            assert client.last_transfer.decoded_bytes > 0
+
+    def test_iter_players_game_stats_by_date(self, stub_server):
+        stub_server.route("nba", "stats", "PlayerGameStatsByDate/2015-12-05", ROWS)
+        with point_at(FantasyDataNBA("key"), stub_server) as client:
+            assert list(client.iter_players_game_stats_by_date("2015-12-05")) == ROWS
+
+    def test_errors(self, stub_server):
+        """
+        API errors are raised like in the get_ methods
+        """
+        stub_server.route("nfl", "stats", "FreeAgents", lambda request: (401, {}, {"statusCode": 401}))
+        with point_at(FantasyData("key"), stub_server) as client:
+            with pytest.raises(FantasyDataError):
+                list(client.iter_free_agents())
+            with pytest.raises(FantasyDataError):
+                client.iter_players_game_stats_for_season_for_week(2014, 5, "XYZ")
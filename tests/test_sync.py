@@ -0,0 +1,154 @@
+#coding:utf-8
+import datetime
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from fantasy_data.FantasyData import FantasyData, FantasyDataError, FantasyDataNBA
+from fantasy_data.snapshot import PLAYER_GAME_STATS
+from fantasy_data.sync import NBA_GAMES, NBA_PLAYER_GAME_STATS, NBASync, Sync, news_date
+from fantasy_data.testing import point_at
+
+
+def _paths(stub_server):
+    return sorted(request.path.split("/json/", 1)[1] for request in stub_server.requests)
+
+
+class TestSync:
+    """
+    """
+    def _routes(self, stub_server, week, season_type=1, season=2016):
+        stub_server.route("nfl", "scores", "Timeframes/current",
+                          [{"Season": season, "SeasonType": season_type, "Week": week}])
+        for schedule in ("REG", "POST"):
+            stub_server.route("nfl", "stats", "Schedules/{0}{1}".format(season, schedule), [])
+        for current in range(1, 18):
+            stub_server.route("nfl", "stats", "PlayerGameStatsByWeek/2016REG/{0}".format(current),
+                              [{"PlayerID": 1, "Week": current}])
+            stub_server.route("nfl", "stats", "Injuries/2016/{0}".format(current), [])
+        for current in range(1, 5):
+            stub_server.route("nfl", "stats", "PlayerGameStatsByWeek/2016POST/{0}".format(current),
+                              [{"PlayerID": 1, "Week": current}])
+        for day in range(1, 31):
+            stub_server.route("nfl", "news-rotoballer", "RotoBallerPremiumNewsByDate/2016-OCT-{0:02d}".format(day),
+                              [{"NewsID": day}])
+
+    def test_only_open_partitions_are_refetched(self, stub_server, tmpdir):
+        """
+        Given
+            A store synced in week 4
+        When
+            I sync again in week 5, two days later
+        Then
+            Only weeks 3 to 5, the schedule and the news since the last sync are fetched
+        """
+        self._routes(stub_server, 4)
+        with point_at(FantasyData("key"), stub_server) as client:
+            sync = Sync(client, str(tmpdir))
+            written = sync.sync(today=datetime.date(2016, 10, 3))
+            assert ("player_game_stats", "2016REG/1") in written
+            assert ("news", "2016-10-03") in written
+
+            stub_server.reset()
+            self._routes(stub_server, 5)
+            sync.sync(today=datetime.date(2016, 10, 5))
+            assert _paths(stub_server) == [
+                "Injuries/2016/3", "Injuries/2016/4", "Injuries/2016/5",
+                "PlayerGameStatsByWeek/2016REG/3", "PlayerGameStatsByWeek/2016REG/4",
+                "PlayerGameStatsByWeek/2016REG/5",
+                "RotoBallerPremiumNewsByDate/2016-OCT-03", "RotoBallerPremiumNewsByDate/2016-OCT-04",
+                "RotoBallerPremiumNewsByDate/2016-OCT-05",
+                "Schedules/2016REG",
+                "Timeframes/current",
+            ]
+            assert sync.load_state() == {"season": 2016, "season_type": "REG", "week": 5, "news_date": "2016-10-05"}
+            assert sync.store.read("player_game_stats", "2016REG/5").Week.tolist() == [5]
+
+    def test_postseason(self, stub_server, tmpdir):
+        """
+        Given
+            A store synced in the last regular season week
+        When
+            I sync again when the API's current week is 19
+        Then
+            The last regular season weeks are refetched and postseason weeks 1 and 2 fetched
+        """
+        self._routes(stub_server, 17)
+        with point_at(FantasyData("key"), stub_server) as client:
+            sync = Sync(client, str(tmpdir))
+            sync.sync(news=False)
+            stub_server.reset()
+            self._routes(stub_server, 19, season_type=3)
+            sync.sync(news=False)
+            assert _paths(stub_server) == [
+                "Injuries/2016/16", "Injuries/2016/17",
+                "PlayerGameStatsByWeek/2016POST/1", "PlayerGameStatsByWeek/2016POST/2",
+                "PlayerGameStatsByWeek/2016REG/16", "PlayerGameStatsByWeek/2016REG/17",
+                "Schedules/2016POST",
+                "Timeframes/current",
+            ]
+            assert sync.load_state()["season_type"] == "POST" and sync.load_state()["week"] == 2
+
+    def test_offseason(self, stub_server, tmpdir):
+        """
+        Given
+            A store synced in the last postseason week
+        When
+            I sync again in the offseason, when the API's season is the upcoming one
+        Then
+            The last open postseason weeks get their final refetch and the upcoming schedule is fetched
+        """
+        self._routes(stub_server, 4, season_type=3)
+        with point_at(FantasyData("key"), stub_server) as client:
+            sync = Sync(client, str(tmpdir))
+            sync.sync(news=False)
+            stub_server.reset()
+            self._routes(stub_server, None, season_type=4, season=2017)
+            sync.sync(news=False)
+            assert _paths(stub_server) == [
+                "PlayerGameStatsByWeek/2016POST/3", "PlayerGameStatsByWeek/2016POST/4",
+                "Schedules/2017REG",
+                "Timeframes/current",
+            ]
+            stub_server.reset()
+            self._routes(stub_server, None, season_type=4, season=2017)
+            sync.sync(news=False)
+            assert _paths(stub_server) == ["Schedules/2017REG", "Timeframes/current"]
+
+    def test_failed_sync_keeps_watermark(self, stub_server, tmpdir):
+        self._routes(stub_server, 4)
+        stub_server.routes.pop("/v3/nfl/stats/json/Injuries/2016/2")
+        with point_at(FantasyData("key"), stub_server) as client:
+            sync = Sync(client, str(tmpdir))
+            with pytest.raises(FantasyDataError):
+                sync.sync(today=datetime.date(2016, 10, 3))
+            assert sync.load_state() == {}
+
+    def test_news_date(self):
+        assert news_date(datetime.date(2017, 7, 31)) == "2017-JUL-31"
+
+
+class TestNBASync:
+    """
+    """
+    def test_dates_since_last_sync(self, stub_server, tmpdir):
+        stub_server.route("nba", "stats", "CurrentSeason", {"Season": 2016})
+        for day in range(1, 10):
+            stub_server.route("nba", "scores", "GamesByDate/2015-12-0{0}".format(day), [])
+            stub_server.route("nba", "stats", "PlayerGameStatsByDate/2015-12-0{0}".format(day), [{"PlayerID": day}])
+        with point_at(FantasyDataNBA("key"), stub_server) as client:
+            sync = NBASync(client, str(tmpdir))
+            assert len(sync.sync(since=datetime.date(2015, 12, 1), today=datetime.date(2015, 12, 3))) == 6
+            # NFL tables of the same store stay NFL only
+            assert sync.store.partitions(PLAYER_GAME_STATS) == []
+            assert sync.store.partitions(NBA_PLAYER_GAME_STATS) == sync.store.partitions(NBA_GAMES) == \
+                ["2015-12-01", "2015-12-02", "2015-12-03"]
+            stub_server.requests[:] = []
+            sync.sync(today=datetime.date(2015, 12, 5))
+            assert _paths(stub_server) == [
+                "CurrentSeason",
+                "GamesByDate/2015-12-03", "GamesByDate/2015-12-04", "GamesByDate/2015-12-05",
+                "PlayerGameStatsByDate/2015-12-03", "PlayerGameStatsByDate/2015-12-04",
+                "PlayerGameStatsByDate/2015-12-05",
+            ]
@@ -0,0 +1,116 @@
+#coding:utf-8
+import gzip
+import json
+
+import pytest
+
+from fantasy_data.FantasyData import FantasyData, FantasyDataError, FantasyDataNBA
+from fantasy_data.testing import point_at
+from fantasy_data.transport import CassetteMiss, RecordingAdapter, ReplayAdapter, request_key
+
+
+ROWS = [{"PlayerID": n, "Name": u"José {0}".format(n), "FantasyPoints": n * 0.5} for n in range(500)]
+
+
+def _offline(client):
+    """
+    Point `client` at an address nothing listens on
+    """
+    client._api_schema, client._api_address = "http://", "127.0.0.1:1"
+    return client
+
+
+class TestCassettes:
+    """
+    """
+    def test_record_then_replay_offline(self, stub_server, tmpdir):
+        """
+        Given
+            API calls recorded to a cassette, with a gzipped body
+        When
+            I replay them with no server
+        Then
+            I get the same results and transfer sizes
+        """
+        body = gzip.compress(json.dumps(ROWS).encode("utf-8"))
+        stub_server.route("nfl", "stats", "PlayerGameStatsByWeek/2014REG/5",
+                          lambda request: (200, {"Content-Encoding": "gzip"}, body))
+        stub_server.route("nfl", "stats", "CurrentWeek", 5)
+        stub_server.route("nfl", "stats", "Teams", lambda request: (401, {}, {"statusCode": 401}))
+        cassette = str(tmpdir.join("nfl"))
+
+        with point_at(FantasyData("secret", transport=RecordingAdapter(cassette)), stub_server) as client:
+            recorded = client.get_players_game_stats_for_season_for_week(2014, 5)
+            transfer = client.last_transfer
+            assert client.get_current_week() == 5
+            with pytest.raises(FantasyDataError):
+                client.get_teams_active()
+        assert recorded == ROWS
+        assert transfer.wire_bytes == len(body) < transfer.decoded_bytes
+        assert b"secret" not in tmpdir.join("nfl.json").read_binary()
+        assert tmpdir.join("nfl.bin").read_binary().startswith(body)
+
+        client = FantasyData("other-key", transport=ReplayAdapter(cassette))
+        with point_at(client, stub_server):
+            stub_server.reset()
+            assert client.get_players_game_stats_for_season_for_week(2014, 5) == ROWS
+            assert client.last_transfer == transfer
+            assert list(client.iter_players_game_stats_for_season_for_week(2014, 5)) == ROWS
+            assert client.get_current_week() == 5
+            with pytest.raises(FantasyDataError):
+                client.get_teams_active()
+            with pytest.raises(CassetteMiss):
+                client.get_bye_weeks(2014)
+        assert stub_server.requests == []
+
+    def test_responses_replay_in_order(self, stub_server, tmpdir):
+        """
+        Given
+            A call recorded twice with different answers
+        When
+            I replay it three times
+        Then
+            I get the answers in recorded order, then the last one again
+        """
+        weeks = [4, 5]
+        stub_server.route("nfl", "stats", "CurrentWeek", lambda request: (200, {}, weeks.pop(0)))
+        cassette = str(tmpdir.join("weeks"))
+        with point_at(FantasyData("key", single_flight=False, transport=RecordingAdapter(cassette)),
+                      stub_server) as client:
+            assert [client.get_current_week(), client.get_current_week()] == [4, 5]
+        with point_at(FantasyData("key", transport=ReplayAdapter(cassette)), stub_server) as client:
+            stub_server.reset()
+            assert [client.get_current_week() for _ in range(3)] == [4, 5, 5]
+        assert stub_server.requests == []
+
+    def test_index_is_written_per_response(self, stub_server, tmpdir):
+        """
+        Given
+            A recording client with the pool settings of a batch job
+        When
+            It records a call and is never closed
+        Then
+            The recording used the client's pool and the cassette replays already
+        """
+        stub_server.route("nfl", "stats", "CurrentWeek", 5)
+        cassette = str(tmpdir.join("open"))
+        recorder = RecordingAdapter(cassette)
+        client = point_at(FantasyData("key", pool_maxsize=32, transport=recorder), stub_server)
+        assert recorder.adapter._pool_maxsize == 32
+        assert client.get_current_week() == 5
+        stub_server.reset()
+        with point_at(FantasyData("key", transport=ReplayAdapter(cassette)), stub_server) as replay:
+            assert replay.get_current_week() == 5
+        assert stub_server.requests == []
+        client.close()
+
+    def test_request_key_drops_api_key(self):
+        assert (request_key("GET", "http://h/v3/nba/stats/json/Games/2016?subscription-key=abc") ==
+                "GET http://h/v3/nba/stats/json/Games/2016")
+
+    def test_empty_cassette(self, tmpdir):
+        cassette = str(tmpdir.join("empty"))
+        RecordingAdapter(cassette).close()
+        with _offline(FantasyDataNBA("key", transport=ReplayAdapter(cassette))) as client:
+            with pytest.raises(CassetteMiss):
+                client.get_current_season()